@@ -2,6 +2,7 @@
 import streamlit as st
 import json
 from utils.supabase_client import supabase
+from utils.assessment_history import snapshot_session_scores
 from postgrest.exceptions import APIError
 from datetime import datetime
 
@@ -78,7 +79,9 @@ def save_session_to_supabase():
         "session_data": {
             "maturity_score": st.session_state.get("maturity_score"),
             "maturity_answers": st.session_state.get("it_maturity_answers"),
+            "it_question_bank_version": st.session_state.get("it_question_bank_version"),
             "cyber_answers": st.session_state.get("cybersecurity_answers"),
+            "ai_maturity_answers": st.session_state.get("ai_maturity_answers"),
             "ai_recommendations": ai_recs,
             "last_saved": datetime.utcnow().isoformat()
         },
@@ -91,8 +94,15 @@ def save_session_to_supabase():
         if result.data:
             st.session_state["project_data"] = result.data[0]
             st.success(f"✅ Project saved at {result.data[0]['updated_at']}")
-        return result.data[0] if result.data else None
     except APIError as e:
         st.error("❌ Failed to save project to Supabase.")
         st.write(e)
         return None
+
+    # Append score snapshots so reassessments build a history instead of overwriting it
+    try:
+        snapshot_session_scores(project_id, st.session_state)
+    except APIError as e:
+        st.warning(f"⚠️ Project saved, but the assessment history snapshot failed: {e}")
+
+    return result.data[0] if result.data else None
@@ -59,7 +59,7 @@ if not st.session_state.started:
 # --- INIT CONTROLLER ---
 if st.session_state.get("new_project_created"):
     st.session_state.pop("new_project_created", None)
-    st.experimental_rerun()
+    st.rerun()
 
 if "controller" not in st.session_state:
     st.session_state.controller = ITRMController()
@@ -132,6 +132,7 @@ elif step == "📂 Open Existing Project":
                 session_data = project["session_data"]
                 st.session_state["maturity_score"] = session_data.get("maturity_score")
                 st.session_state["it_maturity_answers"] = session_data.get("maturity_answers")
+                st.session_state["it_question_bank_version"] = session_data.get("it_question_bank_version") or 0
                 st.session_state["cybersecurity_answers"] = session_data.get("cyber_answers")
                 st.success("🔄 Project session data synced.")
             else:
@@ -155,7 +156,7 @@ else:
         else:
             st.error("Controller is not initialized or does not have the 'clear_components' method.")
         st.session_state.clear()
-        st.experimental_rerun()
+        st.rerun()
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -184,7 +185,7 @@ if st.sidebar.button("🧹 Reset Session"):
     for key in list(st.session_state.keys()):
         if key not in reserved_keys:
             del st.session_state[key]
-    st.experimental_rerun()
+    st.rerun()
 
 # --- AI Assistant Reasoning Enhancement ---
 def assist_modernization_reasoning(name, category, spend, renewal_date, risk_score):
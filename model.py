@@ -597,16 +597,15 @@ Please rate your cybersecurity maturity against the **NIST Cybersecurity Framewo
 
 # AI Assistant Tab
 elif section == "🤖 AI Assistant":
-    from openai import OpenAI, OpenAIError, RateLimitError, AuthenticationError
+    from openai import OpenAIError, RateLimitError, AuthenticationError
     from streamlit_chat import message
+    from utils.streaming import render_stream, stream_chat_completion
 
     st.title("🤖 AI Assistant")
 
     if "OPENAI_API_KEY" not in st.secrets:
         st.warning("🤖 AI Assistant is temporarily unavailable. Please add your OpenAI API key in Streamlit Secrets.")
     else:
-        client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-
         if "messages" not in st.session_state:
             st.session_state.messages = [
                 {"role": "system", "content": "You are an expert IT strategy assistant helping explain IT Revenue Margin modeling to business leaders."}
@@ -614,26 +613,33 @@ elif section == "🤖 AI Assistant":
 
         user_input = st.text_input("Ask the assistant anything about your IT model or strategy:")
 
-        if user_input:
+        for msg in st.session_state.messages[1:]:
+            message(msg["content"], is_user=msg["role"] == "user")
+
+        # text_input keeps its value across reruns; only a newly entered question is sent
+        if user_input and user_input != st.session_state.get("ai_assistant_last_input"):
+            st.session_state["ai_assistant_last_input"] = user_input
             st.session_state.messages.append({"role": "user", "content": user_input})
-            with st.spinner("Thinking..."):
-                try:
-                    response = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=st.session_state.messages
-                    )
-                    msg = response.choices[0].message.content
-                    st.session_state.messages.append({"role": "assistant", "content": msg})
-                except RateLimitError:
-                    st.error("🚦 OpenAI rate limit exceeded. Please try again later or check your billing settings.")
-                except AuthenticationError:
-                    st.error("🔐 Authentication failed. Please verify your API key and billing setup.")
-                except OpenAIError as e:
-                    st.error(f"💥 OpenAI Error: {str(e)}")
-
-        for i, msg in enumerate(st.session_state.messages[1:]):
-            is_user = (i % 2 == 0)
-            message(msg["content"], is_user=is_user)
+            message(user_input, is_user=True)
+
+            def keep_partial(text):
+                # A new question interrupted this answer: keep what was streamed so far
+                if text:
+                    st.session_state.messages.append({"role": "assistant", "content": text + " …"})
+
+            try:
+                msg = render_stream(
+                    st.empty(),
+                    stream_chat_completion(st.session_state.messages[:], model="gpt-3.5-turbo"),
+                    on_interrupt=keep_partial,
+                )
+                st.session_state.messages.append({"role": "assistant", "content": msg})
+            except RateLimitError:
+                st.error("🚦 OpenAI rate limit exceeded. Please try again later or check your billing settings.")
+            except AuthenticationError:
+                st.error("🔐 Authentication failed. Please verify your API key and billing setup.")
+            except OpenAIError as e:
+                st.error(f"💥 OpenAI Error: {str(e)}")
 
 
 elif section == "📝 IT Maturity Assessment":
@@ -10,6 +10,7 @@ from utils.bootstrap import page_bootstrap
 from utils.session_state import initialize_session
 from utils.auth import enforce_login
 from controller.supabase_controller import save_session_to_supabase
+from utils.assessment_history import load_history
 
 # --- Initialize ---
 initialize_session()
@@ -98,6 +99,26 @@ st.download_button(
     mime="text/csv"
 )
 
+# --- Maturity Trend (append-only assessment history) ---
+st.subheader("📈 Maturity Trend Over Time")
+project_id = (st.session_state.get("project_data") or {}).get("id")
+if project_id:
+    trend_labels = {"IT": "it", "Cybersecurity": "cyber", "AI": "ai"}
+    trend_cols = st.columns(2)
+    trend_kind = trend_labels[trend_cols[0].selectbox("Assessment", list(trend_labels))]
+    years_back = trend_cols[1].slider("Years of history", min_value=1, max_value=10, value=3)
+
+    history = load_history(project_id, trend_kind)
+    start = pd.Timestamp.now(tz="UTC") - pd.DateOffset(years=years_back)
+    trend_df = history.trend(start=start.to_pydatetime())
+    if trend_df.empty:
+        st.info("No saved snapshots yet. Each project save records the current scores.")
+    else:
+        st.line_chart(trend_df)
+        st.caption(f"{len(history)} snapshots stored · showing {len(trend_df)} points")
+else:
+    st.info("Load a project to see its maturity history.")
+
 # --- Save to Supabase ---
 if st.button("💾 Save Project to Supabase"):
     save_session_to_supabase()
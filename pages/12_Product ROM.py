@@ -6,13 +6,14 @@ from fpdf import FPDF
 import uuid
 import numpy as np
 import re
-from tavily import TavilyClient
 
 from utils.bootstrap import page_bootstrap
 from utils.session_state import initialize_session
 from utils.auth import enforce_login
 from controller.supabase_controller import save_session_to_supabase
 from utils.supabase_client import get_supabase
+from utils.local_cache import local_cache
+from utils.llm_providers import search
 
 # --- Setup ---
 st.set_page_config(page_title="Product Recommendations & Budget with AI Lookup", layout="wide")
@@ -22,31 +23,51 @@ enforce_login()
 
 st.title("🛒 Product Recommendations & Budget Plan (AI Price Lookup)")
 
-# --- Tavily + Supabase Init ---
-tavily = TavilyClient(api_key=st.secrets["tavily_api_key"])
+# --- Supabase Init ---
 supabase = get_supabase()
 
-# --- AI Lookup + Supabase Caching ---
+# --- AI Lookup + Local/Supabase Caching ---
+PRICE_CACHE_TTL = 30 * 24 * 3600
+
+def _query_product_prices(product_names):
+    response = supabase.table("product_prices").select("product_name, price").in_("product_name", list(product_names)).execute()
+    prices = {}
+    for row in response.data or []:
+        prices.setdefault(row["product_name"], row["price"])
+    return prices
+
+if st.sidebar.button("🔄 Refresh Cached Prices"):
+    local_cache.invalidate("product_prices")
+
 def lookup_product_price_ai_with_supabase(product_name):
     try:
-        # 1. Check Supabase cache
-        response = supabase.table("product_prices").select("*").eq("product_name", product_name).execute()
-        if response.data and len(response.data) > 0:
-            return response.data[0]["price"]
-
-        # 2. Tavily-enhanced search
+        # 1. Local cache (memory → SQLite); expired prices are served and refreshed in the background
+        fresh, stale = local_cache.get_many("product_prices", [product_name], allow_stale=True)
+        if stale:
+            local_cache.refresh_in_background("product_prices", stale, _query_product_prices, ttl=PRICE_CACHE_TTL)
+        if product_name in fresh or product_name in stale:
+            return fresh.get(product_name, stale.get(product_name))
+
+        # 2. Check Supabase cache
+        price = _query_product_prices([product_name]).get(product_name)
+        if price is not None:
+            local_cache.set("product_prices", product_name, price, ttl=PRICE_CACHE_TTL)
+            return price
+
+        # 3. Tavily-enhanced search
         query = f"{product_name} enterprise software pricing OR list price site:{product_name.split()[0]}.com"
-        results = tavily.search(query, max_results=5)
+        results = search(query, max_results=5)
         for result in results:
             combined_text = f"{result.get('title', '')} {result.get('snippet', '')}"
             match = re.search(r'\$[0-9,]+', combined_text)
             if match:
                 price = float(match.group(0).replace('$', '').replace(',', ''))
-                # 3. Cache in Supabase
+                # 4. Cache in Supabase and locally
                 supabase.table("product_prices").insert({
                     "product_name": product_name,
                     "price": price
                 }).execute()
+                local_cache.set("product_prices", product_name, price, ttl=PRICE_CACHE_TTL)
                 return price
         return None
     except Exception as e:
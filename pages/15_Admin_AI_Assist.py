@@ -1,16 +1,14 @@
 import streamlit as st
-import os
-import openai
 import pandas as pd
 import re
 from utils.intent_classifier import classify_intent
 from utils.session_state import initialize_session
 from utils.auth import enforce_login
 from utils.vector_index import answer_with_code_context
-from langchain_openai import ChatOpenAI
+from utils.streaming import FinalAnswerStreamHandler
 from langchain.agents import initialize_agent, AgentType
 from langchain.tools import Tool
-from langchain_community.tools.tavily_search.tool import TavilySearchResults
+from utils.llm_providers import get_chat_model, search_tool
 from langchain_core.callbacks.manager import CallbackManagerForToolRun
 
 # --- Initialize ---
@@ -20,18 +18,13 @@ initialize_session()
 enforce_login()
 
 # --- API Key Setup ---
-try:
-    openai_key = st.secrets["openai_api_key"]
-    tavily_key = st.secrets["tavily_api_key"]
-except KeyError as e:
-    st.error(f"Missing secret key: {e}")
-    st.stop()
+for secret_key in ("openai_api_key", "tavily_api_key"):
+    if secret_key not in st.secrets:
+        st.error(f"Missing secret key: '{secret_key}'")
+        st.stop()
 
-os.environ["TAVILY_API_KEY"] = tavily_key
-
-# --- LLM and Search Agent ---
-llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0, api_key=openai_key)
-search_tool = TavilySearchResults()
+# --- LLM and Search Agent (shared, pooled and rate-limited via utils/llm_providers.py) ---
+llm = get_chat_model("gpt-3.5-turbo", temperature=0, streaming=True)
 
 # --- App module summarizer tool ---
 def fetch_module_summary(prompt: str, run_manager: CallbackManagerForToolRun = None):
@@ -62,9 +55,9 @@ agent = initialize_agent(
     handle_parsing_errors=True
 )
 
-def query_langchain_product_agent(prompt):
+def query_langchain_product_agent(prompt, callbacks=None):
     try:
-        return agent.run(prompt)
+        return agent.run(prompt, callbacks=callbacks)
     except Exception as e:
         return f"Error fetching product info: {str(e)}"
 
@@ -85,9 +78,18 @@ st.subheader("💬 Ask your Smart IT Consultant")
 with st.form("chat_form"):
     user_prompt = st.text_input("Your question or command:", "What is my current IT spend?")
     submitted = st.form_submit_button("Ask")
-    if submitted and user_prompt:
-        result = query_langchain_product_agent(contextualize(user_prompt))
-        st.session_state.chat_history.append((user_prompt, result))
+
+# The final answer streams in as it is generated; asking again interrupts this run
+if submitted and user_prompt:
+    live = st.empty()
+    with live.container():
+        st.markdown(f"**You:** {user_prompt}")
+        answer_placeholder = st.empty()
+    result = query_langchain_product_agent(
+        contextualize(user_prompt), callbacks=[FinalAnswerStreamHandler(answer_placeholder)]
+    )
+    live.empty()  # the finished exchange is rendered with the history below
+    st.session_state.chat_history.append((user_prompt, result))
 
 for user, bot in reversed(st.session_state.chat_history):
     st.markdown(f"**You:** {user}")
@@ -1,7 +1,7 @@
 import streamlit as st
-import requests
-from openai import OpenAI
+import pandas as pd
 from utils.bootstrap import page_bootstrap
+from utils.llm_providers import chat_completion, provider_metrics, search
 from utils.session_state import initialize_session
 initialize_session()
 from utils.auth import enforce_login
@@ -19,10 +19,9 @@ tavily_key = st.secrets.get("tavily_api_key")
 st.subheader("🤖 OpenAI Test")
 if openai_key:
     try:
-        client = OpenAI(api_key=openai_key)
-        response = client.chat.completions.create(
+        response = chat_completion(
+            [{"role": "user", "content": "Say hello from OpenAI."}],
             model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": "Say hello from OpenAI."}]
         )
         message = response.choices[0].message.content
         st.success("OpenAI connected successfully!")
@@ -32,16 +31,10 @@ if openai_key:
 else:
     st.warning("No OpenAI API key found in secrets.")
 
-from langchain_community.tools.tavily_search.tool import TavilySearchResults
-
-tavily = TavilySearchResults()
-print(tavily.run("Best enterprise data governance tools 2024"))
-
 st.subheader("🔎 Tavily Test")
 
 try:
-    tavily_tool = TavilySearchResults()
-    results = tavily_tool.run("Top enterprise AI governance tools")
+    results = search("Top enterprise AI governance tools")
 
     if results and isinstance(results, list) and len(results) > 0:
         st.success("Tavily connected and returned results!")
@@ -53,5 +46,6 @@ try:
 except Exception as e:
     st.error(f"❌ Tavily test failed: {e}")
 
-
-
+# --- Provider Metrics (process-wide, all sessions) ---
+st.subheader("📈 Provider Latency & Rate Limiting")
+st.dataframe(pd.DataFrame(provider_metrics()).T, use_container_width=True)
@@ -6,7 +6,12 @@ from utils.bootstrap import page_bootstrap
 from utils.session_state import initialize_session
 from utils.auth import enforce_login
 from controller.supabase_controller import save_session_to_supabase
-from utils.ai_assist import generate_ai_maturity_recommendation_with_products
+from utils.ai_assist import (
+    cached_recommendation_set, remember_recommendation_set, score_fingerprint, stream_recommendations
+)
+from utils.question_banks import AI_GROUPED_QUESTIONS
+from utils.paged_assessment import render_paged_assessment, reset_paged_assessment
+from utils.scoring import load_scoring_model
 
 initialize_session()
 enforce_login()
@@ -14,69 +19,8 @@ enforce_login()
 st.set_page_config(page_title="AI Maturity Assessment", layout="wide")
 st.title("🤖 AI Maturity Assessment")
 
-# --- Define AI Maturity Categories & Questions ---
-grouped_questions = {
-    "Infrastructure and Technology": [
-        "Do you have a robust data storage solution that can handle large volumes of data?",
-        "Is your network infrastructure capable of supporting high-speed data transfer?",
-        "Do you have cloud services integrated into your technology stack?",
-        "Are you utilizing modern programming languages and frameworks suitable for AI development?",
-        "Do you have secure systems in place to protect sensitive data from cyber threats?",
-        "Is there a dedicated platform for AI experimentation and deployment available within your organization?",
-        "Are your hardware resources (like GPUs) sufficient for AI processing needs?",
-        "Do you monitor and manage compute resource utilization for AI workloads?",
-        "Are edge devices or IoT integrations part of your AI architecture?",
-        "Do you have observability tools in place to monitor AI system performance and availability in real time?"
-    ],
-    "Data Management and Quality": [
-        "Do you have a centralized data repository for easy access to data across departments?",
-        "Is your data regularly cleaned and updated to ensure accuracy?",
-        "Do you have established protocols for data governance and compliance?",
-        "Is your organization collecting data relevant to your AI use cases?",
-        "Are there processes in place to assess and improve data quality continuously?",
-        "Is there an existing strategy for data privacy that aligns with legal standards?",
-        "Do you have historical data available for training AI models?",
-        "Is metadata consistently captured and maintained across datasets?",
-        "Do you use data catalogs or data lineage tools?",
-        "Are data access controls in place to ensure only authorized personnel can retrieve or manipulate critical datasets?"
-    ],
-    "Talent and Skills": [
-        "Do you have employees with expertise in data science or machine learning?",
-        "Is there a training program in place to upskill staff in AI and related technologies?",
-        "Are interdisciplinary teams formed to collaborate on AI projects?",
-        "Is there a clear understanding of AI concepts and terminology among your leadership team?",
-        "Do you have access to external AI consultants or partnerships?",
-        "Is there a culture of innovation that encourages risk-taking and experimentation?",
-        "Are you actively recruiting for AI-related positions?",
-        "Do you have product managers or business analysts involved in AI use case definition?",
-        "Do project teams have access to MLOps or model deployment skills?",
-        "Do you have a succession or continuity plan for key AI/ML personnel or roles?"
-    ],
-    "Strategy and Vision": [
-        "Do you have a clear AI strategy that aligns with your business goals?",
-        "Is there a dedicated budget allocated for AI projects?",
-        "Are there measurable KPIs established to track the success of AI initiatives?",
-        "Do you have a roadmap for AI implementation over the next 1–3 years?",
-        "Are you regularly revisiting and updating your AI strategy based on industry trends?",
-        "Is there commitment from executive leadership to support AI initiatives?",
-        "Are AI projects prioritized based on their potential business impact?",
-        "Is AI considered a core enabler in your digital transformation agenda?",
-        "Do you conduct regular reviews of AI use cases to ensure alignment with ROI?",
-        "Have business units been engaged in identifying and prioritizing AI use cases that address real operational pain points?"
-    ],
-    "Ethics and Governance": [
-        "Do you have an ethical framework guiding your AI initiatives?",
-        "Is there a process for assessing the potential biases in your AI models?",
-        "Are you transparent with stakeholders about how AI is used in your organization?",
-        "Do you have mechanisms in place to address public concerns about AI?",
-        "Have you established guidelines for responsible AI use?",
-        "Is there a designated team responsible for monitoring AI compliance and ethics?",
-        "Are stakeholders involved in discussions about the ethical implications of AI applications?",
-        "Is there a protocol for handling model failures or unintended AI behavior?",
-        "Do you track AI model performance post-deployment for fairness and drift?",
-        "Is there a clear audit trail or documentation process for how AI decisions are made in critical applications?"
-    ]
-}
+# --- AI Maturity Categories & Questions (shared with the batch scorer) ---
+grouped_questions = AI_GROUPED_QUESTIONS
 
 # --- INPUT FORM ---
 if st.sidebar.radio("Select Tab", ["📝 Input Assessment", "📊 View Results"], horizontal=True) == "📝 Input Assessment":
@@ -84,24 +28,30 @@ if st.sidebar.radio("Select Tab", ["📝 Input Assessment", "📊 View Results"]
 
     if st.sidebar.button("🔄 Clear Assessment"):
         st.session_state.pop("ai_maturity_answers", None)
-        st.experimental_rerun()
+        reset_paged_assessment("ai_maturity_form")
+        st.rerun()
 
     if "ai_maturity_answers" not in st.session_state:
         st.session_state["ai_maturity_answers"] = {}
 
-    with st.form("ai_maturity_form"):
-        local_responses = {}
-
-        for category, questions in grouped_questions.items():
-            st.subheader(category)
-            for q in questions:
-                key = f"{category}::{q}"
-                default = st.session_state["ai_maturity_answers"].get(key, "No")
-                local_responses[key] = st.radio(
-                    q, ["Yes", "No"], key=key, index=0 if default == "Yes" else 1
-                )
-
-        submitted = st.form_submit_button("Submit AI Assessment")
+    if st.sidebar.checkbox("📄 Paged mode (one category per page)"):
+        paged_answers = render_paged_assessment("ai", st.session_state["ai_maturity_answers"], form_key="ai_maturity_form")
+        submitted = paged_answers is not None
+        local_responses = paged_answers or {}
+    else:
+        with st.form("ai_maturity_form"):
+            local_responses = {}
+
+            for category, questions in grouped_questions.items():
+                st.subheader(category)
+                for q in questions:
+                    key = f"{category}::{q}"
+                    default = st.session_state["ai_maturity_answers"].get(key, "No")
+                    local_responses[key] = st.radio(
+                        q, ["Yes", "No"], key=key, index=0 if default == "Yes" else 1
+                    )
+
+            submitted = st.form_submit_button("Submit AI Assessment")
 
     if submitted:
         st.session_state["ai_maturity_answers"] = local_responses.copy()
@@ -114,18 +64,10 @@ else:
         st.warning("⚠️ No responses submitted yet. Please complete the assessment on the Input tab.")
         st.stop()
 
-    score_data = {}
-    for key, response in st.session_state["ai_maturity_answers"].items():
-        category, _ = key.split("::", 1)
-        if category not in score_data:
-            score_data[category] = {"yes": 0, "total": 0}
-        if response == "Yes":
-            score_data[category]["yes"] += 1
-        score_data[category]["total"] += 1
-
+    # Weighted model (scoring_model.json); neutral defaults = fraction of "Yes"
     score_rows = [
-        {"Category": category, "Score (%)": round((data["yes"] / data["total"]) * 100, 1)}
-        for category, data in score_data.items()
+        {"Category": category, "Score (%)": score}
+        for category, score in load_scoring_model("ai").category_scores(st.session_state["ai_maturity_answers"]).items()
     ]
 
     score_df = pd.DataFrame(score_rows).sort_values(by="Category")
@@ -156,30 +98,59 @@ else:
     st.plotly_chart(fig, use_container_width=True)
 
     st.header("🧭 Recommendations by Category")
-    st.session_state["ai_maturity_recommendations"] = []
-    
-    for _, row in score_df.iterrows():
-        score = row["Score (%)"]
-        category = row["Category"]
-    
-        rec_data = generate_ai_maturity_recommendation_with_products(category)
+    scores = dict(zip(score_df["Category"], score_df["Score (%)"]))
+
+    def render_recommendation(container, category, rec_data):
         rec_text = rec_data.get("recommendation", "")
         products = rec_data.get("products", [])
-    
-        st.session_state["ai_maturity_recommendations"].append({
+
+        with container.container():
+            st.markdown(f"### {category} (Score: {scores[category]}%)")
+            st.markdown(f"**Recommendation:** {rec_text}")
+
+            if products and isinstance(products[0], dict):
+                st.markdown("**Recommended Products/Services:**")
+                df = pd.DataFrame(products)
+                df = df.fillna("N/A")  # fallback for missing fields
+                st.dataframe(df, use_container_width=True)
+            else:
+                st.markdown("**Recommended Products/Services:** _No specific products found_")
+
+    # Recommendations are regenerated only when the scores change: this session's last
+    # set first, then a set any session produced for the same scores
+    fingerprint = score_fingerprint(scores)
+    results = None
+    if st.session_state.get("ai_recommendations_fingerprint") == fingerprint:
+        results = {r["category"]: r for r in st.session_state.get("ai_maturity_recommendations", [])}
+        if set(results) != set(scores):
+            results = None
+    if results is None:
+        results = cached_recommendation_set("ai", fingerprint)
+
+    if results is not None:
+        for category in scores:
+            render_recommendation(st.empty(), category, results[category])
+    else:
+        placeholders = {category: st.empty() for category in scores}
+        for category in scores:
+            placeholders[category].markdown(f"### {category} (Score: {scores[category]}%)\n⏳ _Generating recommendation..._")
+
+        # Cached categories come from one bulk query; misses run concurrently and render as each completes
+        results = {}
+        for category, rec_data in stream_recommendations("ai", list(scores)):
+            results[category] = rec_data
+            render_recommendation(placeholders[category], category, rec_data)
+        remember_recommendation_set("ai", fingerprint, results)
+
+    # Failed or timed-out categories are retried on the next render
+    has_errors = any(r.get("error") for r in results.values())
+    st.session_state["ai_recommendations_fingerprint"] = None if has_errors else fingerprint
+    st.session_state["ai_maturity_recommendations"] = [
+        {
             "category": category,
-            "score": score,
-            "recommendation": rec_text,
-            "products": products
-        })
-    
-        st.markdown(f"### {category} (Score: {score}%)")
-        st.markdown(f"**Recommendation:** {rec_text}")
-    
-        if products and isinstance(products[0], dict):
-            st.markdown("**Recommended Products/Services:**")
-            df = pd.DataFrame(products)
-            df = df.fillna("N/A")  # fallback for missing fields
-            st.dataframe(df, use_container_width=True)
-        else:
-            st.markdown("**Recommended Products/Services:** _No specific products found_")
+            "score": scores[category],
+            "recommendation": results[category].get("recommendation", ""),
+            "products": results[category].get("products", [])
+        }
+        for category in scores
+    ]
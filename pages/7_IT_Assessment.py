@@ -4,56 +4,18 @@ import plotly.express as px
 from utils.bootstrap import page_bootstrap
 from utils.session_state import initialize_session
 initialize_session()
-from utils.ai_assist import generate_it_maturity_recommendation_with_products
+from utils.ai_assist import stream_recommendations
 from utils.auth import enforce_login
 enforce_login()
 from controller.supabase_controller import save_session_to_supabase
-
-# Embedded grouped questions JSON (shortened for readability — insert full content below)
-grouped_questions = {
-    "Survival / Legacy / Ad-Hoc": [
-        "Infrastructure is manually provisioned with minimal automation.",
-        "Separate physical servers and storage are used for each workload.",
-        "Backups exist but are manual and inconsistently tested.",
-        "No formal incident response process or security oversight.",
-        "Monitoring is siloed or reactive only."
-    ],
-    "Standardized / Service-Aligned": [
-        "Standard operating environments (SOEs) exist for OS, middleware, and database.",
-        "IT service management (ITSM) processes are documented and partially adopted.",
-        "SLAs and RTO/RPOs are defined for key applications.",
-        "Service request and incident tracking is centralized (e.g. via ITSM tool).",
-        "Network architecture is documented and maintained to reference standards."
-    ],
-    "Virtualized / Cloud-Ready": [
-        "Most workloads are virtualized or containerized.",
-        "Cloud usage (public/private) is governed via policy.",
-        "Infrastructure is provisioned through templates or IaC (e.g., Terraform, CloudFormation).",
-        "Role-based access controls are centrally managed.",
-        "Security patches and updates are deployed on a defined schedule."
-    ],
-    "Automated / Observability-Driven": [
-        "Infrastructure provisioning and app deployment are fully automated via CI/CD.",
-        "Centralized observability is in place (e.g., logs, metrics, traces).",
-        "Configuration drift is automatically detected and remediated.",
-        "Automated testing is included in deployment pipelines.",
-        "Automated scaling and self-healing systems are in use."
-    ],
-    "Business-Aligned / Self-Service": [
-        "Business KPIs are directly tied to IT service metrics and dashboards.",
-        "Users can self-provision services from a defined catalog.",
-        "Cost allocation is activity-based or tagged per service/user/project.",
-        "Cross-functional teams collaborate on IT planning and forecasting.",
-        "IT investment decisions are driven by business value and outcome modeling."
-    ],
-    "Innovative / Predictive / Autonomous": [
-        "AI/ML is used for predictive capacity planning or anomaly detection.",
-        "Security is integrated into CI/CD pipelines (DevSecOps).",
-        "Cloud cost optimization is automated with policy-based actions.",
-        "Disaster recovery and failover are tested regularly and auto-validated.",
-        "Digital twin or simulation models are used for infrastructure planning."
-    ]
-}
+from utils.question_bank_store import cached_versions, get_bank, get_latest_bank, migrate_answers, new_question_id, publish_version
+from utils.paged_assessment import render_paged_assessment, reset_paged_assessment
+from utils.scoring import load_scoring_model
+
+# Versioned question bank (utils/question_bank_store.py), shared by all sessions
+bank_backend = st.secrets.get("question_bank_backend", "local")
+it_bank = get_latest_bank("it", bank_backend)
+grouped_questions = it_bank.grouped_questions()
 # --- Page Config ---
 st.set_page_config(page_title="IT Maturity Assessment", layout="wide")
 st.title("🧠 IT Maturity Assessment Tool")
@@ -66,7 +28,8 @@ across several technology domains.
 # --- Clear Button ---
 if st.sidebar.button("🔄 Clear Assessment"):
     st.session_state.pop("it_maturity_answers", None)
-    st.experimental_rerun()
+    reset_paged_assessment("maturity_form")
+    st.rerun()
 
 # --- Safe Initialization ---
 if "it_maturity_answers" not in st.session_state or not isinstance(st.session_state["it_maturity_answers"], dict):
@@ -75,23 +38,42 @@ if "it_maturity_answers" not in st.session_state or not isinstance(st.session_st
     else:
         st.session_state["it_maturity_answers"] = {}
 
+# --- Migrate answers saved against an older question bank version ---
+if "it_question_bank_version" not in st.session_state:
+    saved_session = (st.session_state.get("project_data") or {}).get("session_data") or {}
+    st.session_state["it_question_bank_version"] = saved_session.get("it_question_bank_version") or 0
+if st.session_state["it_question_bank_version"] != it_bank.version:
+    try:
+        old_bank = get_bank("it", st.session_state["it_question_bank_version"], bank_backend)
+        st.session_state["it_maturity_answers"] = migrate_answers(st.session_state["it_maturity_answers"], old_bank, it_bank)
+    except (KeyError, FileNotFoundError):
+        st.warning("⚠️ Saved answers reference an unknown question bank version; unmatched answers were kept as-is.")
+    st.session_state["it_question_bank_version"] = it_bank.version
+    reset_paged_assessment("maturity_form")
+st.sidebar.caption(f"📚 Question bank v{it_bank.version}")
+
 # ----------------- Questionnaire Form -----------------
-with st.form("maturity_form"):
-    local_responses = {}
-
-    for category, questions in grouped_questions.items():
-        st.subheader(category.strip())
-        for q in questions:
-            key = f"{category.strip()}::{q.strip()}"
-            default = (st.session_state.get("it_maturity_answers") or {}).get(key, "No")
-            local_responses[key] = st.radio(
-                q.strip(),
-                ["Yes", "No"],
-                key=f"form_radio_{key}",  # ❗ make key unique to avoid reuse error
-                index=0 if default == "Yes" else 1
-            )
-
-    submitted = st.form_submit_button("Submit Assessment")
+if st.sidebar.checkbox("📄 Paged mode (one category per page)"):
+    paged_answers = render_paged_assessment("it", st.session_state["it_maturity_answers"], form_key="maturity_form", bank=it_bank)
+    submitted = paged_answers is not None
+    local_responses = paged_answers or {}
+else:
+    with st.form("maturity_form"):
+        local_responses = {}
+
+        for category, questions in grouped_questions.items():
+            st.subheader(category.strip())
+            for q in questions:
+                key = f"{category.strip()}::{q.strip()}"
+                default = (st.session_state.get("it_maturity_answers") or {}).get(key, "No")
+                local_responses[key] = st.radio(
+                    q.strip(),
+                    ["Yes", "No"],
+                    key=f"form_radio_{key}",  # ❗ make key unique to avoid reuse error
+                    index=0 if default == "Yes" else 1
+                )
+
+        submitted = st.form_submit_button("Submit Assessment")
 
 # ----------------- After submit logic -----------------
 if submitted:
@@ -100,16 +82,11 @@ if submitted:
 
     # Calculate and show results
     st.header("📊 Maturity Assessment Results")
-    score_data = []
-
-    for category in grouped_questions:
-        questions = grouped_questions[category]
-        yes_count = sum(
-            1 for q in questions if local_responses.get(f"{category.strip()}::{q}") == "Yes"
-        )
-        total = len(questions)
-        percent = round((yes_count / total) * 100, 1)
-        score_data.append({"Category": category.strip(), "Score (%)": percent})
+    # Weighted model (scoring_model.json); neutral defaults = fraction of "Yes"
+    score_data = [
+        {"Category": category, "Score (%)": percent}
+        for category, percent in load_scoring_model("it", bank=it_bank).category_scores(local_responses).items()
+    ]
 
     score_df = pd.DataFrame(score_data).sort_values(by="Category")
     st.dataframe(score_df, use_container_width=True)
@@ -180,31 +157,37 @@ if "it_maturity_scores" in st.session_state:
 
 if submitted:
     st.header("🧭 Recommendations by Category")
-    st.session_state["it_maturity_recommendations"] = []
-    for _, row in score_df.iterrows():
-        score = row["Score (%)"]
-        category = row["Category"]
-
-        rec_data = generate_it_maturity_recommendation_with_products(category)
+    scores = dict(zip(score_df["Category"], score_df["Score (%)"]))
+    placeholders = {category: st.empty() for category in scores}
+    for category in scores:
+        placeholders[category].markdown(f"### {category} (Score: {scores[category]}%)\n⏳ _Generating recommendation..._")
+
+    # ✅ Cached categories come from one bulk query; misses run concurrently and render as each completes
+    results = {}
+    for category, rec_data in stream_recommendations("it", list(scores)):
+        results[category] = rec_data
         rec_text = rec_data.get("recommendation", "")
         products = rec_data.get("products", [])
 
-        st.session_state["it_maturity_recommendations"].append({
-            "category": category,
-            "score": score,
-            "recommendation": rec_text,
-            "products": products
-        })
+        with placeholders[category].container():
+            st.markdown(f"### {category} (Score: {scores[category]}%)")
+            st.markdown(f"**Recommendation:** {rec_text}")
 
-        # ✅ Immediately render to page
-        st.markdown(f"### {category} (Score: {score}%)")
-        st.markdown(f"**Recommendation:** {rec_text}")
+            if products and isinstance(products[0], dict):
+                st.markdown("**Recommended Products/Services:**")
+                st.dataframe(pd.DataFrame(products), use_container_width=True)
+            else:
+                st.markdown("**Recommended Products/Services:** _No specific products found_")
 
-        if products and isinstance(products[0], dict):
-            st.markdown("**Recommended Products/Services:**")
-            st.dataframe(pd.DataFrame(products), use_container_width=True)
-        else:
-            st.markdown("**Recommended Products/Services:** _No specific products found_")
+    st.session_state["it_maturity_recommendations"] = [
+        {
+            "category": category,
+            "score": scores[category],
+            "recommendation": results[category].get("recommendation", ""),
+            "products": results[category].get("products", [])
+        }
+        for category in scores
+    ]
 
 # --- Saved recommendations rendering ---
 if "it_maturity_recommendations" in st.session_state and st.session_state["it_maturity_recommendations"]:
@@ -221,23 +204,38 @@ if "it_maturity_recommendations" in st.session_state and st.session_state["it_ma
 # ---------------- Admin Tab: Edit Questions ----------------
 st.markdown("---")
 st.subheader("✏️ Edit Assessment Questions")
+st.caption("Edits are saved as a new question bank version; existing answers carry over by question ID.")
 
-if 'grouped_questions' not in st.session_state:
-    st.session_state.grouped_questions = grouped_questions.copy()
+# Draft of the active version; reset whenever a newer version is published
+if st.session_state.get("it_question_draft_version") != it_bank.version:
+    st.session_state.it_question_draft = [dict(q) for q in it_bank.questions]
+    st.session_state.it_question_draft_version = it_bank.version
+draft = st.session_state.it_question_draft
 
-edited_category = st.selectbox("Select Category to Edit", list(st.session_state.grouped_questions.keys()))
+edited_category = st.selectbox("Select Category to Edit", it_bank.categories)
 new_question = st.text_input("Add a new question to this category:")
 
 if st.button("➕ Add Question") and new_question:
-    st.session_state.grouped_questions[edited_category].append(new_question)
+    draft.append({"id": new_question_id(), "category": edited_category, "section": edited_category, "question": new_question})
     st.success(f"Question added to {edited_category}!")
 
-if st.button("🗑️ Remove Last Question") and st.session_state.grouped_questions[edited_category]:
-    removed = st.session_state.grouped_questions[edited_category].pop()
-    st.warning(f"Removed: {removed}")
+category_questions = [q for q in draft if q["category"] == edited_category]
+to_remove = st.selectbox("Question to remove", [q["question"] for q in category_questions]) if category_questions else None
+
+if st.button("🗑️ Remove Question") and to_remove:
+    st.session_state.it_question_draft = draft = [q for q in draft if not (q["category"] == edited_category and q["question"] == to_remove)]
+    st.warning(f"Removed: {to_remove}")
 
 st.markdown("### Current Questions in Selected Category:")
-st.write(st.session_state.grouped_questions[edited_category])
+st.write([q["question"] for q in draft if q["category"] == edited_category])
+
+change_note = st.text_input("Change note", placeholder="e.g., Added backup testing question")
+if st.button("📦 Publish New Question Bank Version"):
+    version = publish_version("it", draft, note=change_note, backend=bank_backend)
+    st.success(f"✅ Published question bank v{version}.")
+    st.rerun()
+
+st.caption("Versions: " + ", ".join(f"v{v}" for v in cached_versions("it", bank_backend)))
 
 
 
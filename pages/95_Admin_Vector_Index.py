@@ -1,6 +1,9 @@
 import streamlit as st
-import os
-from utils.vector_index import build_vector_index, preview_indexed_docs
+import itertools
+import pandas as pd
+from utils.source_loader import iter_source_files, iter_source_texts
+from utils.chunk_catalog import catalog_summary, list_sources, query_chunks, sources_matching
+from utils.vector_index import UPLOAD_PREFIX, VECTOR_INDEX_PATH, is_scanned_source, update_vector_index
 from utils.auth import enforce_login
 
 # --- Authenticate
@@ -13,12 +16,30 @@ st.title("🧠 Vector Index Admin Console")
 # --- Section 1: View Indexed Modules
 st.subheader("✅ Currently Indexed Modules")
 
-docs = list(preview_indexed_docs())
-if docs:
-    for doc in docs:
-        st.markdown(f"- `{doc.metadata.get('source', 'Unnamed File')}`")
+SOURCES_PER_PAGE = 50
+CHUNKS_PER_PAGE = 20
+
+def page_controls(total, per_page, key):
+    """Page-number input; returns the row offset of the selected page."""
+    pages = max(1, -(-total // per_page))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=key)
+    return (page - 1) * per_page
+
+# Reads the SQLite chunk catalog written at build time, never the FAISS docstore
+summary = catalog_summary(VECTOR_INDEX_PATH)
+if summary:
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Sources", summary["sources"])
+    col2.metric("Chunks", summary["chunks"])
+    col3.metric("Indexed characters", f"{summary['chars']:,}")
+
+    source_filter = st.text_input("Filter sources by path", key="source_filter")
+    offset = page_controls(list_sources(VECTOR_INDEX_PATH, source_filter, limit=0)[1], SOURCES_PER_PAGE, "source_page")
+    sources, _ = list_sources(VECTOR_INDEX_PATH, source_filter, limit=SOURCES_PER_PAGE, offset=offset)
+    for row in sources:
+        st.markdown(f"- `{row['source']}` ({row['chunks']} chunks, {row['chars']:,} chars)")
 else:
-    st.info("No modules have been indexed yet.")
+    st.info("No modules have been indexed yet. Build the index below to create the chunk catalog.")
 
 # --- Section 2: Upload New Files for Indexing
 st.subheader("📂 Upload New Code or Documentation")
@@ -29,19 +50,39 @@ uploaded_files = st.file_uploader(
     accept_multiple_files=True
 )
 
-uploaded_contents = []
+def report_index_update(stats):
+    st.success(
+        f"✅ Vector index updated: {stats['chunks_added']} chunks embedded, {stats['chunks_deleted']} removed "
+        f"({stats['sources_changed']} changed, {stats['sources_unchanged']} unchanged, "
+        f"{stats['sources_removed']} removed sources)."
+    )
+    looked_up = stats["embedding_cache_hits"] + stats["embedding_cache_misses"]
+    if looked_up:
+        st.caption(
+            f"Embedding cache: {stats['embedding_cache_hits']}/{looked_up} chunks reused "
+            f"({stats['embedding_cache_hits'] / looked_up:.0%} hit rate)."
+        )
+    report = stats.get("index_report")
+    if report:
+        if report["type"] != report["requested"]:
+            st.info(f"Too few vectors to train a `{report['requested']}` index yet; serving `{report['type']}` instead.")
+        st.markdown("**Index recall / latency (sampled queries vs exact search):**")
+        st.dataframe(pd.DataFrame([report]), hide_index=True)
+
+# Keyed by source name so incremental builds can tell which files changed
+uploaded_contents = {}
 if uploaded_files:
     for file in uploaded_files:
         try:
-            content = file.read().decode("utf-8")
-            uploaded_contents.append(content)
+            content = file.getvalue().decode("utf-8")
+            uploaded_contents[f"{UPLOAD_PREFIX}{file.name}"] = content
             st.success(f"✅ Loaded: {file.name}")
         except Exception as e:
             st.warning(f"Failed to read {file.name}: {e}")
 
     if st.button("🔄 Build / Refresh Vector Index"):
-        build_vector_index(uploaded_contents)
-        st.success("✅ Vector index updated successfully!")
+        _, stats = update_vector_index(uploaded_contents)
+        report_index_update(stats)
 
 # --- Section 3: Module Indexing Summary
 st.subheader("📊 Module Indexing Summary")
@@ -51,8 +92,8 @@ target_modules = [
     "ai_assist.py", "risk_simulator.py", "calculators.py"
 ]
 
-indexed_sources = [doc.metadata.get("source", "") for doc in docs]
-missing_modules = [m for m in target_modules if not any(m in src for src in indexed_sources)]
+indexed_modules = sources_matching(VECTOR_INDEX_PATH, target_modules)
+missing_modules = [m for m in target_modules if m not in indexed_modules]
 
 st.markdown("**Indexed Modules:**")
 st.success(", ".join(set(target_modules) - set(missing_modules)) or "None yet")
@@ -61,52 +102,54 @@ st.markdown("**Missing Modules:**")
 st.warning(", ".join(missing_modules) or "All modules indexed ✅")
 
 # --- Section 4: Auto-discover Source Files from Project
-def auto_discover_files():
-    discovered = []
-    for root, _, files in os.walk("."):
-        if any(excl in root for excl in [".venv", "__pycache__", "vector_store", ".git"]):
-            continue
-        for file in files:
-            if file.endswith((".py", ".md", ".txt")):
-                discovered.append(os.path.join(root, file))
-    return discovered
-
 st.subheader("🔍 Discover Local Source Files")
 
+discovered_files = []
 if st.checkbox("Auto-load source files from project"):
-    discovered_files = auto_discover_files()
+    discovered_files = sorted(iter_source_files("."))
     st.write(f"Found {len(discovered_files)} source files:")
     st.code("\n".join(discovered_files[:10]) + ("\n..." if len(discovered_files) > 10 else ""))
 
 # --- Section 5: Build Index from Discovered + Uploaded Files
 if st.button("⚙️ Build Vector Index from Source and Uploads"):
-    combined_texts = []
-
-    if "discovered_files" in locals():
-        for path in discovered_files:
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    combined_texts.append(f.read())
-            except Exception as e:
-                st.warning(f"Skipped {path}: {e}")
-
-    if uploaded_files:
-        for file in uploaded_files:
-            try:
-                content = file.read().decode("utf-8")
-                combined_texts.append(content)
-            except Exception as e:
-                st.warning(f"Upload error: {file.name} - {e}")
-
-    if combined_texts:
-        build_vector_index(combined_texts)
-        st.success("✅ Vector index built successfully!")
+    total = len(discovered_files) + len(uploaded_contents)
+
+    if total:
+        progress_bar = st.progress(0.0, text="Indexing sources...")
+        def show_progress(stats):
+            done = stats["sources_changed"] + stats["sources_unchanged"]
+            progress_bar.progress(min(1.0, done / total), text=f"Indexed {done}/{total} sources ({stats['chunks_added']} new chunks)")
+
+        # Files are read in parallel and chunked as they arrive; only a bounded window is held in memory
+        sources = itertools.chain(
+            iter_source_texts(discovered_files, on_error=lambda path, e: st.warning(f"Skipped {path}: {e}")),
+            uploaded_contents.items(),
+        )
+        # A full source scan is authoritative for project files: those no longer present are
+        # dropped from the index. Documents uploaded in earlier runs are kept.
+        prune = is_scanned_source if discovered_files else False
+        _, stats = update_vector_index(sources, prune=prune, progress=show_progress)
+        progress_bar.empty()
+        report_index_update(stats)
     else:
         st.warning("⚠️ No valid files found or uploaded.")
 
 # --- Section 6: Preview Indexed Chunks
 st.subheader("📚 Preview Indexed Chunks")
 
-for i, doc in enumerate(docs):
-    with st.expander(f"Chunk {i+1} - {doc.metadata.get('source', 'Unknown')}"):
-        st.code(doc.page_content[:1000])
+if summary:
+    col1, col2 = st.columns(2)
+    chunk_source_filter = col1.text_input("Source path contains", key="chunk_source_filter")
+    symbol_filter = col2.text_input("Function / class name contains", key="chunk_symbol_filter")
+    _, matching = query_chunks(VECTOR_INDEX_PATH, chunk_source_filter, symbol_filter, limit=0)
+    st.caption(f"{matching} matching chunks")
+    offset = page_controls(matching, CHUNKS_PER_PAGE, "chunk_page")
+    chunks, _ = query_chunks(VECTOR_INDEX_PATH, chunk_source_filter, symbol_filter, limit=CHUNKS_PER_PAGE, offset=offset)
+    for i, chunk in enumerate(chunks, start=offset + 1):
+        label = f"Chunk {i} - {chunk['source']}"
+        if chunk["qualified_name"]:
+            label += f" · {chunk['qualified_name']} (lines {chunk['start_line']}-{chunk['end_line']})"
+        with st.expander(f"{label} · {chunk['chars']} chars"):
+            st.code(chunk["preview"])
+else:
+    st.info("Nothing to preview yet.")
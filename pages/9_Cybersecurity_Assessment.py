@@ -9,6 +9,9 @@ from utils.session_state import initialize_session
 from utils.auth import enforce_login
 from controller.supabase_controller import save_session_to_supabase
 from utils.ai_assist import generate_cybersecurity_recommendation_with_products
+from utils.question_banks import CYBER_QUESTIONNAIRE
+from utils.paged_assessment import render_paged_assessment
+from utils.scoring import load_scoring_model
 
 # ---------------------------
 # App Init
@@ -41,7 +44,7 @@ def render_charts(section_scores):
 if section == "🧠 Overview Summary":
     st.title("🧠 Cybersecurity Assessment Summary")
 
-  
+    summary = """
     ## Strategy Overview
     - Optimize Cybersecurity environments
     - Improve cybersecurity maturity
@@ -84,312 +87,11 @@ if section == "🧠 Overview Summary":
 
 
 # ---------- Inputs Setup ----------
-elif section == "⚙️ Inputs":
-    st.title("⚙️ Inputs")
+elif section == "⚙️ Assessment":
+    st.title("⚙️ Assessment")
 
-    # Full Cybersecurity Maturity Assessment Questions
-    questionnaire = [
-        {
-            "category": "Identity",
-            "section": "Survival",
-            "questions": [
-                "Does your organization maintain an inventory of all authorized and unauthorized devices connected to your network?",
-                "Do you have an inventory of all authorized and unauthorized software within your organization?",
-                "Have you established an asset management process that tracks the lifecycle of devices and software?",
-                "Does your organization have a documented policy for identity and access management?"
-            ]
-        },
-        {
-            "category": "Identity",
-            "section": "Awareness",
-            "questions": [
-                "Have you implemented multi-factor authentication (MFA) for accessing sensitive systems and data?",
-                "Is there a process in place to grant and revoke user access based on job roles and responsibilities?",
-                "Do you regularly review and update user access permissions and privileges?",
-                "Have you implemented strong password policies, including password complexity and expiration rules?"
-            ]
-        },
-        {
-            "category": "Identity",
-            "section": "Committed",
-            "questions": [
-                "Is there a process for promptly deactivating accounts for employees who leave your organization?",
-                "Do you use automated account provisioning and deprovisioning for user accounts?",
-                "Have you implemented secure methods for user authentication and authorization?",
-                "Does your organization enforce the principle of least privilege (users have the minimum access required to perform their duties)?"
-            ]
-        },
-        {
-            "category": "Identity",
-            "section": "Service Aligned",
-            "questions": [
-                "Is there a process for reviewing and addressing accounts with excessive privileges?",
-                "Do you maintain logs of user access and authorization activities?",
-                "Is there a process for monitoring and detecting suspicious or unauthorized access attempts?",
-                "Have you implemented encryption for sensitive data at rest and in transit?"
-            ]
-        },
-        {
-            "category": "Identity",
-            "section": "Innovation Optimized",
-            "questions": [
-                "Does your organization conduct security awareness training for employees?",
-                "Have you established an incident response plan that includes identity and access management considerations?",
-                "Is there a process for regular auditing and testing of identity and access controls?",
-                "Does your organization regularly assess the effectiveness of your identity and access management program and make improvements as needed?"
-             ]
-        },
-        {
-            "category": "Protect",
-            "section": "Survival",
-            "questions": [
-                "Do you have a documented information security policy",
-                "Is there a process for classifying data ancd information assets based on sensitivity?",
-                "Have you implemented access control measures to restrict unauthorized access to sensitive data?",
-                "Do you regularly update and patch your software and systems to address known vulnerabilities?"
-            ]
-        },
-        {
-            "category": "Protect",
-            "section": "Awareness",
-            "questions": [
-                "Is there an established process for secure software development and code review?",
-                "Have you implemented network segmentation to isolate critical systems and data from less secure areas?",
-                "Is there an intrusion detection system (IDS) in place to monitor for suspicious network activities?",
-                "Have you implemented firewalls to control inbound and outbound network traffic?"
-            ]
-        },
-        {
-            "category": "Protect",
-            "section": "Committed",
-            "questions": [
-                "Is there a process for monitoring and responding to cybersecurity threats and incidents?",
-                "Do you use encryption to protect sensitive data in transit and at rest?",
-                "Have you implemented endpoint protection solutions (e.g., antivirus, anti-malware) on all devices?",
-                "Is there a documented incident response plan that includes communication and coordination with stakeholders?"
-            ]
-        },
-        {
-            "category": "Protect",
-            "section": "Service Aligned",
-            "questions": [
-                "Have you established secure configurations for your hardware and software?",
-                "Do you conduct regular security awareness training for employees?",
-                "Is there a process for managing and securing removable media (e.g., USB drives)?",
-                "Have you implemented secure email and web browsing practices and technologies?"
-            ]
-        },
-        {
-            "category": "Protect",
-            "section": "Innovation Optimized",
-            "questions": [
-                "Is there a data backup and recovery plan in place, and are backups regularly tested?",
-                "Do you have a secure mobile device management (MDM) solution for company-owned and BYOD devices?",
-                "Is there a process for securely disposing of hardware and media containing sensitive data?",
-                "Have you established secure supply chain practices to verify the security of third-party products and services?"
-            ]
-        },
-        {
-            "category": "Detect",
-            "section": "Survival",
-            "questions": [
-                "Do you have a dedicated team responsible for monitoring and detecting cybersecurity threats?",
-                "Is there a process in place to continuously monitor network traffic for unusual or suspicious activities?",
-                "Have you implemented intrusion detection systems (IDS) and intrusion prevention systems (IPS)?",
-                "Is there a process for monitoring system and application logs for security events?"
-            ]
-        },
-        {
-            "category": "Detect",
-            "section": "Awareness",
-            "questions": [
-                "Do you regularly review and analyze security logs to detect potential threats?",
-                "Is there a documented incident detection and reporting process in your organization?",
-                "Have you implemented security information and event management (SIEM) solutions for centralized log and event analysis?",
-                "Is there a process for threat intelligence collection and analysis to stay informed about emerging threats?"
-            ]
-        },
-        {
-            "category": "Detect",
-            "section": "Committed",
-            "questions": [
-                "Do you use vulnerability scanning tools to identify weaknesses in your systems and applications?",
-                "Have you implemented file integrity monitoring (FIM) to detect unauthorized changes to critical files?",
-                "Is there a process for monitoring and detecting anomalies in user account activities and access?",
-                "Do you use behavioral analytics to detect abnormal user behavior that may indicate a security threat?"
-            ]
-        },
-        {
-            "category": "Detect",
-            "section": "Service Aligned",
-            "questions": [
-                "Is there a process for monitoring email traffic for phishing attempts and malicious attachments?",
-                "Have you implemented endpoint detection and response (EDR) solutions on your devices?",
-                "Is there a process for identifying and responding to unauthorized or rogue devices on your network?",
-                "Do you use threat hunting techniques to proactively search for hidden threats within your network?"
-            ]
-        },
-        {
-            "category": "Detect",
-            "section": "Innovation Optimized",
-            "questions": [
-                "Is there a process for correlating and prioritizing security alerts based on risk?",
-                "Do you conduct regular tabletop exercises to test your incident detection and response capabilities?",
-                "Have you established key performance indicators (KPIs) to measure the effectiveness of your detection capabilities?",
-                "Is there a documented process for communicating and coordinating incident detection and response with external stakeholders, such as law enforcement or industry groups?"
-            ]
-        },
-        {
-            "category": "Respond",
-            "section": "Survival",
-            "questions": [
-                "Do you have an incident response plan place?",
-                "Is there a dedicated incident response team ora clearly defined incident response role within your organization?",
-                "Have you established an incident notification process to report and escalate security incidents?",
-                "Is there a process for classifying and prioritizing incidents based on severity?"
-            ]
-        },
-        {
-            "category": "Respond",
-            "section": "Awareness",
-            "questions": [
-                "Do you have predefined communication procedures for internal and external stakeholders during an incident?",
-                "Have you identified and established contact information for key incident response contacts, both internal and external?",
-                "Is there a documented procedure for preserving evidence and maintaining chain of custody during an incident?",
-                "Do you regularly conduct tabletop exercises and simulations to test your incident response plan?"
-            ]
-        },
-        {
-            "category": "Respond",
-            "section": "Committed",
-            "questions": [
-                "Is there a process for isolating and containing affected systems or networks during an incident?",
-                "Have you established a procedure for collecting and analyzing forensic evidence to determine the scope and impact of an incident?",
-                "Is there a process for documenting incident details, actions taken, and lessons learned?",
-                "Have you identified and documented legal and regulatory reporting requirements in case of a data breach or incident?"
-            ]
-        },
-        {
-            "category": "Respond",
-            "section": "Service Aligned",
-            "questions": [
-                "Is there a process for notifying affected individuals or organizations in compliance with data breach notification laws?",
-                "Do you have predefined incident response playbooks for common incident types?",
-                "Is there a process for coordinating incident response activities with external organizations, such as law enforcement or industry peers?",
-                "Have you established a post-incident review process to assess the effectiveness of your response and identify areas for improvement?"
-            ]
-        },
-        {
-            "category": "Respond",
-            "section": "Innovation Optimized",
-            "questions": [
-                "Is there a documented process for providing executive management and relevant stakeholders with incident status updates?",
-                "Do you maintain a record of past incidents and the actions taken to resolve them?",
-                "Is there a process for conducting a root cause analysis of incidents to prevent future occurrences?",
-                "Have you established key performance indicators (KPIs) and metrics to measure the effectiveness of your incident response capabilities?"
-            ]
-        },
-        {
-            "category": "Recover",
-            "section": "Survival",
-            "questions": [
-                "Do you have a documented business continuity and disaster recovery (BC/DR) plan in place?",
-                "Is there a dedicated BC/DR team or a clearly defined BC/DR role within your organization?",
-                "Have you identified critical business processes and assets that need to be prioritized for recovery?",
-                "Is there a process for regularly backing up critical data and systems?"
-            ]
-        },
-        {
-            "category": "Recover",
-            "section": "Awareness",
-            "questions": [
-                "Have you established recovery time objectives (RTOs) and recovery point objectives (RPOs) for key systems and data?",
-                "Is there a process for testing and validating backups to ensure they can be restored successfully?",
-                "Do you have off-site or remote data backups to protect against physical disasters?",
-                "Is there a documented procedure for restoring critical systems and data in a timely manner?"
-            ]
-        },
-        {
-            "category": "Recover",
-            "section": "Committed",
-            "questions": [
-                "Have you identified and documented alternative IT infrastructure and facilities for use during recovery?",
-                "Is there a process for notifying employees and stakeholders about recovery procedures and expectations?",
-                "Do you conduct regular disaster recovery exercises to test your BC/DR plan?",
-                "Is there a documented process for re-establishing network connectivity and access after an incident?"
-            ]
-        },
-        {
-            "category": "Recover",
-            "section": "Service Aligned",
-            "questions": [
-                "Have you established a process for restoring user access and privileges in a secure manner?",
-                "Is there a procedure for conducting a post-incident assessment to identify areas for recovery process improvement?",
-                "Do you have a plan for ensuring that employees can work remotely if needed during a disruption?",
-                "Is there a process for coordinating recovery efforts with third-party service providers and suppliers?"
-            ]
-        },
-        {
-            "category": "Recover",
-            "section": "Innovation Optimized",
-            "questions": [
-                "Have you identified and documented legal and regulatory reporting requirements related to recovery?",
-                "Is there a process for communicating recovery progress and status updates to internal and external stakeholders?",
-                "Do you maintain a record of past recovery efforts and lessons learned from incidents?",
-                "Have you established key performance indicators (KPIs) and metrics to measure the effectiveness of your recovery capabilities?"
-            ]
-        },
-        {
-            "category": "CIS Controls",
-            "section": "Survival",
-            "questions": [
-                "Have you established and documented an inventory of authorized and unauthorized devices on your network?",
-                "Is there a process in place to actively manage and control the use of administrative privileges?",
-                "Do you regularly review and update software and systems to address known vulnerabilities?",
-                "Have you implemented secure configurations for hardware and software used within your organization?"
-            ]
-        },
-        {
-            "category": "CIS Controls",
-            "section": "Awareness",
-            "questions": [
-                "Is there a process for continuous vulnerability assessment and remediation?",
-                "Do you restrict and monitor the use of PowerShell, command-line tools, and other scripting languages?",
-                "Have you implemented a process for the secure handling of account credentials, such as passwords and keys?",
-                "Is there a documented process for data protection, including encryption, data classification, and data loss prevention?"
-            ]
-        },
-        {
-            "category": "CIS Controls",
-            "section": "Committed",
-            "questions": [
-                "Do you actively monitor and analyze network traffic for signs of malicious activities?",
-                "Have you established an incident response plan that includes roles, responsibilities, and communication procedures?",
-                "Is there a process for logging and retaining security events and data for analysis?",
-                "Do you regularly conduct security awareness training for employees and contractors?"
-            ]
-        },
-        {
-            "category": "CIS Controls",
-            "section": "Service Aligned",
-            "questions": [
-                "Have you implemented secure email and web browsing practices and technologies?",
-                "Is there a process for securely configuring and managing mobile devices used in your organization?",
-                "Do you have a data backup and recovery plan that includes regular testing of backups?",
-                "Is there a documented process for securely disposing of hardware and media containing sensitive data?"
-            ]
-        },
-        {
-            "category": "CIS Controls",
-            "section": "Innovation Optimized",
-            "questions": [
-                "Have you established a secure software development lifecycle (SDLC) process?",
-                "Is there a process for securely configuring and monitoring cloud resources?",
-                "Do you have a process for managing third-party security risks and ensuring secure supply chain practices?",
-                "Is there a documented process for regular security assessments and audits?"
-            ]
-        },
-    ]
+    # Full Cybersecurity Maturity Assessment Questions (shared with the batch scorer)
+    questionnaire = list(CYBER_QUESTIONNAIRE)
 
     responses = {}
     # --- Always sort BEFORE groupby ---
@@ -426,35 +128,43 @@ elif section == "⚙️ Inputs":
         for category, blocks in groupby(questionnaire, key=lambda x: x["category"])
     }
     
-    with st.form("maturity_form"):
-        previous_cyber_answers = st.session_state.get("cybersecurity_answers", {})
-        cyber_responses = {}  # new: store answers
-        section_scores = {}
+    if st.sidebar.checkbox("📄 Paged mode (one category per page)"):
+        paged_answers = render_paged_assessment("cyber", st.session_state["cybersecurity_answers"], form_key="cyber_maturity_form")
+        submitted = paged_answers is not None
+        cyber_responses = paged_answers or {}
+        section_scores = {sec: pct / 100 for sec, pct in load_scoring_model("cyber").section_scores(cyber_responses).items()}
         category_scores = {}
         category_totals = {}
-    
-        for category, blocks in groupby(questionnaire, key=lambda x: x["category"]):
-            st.subheader(category)
-            for block in blocks:
-                st.write(block["section"])
-                yes_count = 0
-                for idx, q in enumerate(block["questions"]):
-                    hashed_q = hashlib.md5(q.encode()).hexdigest()[:8]
-                    unique_key = f"{category}_{block['section']}_{hashed_q}"
-    
-                    # Restore previous answer if exists
-                    default = st.session_state["cybersecurity_answers"].get(unique_key, "No")
-                    index = 0 if default == "Yes" else 1 if default == "No" else 0
-                    answer = st.radio(q, ["Yes", "No"], key=unique_key, index=index)
-    
-                    cyber_responses[unique_key] = answer  # store it
-                    if answer == "Yes":
-                        yes_count += 1
-    
-                if len(block["questions"]) > 0:
-                    section_scores[block["section"]] = yes_count / len(block["questions"])
-    
-        submitted = st.form_submit_button("Submit")
+    else:
+        with st.form("maturity_form"):
+            previous_cyber_answers = st.session_state.get("cybersecurity_answers", {})
+            cyber_responses = {}  # new: store answers
+            section_scores = {}
+            category_scores = {}
+            category_totals = {}
+    
+            for category, blocks in groupby(questionnaire, key=lambda x: x["category"]):
+                st.subheader(category)
+                for block in blocks:
+                    st.write(block["section"])
+                    yes_count = 0
+                    for idx, q in enumerate(block["questions"]):
+                        hashed_q = hashlib.md5(q.encode()).hexdigest()[:8]
+                        unique_key = f"{category}_{block['section']}_{hashed_q}"
+    
+                        # Restore previous answer if exists
+                        default = st.session_state["cybersecurity_answers"].get(unique_key, "No")
+                        index = 0 if default == "Yes" else 1 if default == "No" else 0
+                        answer = st.radio(q, ["Yes", "No"], key=unique_key, index=index)
+    
+                        cyber_responses[unique_key] = answer  # store it
+                        if answer == "Yes":
+                            yes_count += 1
+    
+                    if len(block["questions"]) > 0:
+                        section_scores[block["section"]] = yes_count / len(block["questions"])
+    
+            submitted = st.form_submit_button("Submit")
     
     # --- After form submit ---
     if submitted:
@@ -662,23 +372,8 @@ elif section == "⚙️ Inputs":
         st.dataframe(summary_df.style.applymap(color_score, subset=["Score (%)"]))
         
         # --- Category Score Calculation ---
-        categories = ["CIS Controls", "Detect", "Identity", "Protect", "Recover", "Respond"]
-        category_totals = {category: 0 for category in categories}
-        category_scores = {category: 0 for category in categories}
-        
-        for key, value in st.session_state.items():
-            parts = key.split("_")
-            if len(parts) >= 2:
-                category = parts[0]
-                if category in category_scores:
-                    category_totals[category] += 1  # always count total
-                    if value == "Yes":
-                        category_scores[category] += 1  # only count Yes
-        
-        category_percentages = {
-            k: round((category_scores[k] / category_totals[k]) * 100, 1) if category_totals[k] > 0 else 0
-            for k in category_scores
-        }
+        # Weighted model (scoring_model.json); neutral defaults = fraction of "Yes"
+        category_percentages = load_scoring_model("cyber").category_scores(cyber_responses)
         
         # Create category DataFrame
         cat_df = pd.DataFrame({
@@ -0,0 +1,91 @@
+"""
+Shared test fixtures.
+
+Tests never talk to Supabase or OpenAI: utils.supabase_client is replaced
+by an in-memory table store covering the PostgREST calls the app makes
+(select/eq/gt/in_/order, insert, upsert), and LLM_PROVIDER defaults to the
+offline stand-in for modules that build their clients at import.
+"""
+import os
+import sys
+import types
+
+import pytest
+
+os.environ.setdefault("LLM_PROVIDER", "offline")
+
+
+class _Query:
+    def __init__(self, tables, name):
+        self._tables, self._name = tables, name
+        self._filters, self._order, self._write = [], None, None
+
+    def select(self, columns="*"):
+        self._columns = [c.strip() for c in columns.split(",")] if columns != "*" else None
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and row[column] > value)
+        return self
+
+    def in_(self, column, values):
+        self._filters.append(lambda row: row.get(column) in set(values))
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def insert(self, rows):
+        self._write = ("insert", rows if isinstance(rows, list) else [rows], None)
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self._write = ("upsert", rows if isinstance(rows, list) else [rows], on_conflict)
+        return self
+
+    def execute(self):
+        table = self._tables.setdefault(self._name, [])
+        if self._write:
+            mode, rows, key = self._write
+            for row in rows:
+                existing = next((r for r in table if key and r.get(key) == row.get(key)), None) if mode == "upsert" else None
+                if existing is not None:
+                    existing.update(row)
+                else:
+                    table.append(dict(row))
+            return types.SimpleNamespace(data=[dict(r) for r in rows])
+        rows = [r for r in table if all(f(r) for f in self._filters)]
+        if self._order:
+            rows.sort(key=lambda r: r[self._order[0]], reverse=self._order[1])
+        if self._columns:
+            rows = [{c: r.get(c) for c in self._columns} for r in rows]
+        return types.SimpleNamespace(data=[dict(r) for r in rows])
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.tables = {}
+        self.queries = 0
+
+    def table(self, name):
+        self.queries += 1
+        return _Query(self.tables, name)
+
+
+_fake = FakeSupabase()
+_client = types.ModuleType("utils.supabase_client")
+_client.supabase = _fake
+_client.get_supabase = lambda: _fake
+sys.modules["utils.supabase_client"] = _client
+
+
+@pytest.fixture
+def fake_supabase():
+    _fake.tables.clear()
+    _fake.queries = 0
+    return _fake
@@ -0,0 +1,53 @@
+"""ANN index builds: type fallbacks, memory-mapped reads and recall evaluation."""
+import numpy as np
+import pytest
+
+from utils.ann_index import build_index, evaluate, perturbed_queries, read_index, resolve_config, write_index
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def test_unknown_type_is_rejected():
+    assert resolve_config({"type": "HNSW", "nprobe": None})["type"] == "hnsw"
+    with pytest.raises(ValueError):
+        resolve_config({"type": "annoy"})
+
+
+@pytest.mark.parametrize("requested, n, built", [
+    ("ivf_pq", 50, "flat"),          # too few points for any IVF
+    ("ivf_pq", 300, "ivf_flat"),     # enough for IVF cells, not for PQ codebooks
+    ("ivf_flat", 300, "ivf_flat"),
+    ("hnsw", 50, "hnsw"),
+])
+def test_build_falls_back_when_too_small_to_train(requested, n, built):
+    index, effective = build_index(_vectors(n), {"type": requested})
+    assert effective["type"] == built and index.ntotal == n
+
+
+def test_written_index_reads_back_with_search_params(tmp_path):
+    vectors = _vectors(300)
+    index, effective = build_index(vectors, {"type": "ivf_flat", "nprobe": 4})
+    path = str(tmp_path / "index.ann")
+    write_index(index, path)
+    assert read_index(path, {**effective, "nprobe": 2}).nprobe == 2
+    loaded = read_index(path, effective)
+    assert loaded.ntotal == 300 and loaded.nprobe == 4
+    assert np.array_equal(loaded.search(vectors[:5], 3)[1], index.search(vectors[:5], 3)[1])
+
+
+def test_evaluate_reports_exact_recall_and_query_source():
+    vectors = _vectors(200)
+    flat, _ = build_index(vectors, {"type": "flat"})
+    report = evaluate(vectors, flat, k=5, n_queries=20)
+    assert report["recall@5"] == 1.0 and report["query_source"] == "perturbed (0.25)"
+    held_out = evaluate(vectors, flat, k=5, queries=_vectors(10, seed=1))
+    assert held_out["queries"] == 10 and held_out["query_source"] == "held-out"
+
+
+def test_perturbed_queries_are_not_the_indexed_vectors():
+    vectors = _vectors(100)
+    queries = perturbed_queries(vectors, n_queries=10)
+    distances = np.linalg.norm(queries[:, None, :] - vectors[None, :, :], axis=2).min(axis=1)
+    assert queries.shape == (10, 16) and (distances > 0.1).all()
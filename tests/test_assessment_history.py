@@ -0,0 +1,94 @@
+"""Append-only assessment history: incremental refresh, concurrent appends and trend downsampling."""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from utils import assessment_history as history
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(days):
+    return (T0 + timedelta(days=days)).isoformat()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(fake_supabase):
+    history._series_cache.clear()
+    history._series_locks.clear()
+    yield fake_supabase
+
+
+def _other_worker_inserts(fake, project, recorded_at, scores):
+    fake.tables.setdefault(history.HISTORY_TABLE, []).append({
+        "project_id": project, "assessment": "it", "recorded_at": recorded_at,
+        "categories": list(scores), "scores": list(scores.values()),
+    })
+
+
+def test_refresh_fetches_only_rows_after_the_tail(empty_cache):
+    _other_worker_inserts(empty_cache, "p1", _at(0), {"Survival": 10.0})
+    assert len(history.load_history("p1", "it")) == 1
+    _other_worker_inserts(empty_cache, "p1", _at(1), {"Survival": 20.0, "Awareness": 5.0})
+    series = history.load_history("p1", "it")
+    assert len(series) == 2
+    assert series.latest() == {"Survival": 20.0, "Awareness": 5.0}
+    assert np.isnan(series.scores[0, 1])  # category added later is padded, not zero
+
+
+def test_append_does_not_skip_earlier_rows_from_other_workers(empty_cache, monkeypatch):
+    fetch = history._fetch_rows
+    calls = []
+
+    def racing_fetch(project_id, kind, after=None):
+        rows = fetch(project_id, kind, after)
+        if not calls:
+            # Another worker saves at day 1 between our refresh and our day-2 insert
+            _other_worker_inserts(empty_cache, "p1", _at(1), {"Survival": 30.0})
+        calls.append(after)
+        return rows
+
+    monkeypatch.setattr(history, "_fetch_rows", racing_fetch)
+    history.append_snapshot("p1", "it", {"Survival": 40.0}, recorded_at=_at(2))
+
+    series = history.load_history("p1", "it")
+    assert [float(s) for s in series.scores[:, 0]] == [30.0, 40.0]
+
+
+def test_identical_snapshot_is_not_appended(empty_cache):
+    assert history.append_snapshot("p1", "it", {"Survival": 50.0}, recorded_at=_at(0))
+    assert history.append_snapshot("p1", "it", {"Survival": 50.04}, recorded_at=_at(1)) is None
+    assert len(empty_cache.tables[history.HISTORY_TABLE]) == 1
+
+
+def test_a_slow_fetch_for_one_project_does_not_block_another(empty_cache, monkeypatch):
+    release = threading.Event()
+    fetch = history._fetch_rows
+
+    def slow_for_p1(project_id, kind, after=None):
+        if project_id == "p1":
+            release.wait(5)
+        return fetch(project_id, kind, after)
+
+    monkeypatch.setattr(history, "_fetch_rows", slow_for_p1)
+    worker = threading.Thread(target=history.load_history, args=("p1", "it"))
+    worker.start()
+    try:
+        _other_worker_inserts(empty_cache, "p2", _at(0), {"Survival": 1.0})
+        assert len(history.load_history("p2", "it")) == 1  # returns while p1 is still fetching
+        assert worker.is_alive()
+    finally:
+        release.set()
+        worker.join()
+
+
+def test_trend_downsamples_to_bucket_means():
+    series = history.ScoreSeries(["Survival"])
+    series.extend([{"recorded_at": _at(day), "categories": ["Survival"], "scores": [float(day)]} for day in range(100)])
+    trend = series.trend(max_points=10)
+    assert len(trend) == 10
+    assert trend["Survival"].iloc[0] == pytest.approx(4.5)
+    ts, _ = series.range(_at(10), _at(19))
+    assert len(ts) == 10
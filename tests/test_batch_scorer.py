@@ -0,0 +1,87 @@
+"""Batch scorer: input formats, row chunking across workers and the roadmap output."""
+import json
+
+import pandas as pd
+import pytest
+
+from utils.batch_scorer import read_tasks, run_batch
+from utils.scoring import compile_bank
+
+BANK = compile_bank("ai")
+
+
+def _wide_csv(path, n):
+    rows = [
+        {"assessment_id": f"a{i}", "assessment": "ai",
+         **{key: ("Yes" if (i + j) % 3 == 0 else "No") for j, key in enumerate(BANK.keys)}}
+        for i in range(n)
+    ]
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return rows
+
+
+def _long_csv(path, rows):
+    pd.DataFrame([
+        {"assessment_id": row["assessment_id"], "assessment": "ai", "key": key, "answer": row[key]}
+        for row in rows for key in BANK.keys
+    ]).to_csv(path, index=False)
+
+
+def _scores(output_dir):
+    df = pd.read_parquet(output_dir / "category_scores.parquet")
+    return df.sort_values(["assessment_id", "Category"]).reset_index(drop=True)
+
+
+@pytest.fixture
+def workshop(tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    rows = _wide_csv(inputs / "wide.csv", 40)
+    _long_csv(tmp_path / "long.csv", rows)
+    return inputs, rows
+
+
+def test_large_file_is_split_into_whole_assessment_chunks(workshop, tmp_path):
+    inputs, rows = workshop
+    assert len(read_tasks(str(inputs / "wide.csv"), chunk_rows=7)) == 6
+
+    long_tasks = read_tasks(str(tmp_path / "long.csv"), chunk_rows=7 * len(BANK.keys))
+    assert len(long_tasks) == 6
+    ids = [set(task[3]["assessment_id"]) for task in long_tasks]
+    assert sum(len(chunk) for chunk in ids) == len(rows)  # no assessment spans two chunks
+
+
+def test_chunked_run_matches_single_chunk_run(workshop, tmp_path):
+    inputs, rows = workshop
+    whole = run_batch(str(inputs), str(tmp_path / "whole"), workers=1, chunk_rows=10_000)
+    chunked = run_batch(str(inputs), str(tmp_path / "chunked"), workers=2, chunk_rows=7)
+    assert (whole["chunks"], chunked["chunks"]) == (1, 6)
+    assert chunked["assessments"] == len(rows)
+    pd.testing.assert_frame_equal(_scores(tmp_path / "whole"), _scores(tmp_path / "chunked"))
+
+
+def test_long_csv_and_json_score_like_wide_csv(workshop, tmp_path):
+    inputs, rows = workshop
+    run_batch(str(inputs), str(tmp_path / "wide_out"), workers=1)
+
+    other = tmp_path / "other"
+    other.mkdir()
+    _long_csv(other / "long.csv", rows)
+    run_batch(str(other), str(tmp_path / "long_out"), workers=1, chunk_rows=100)
+    pd.testing.assert_frame_equal(_scores(tmp_path / "wide_out"), _scores(tmp_path / "long_out"))
+
+    (other / "long.csv").unlink()
+    records = [{"assessment_id": row["assessment_id"], "assessment": "ai",
+                "answers": {key: row[key] for key in BANK.keys}} for row in rows]
+    (other / "records.json").write_text(json.dumps(records))
+    run_batch(str(other), str(tmp_path / "json_out"), workers=1, chunk_rows=9)
+    pd.testing.assert_frame_equal(_scores(tmp_path / "wide_out"), _scores(tmp_path / "json_out"))
+
+
+def test_roadmap_follows_category_scores(workshop, tmp_path):
+    inputs, _ = workshop
+    run_batch(str(inputs), str(tmp_path / "out"), workers=1)
+    roadmap = pd.read_parquet(tmp_path / "out" / "roadmap.parquet")
+    low = roadmap["Score"] < 50
+    assert (roadmap.loc[low, "Quarter"] == "Q1").all()
+    assert (roadmap.loc[~low, "Quarter"] != "Q1").all()
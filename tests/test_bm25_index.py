@@ -0,0 +1,59 @@
+"""BM25 index, identifier fast path and reciprocal rank fusion."""
+from utils.bm25_index import BM25Index, hybrid_rank, query_identifiers, reciprocal_rank_fusion, tokenize
+
+CHUNKS = [
+    ("sim", "def run_simulation(years):\n    return project_margin(years)", ["run_simulation"]),
+    ("margin", "def project_margin(years):\n    # revenue margin forecast\n    return 0.2", ["project_margin"]),
+    ("cache", "class SemanticCache:\n    def lookup(self, prompt): ...", ["SemanticCache", "SemanticCache.lookup"]),
+    ("docs", "The revenue margin dashboard shows revenue and IT spend over time.", []),
+]
+
+
+def _index():
+    return BM25Index.build(CHUNKS)
+
+
+def test_tokens_keep_identifiers_whole_and_split():
+    assert tokenize("run_simulation LocalEmbeddings") == [
+        "run_simulation", "run", "simulation", "localembeddings", "local", "embeddings",
+    ]
+    assert query_identifiers("Is SemanticCache.lookup called by run_simulation?") == [
+        "SemanticCache.lookup", "run_simulation",
+    ]
+
+
+def test_bm25_ranks_term_dense_chunks_first():
+    ranked = [chunk_id for chunk_id, _ in _index().search("revenue margin", k=3)]
+    assert ranked[0] == "docs" and "margin" in ranked
+    assert _index().search("nothing matches this", k=3) == []
+
+
+def test_identifier_lookup_puts_definitions_before_mentions():
+    index = _index()
+    assert index.lookup_identifiers("What does project_margin return?")[:2] == ["margin", "sim"]
+    assert index.lookup_identifiers("How does SemanticCache.lookup work?") == ["cache"]
+    assert index.lookup_identifiers("How is the margin forecast?") == []  # no identifier: no fast path
+
+
+def test_rrf_rewards_agreement_between_rankings():
+    assert reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "a"]])[0] == "b"
+    assert reciprocal_rank_fusion([["a"], []]) == ["a"]
+
+
+def test_hybrid_rank_skips_the_vector_search_for_identifiers():
+    calls = []
+
+    def vector_search(n):
+        calls.append(n)
+        return ["cache", "docs", "sim"]
+
+    assert hybrid_rank("Where is run_simulation defined?", _index(), vector_search, k=2)[0] == "sim"
+    assert calls == []
+    fused = hybrid_rank("revenue margin over time", _index(), vector_search, k=2, candidates=5)
+    assert fused[0] == "docs" and calls == [8]  # candidates is at least 4 * k
+
+
+def test_index_round_trips_through_disk(tmp_path):
+    path = str(tmp_path / "bm25.pkl")
+    _index().save(path)
+    assert BM25Index.load(path).search("revenue margin", k=1) == _index().search("revenue margin", k=1)
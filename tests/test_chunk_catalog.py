@@ -0,0 +1,66 @@
+"""SQLite chunk catalog: paging, totals and literal substring filters."""
+from langchain.schema import Document
+
+from utils.chunk_catalog import catalog_summary, list_sources, query_chunks, sources_matching, write_catalog
+
+
+def _doc(source, name, start, text="x" * 10):
+    return Document(page_content=text, metadata={"source": source, "qualified_name": name,
+                                                 "start_line": start, "end_line": start + 1})
+
+
+def _write(tmp_path):
+    write_catalog(str(tmp_path), [
+        ("c3", _doc("utils/b.py", "b_two", 20)),
+        ("c1", _doc("utils/a.py", "a_one", 1, "y" * 2000)),
+        ("c2", _doc("utils/a.py", "a_two", 10)),
+        ("c4", _doc("docs/100%_done.md", None, 1)),
+        ("c5", _doc("upload/my_notes.txt", None, 1)),
+    ])
+    return str(tmp_path)
+
+
+def test_missing_catalog_reads_as_empty(tmp_path):
+    assert catalog_summary(str(tmp_path)) is None
+    assert query_chunks(str(tmp_path)) == ([], 0)
+    assert list_sources(str(tmp_path)) == ([], 0)
+    assert sources_matching(str(tmp_path), ["a.py"]) == set()
+
+
+def test_summary_and_source_totals(tmp_path):
+    path = _write(tmp_path)
+    summary = catalog_summary(path)
+    assert (summary["chunks"], summary["sources"], summary["chars"]) == (5, 4, 2040)
+    rows, total = list_sources(path)
+    assert total == 4
+    assert [(r["source"], r["chunks"]) for r in rows] == [
+        ("docs/100%_done.md", 1), ("upload/my_notes.txt", 1), ("utils/a.py", 2), ("utils/b.py", 1),
+    ]
+
+
+def test_unfiltered_pages_follow_source_and_line_order(tmp_path):
+    path = _write(tmp_path)
+    first, total = query_chunks(path, limit=2)
+    second, _ = query_chunks(path, limit=2, offset=2)
+    assert total == 5
+    assert [r["chunk_id"] for r in first + second] == ["c4", "c5", "c1", "c2"]
+    assert len(first[0]["preview"]) == 10 and query_chunks(path, "a.py", "a_one")[0][0]["chars"] == 2000
+    assert query_chunks(path, limit=0) == ([], 5)
+
+
+def test_filters_count_matches_and_page(tmp_path):
+    path = _write(tmp_path)
+    rows, total = query_chunks(path, source_contains="utils/", limit=1, offset=1)
+    assert total == 3 and [r["chunk_id"] for r in rows] == ["c2"]
+    assert query_chunks(path, source_contains="utils/", symbol_contains="two")[1] == 2
+    assert list_sources(path, contains="utils", limit=0) == ([], 2)
+
+
+def test_like_wildcards_in_user_input_match_literally(tmp_path):
+    path = _write(tmp_path)
+    assert [r["source"] for r in list_sources(path, contains="100%")[0]] == ["docs/100%_done.md"]
+    assert list_sources(path, contains="a%b")[1] == 0
+    assert list_sources(path, contains="my_n")[1] == 1
+    assert list_sources(path, contains="a_py")[1] == 0  # "_" is not "any character"
+    assert list_sources(path, contains="\\")[1] == 0
+    assert sources_matching(path, ["a.py", "my_notes", "missing.py", "%"]) == {"a.py", "my_notes", "%"}
@@ -0,0 +1,70 @@
+"""AST-aware Python chunking: whole definitions, packing, splits and line ranges."""
+from utils.code_chunker import split_python
+
+SOURCE = '''import os
+
+
+# Reads the margin from the environment
+def margin():
+    return float(os.environ.get("MARGIN", 0.2))
+
+
+@staticmethod
+def forecast(years):
+    return [margin()] * years
+
+
+class Model:
+    """A model."""
+    rate = 1
+
+    def fit(self):
+        return self.rate
+
+    def predict(self):
+        return self.rate * 2
+'''
+
+
+def test_small_file_packs_into_one_chunk_with_every_symbol():
+    [doc] = split_python(SOURCE, {"source": "m.py"}, max_chars=2000)
+    assert doc.page_content.replace("\n\n\n", "\n") == SOURCE.replace("\n\n\n", "\n")  # blank gaps dropped
+    assert doc.metadata["source"] == "m.py"
+    assert doc.metadata["qualified_name"] == "margin"  # the import block has no symbol of its own
+    assert doc.metadata["symbols"] == ["margin", "forecast", "Model"]
+    assert (doc.metadata["start_line"], doc.metadata["end_line"]) == (1, SOURCE.count("\n"))
+
+
+def test_definitions_stay_whole_with_decorators_and_comments():
+    docs = split_python(SOURCE, {"source": "m.py"}, max_chars=120)
+    by_name = {d.metadata["qualified_name"]: d for d in docs}
+    assert "# Reads the margin" in by_name["margin"].page_content
+    assert by_name["forecast"].page_content.startswith("@staticmethod\ndef forecast")
+    lines = SOURCE.splitlines(keepends=True)
+    for doc in docs:
+        assert doc.page_content.startswith(lines[doc.metadata["start_line"] - 1])
+        assert doc.page_content.endswith(lines[doc.metadata["end_line"] - 1])
+
+
+def test_oversized_class_splits_into_header_and_methods():
+    docs = split_python(SOURCE, {"source": "m.py"}, max_chars=60)
+    names = [d.metadata["qualified_name"] for d in docs]
+    assert ["Model", "Model.fit", "Model.predict"] == names[-3:]
+    assert docs[-3].page_content.lstrip().startswith("class Model:")
+
+
+def test_oversized_function_parts_carry_their_own_lines():
+    body = "".join(f"    total += {i}\n" for i in range(40))
+    text = f"def long():\n    total = 0\n{body}    return total\n"
+    docs = split_python(text, {"source": "long.py"}, max_chars=200)
+    assert len(docs) > 1
+    assert all(d.metadata["qualified_name"] == "long" for d in docs)
+    assert all(d.page_content.startswith("# long (continued)\n") for d in docs[1:])
+    starts = [d.metadata["start_line"] for d in docs]
+    assert starts[0] == 1 and starts == sorted(starts) and len(set(starts)) == len(starts)
+    assert docs[-1].metadata["end_line"] == text.count("\n")
+
+
+def test_unparseable_file_falls_back_to_characters():
+    docs = split_python("def broken(:\n    pass\n" * 5, {"source": "bad.py"}, max_chars=80)
+    assert docs and all(d.metadata == {"source": "bad.py"} for d in docs)
@@ -0,0 +1,29 @@
+"""Provider selection: an OpenAI key is only required when a call resolves to OpenAI."""
+import pytest
+
+from utils import llm_providers
+
+
+@pytest.fixture(autouse=True)
+def no_openai_key(monkeypatch):
+    for name in ("OPENAI_API_KEY", "LLM_PROVIDER", "EMBEDDING_BACKEND"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(llm_providers, "openai_api_key", lambda: None)
+    llm_providers.get_embeddings.cache_clear()
+    llm_providers.get_chat_model.cache_clear()
+    yield
+    llm_providers.get_embeddings.cache_clear()
+    llm_providers.get_chat_model.cache_clear()
+
+
+def test_offline_provider_needs_no_key(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "offline")
+    assert len(llm_providers.get_embeddings().embed_query("hello")) > 0
+    assert llm_providers.get_chat_model().invoke("hello").content
+
+
+def test_openai_without_a_key_fails_when_built():
+    with pytest.raises(KeyError, match="OpenAI API key is missing"):
+        llm_providers.get_embeddings(backend="openai")
+    with pytest.raises(KeyError, match="OpenAI API key is missing"):
+        llm_providers.get_chat_model()
@@ -0,0 +1,75 @@
+"""Two-tier cache: memory/SQLite tiers, stale serving, background refresh and eviction."""
+import threading
+import time
+
+import pytest
+
+from utils import local_cache as lc
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return lc.TwoTierCache(path=str(tmp_path / "cache.sqlite3"), max_items=2)
+
+
+def _wait_for_refresh(cache, namespace, key, timeout=5):
+    deadline = time.time() + timeout
+    while (namespace, key) in cache._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_entries_survive_in_the_sqlite_tier(cache, tmp_path):
+    cache.set_many("prices", {"a": {"usd": 1}, "b": {"usd": 2}, "c": {"usd": 3}})
+    assert len(cache._memory) == 2  # LRU-bounded; "a" was evicted from memory only
+
+    fresh, stale = cache.get_many("prices", ["a", "b", "missing"])
+    assert fresh == {"a": {"usd": 1}, "b": {"usd": 2}} and stale == {}
+    assert cache.stats["disk_hits"] == 1 and cache.stats["misses"] == 1
+
+    reopened = lc.TwoTierCache(path=str(tmp_path / "cache.sqlite3"))
+    assert reopened.get("prices", "c") == {"usd": 3}
+
+
+def test_expired_entries_are_served_stale_only_when_asked(cache):
+    cache.set("recs", "Identity", "old", ttl=-1)
+    assert cache.get("recs", "Identity") is None
+    assert cache.get("recs", "Identity", allow_stale=True) == "old"
+
+
+def test_refresh_replaces_stale_values_and_evicts_deleted_rows(cache):
+    cache.set_many("recs", {"kept": "old", "deleted": "old"}, ttl=-1)
+    cache.refresh_in_background("recs", ["kept", "deleted"], lambda keys: {"kept": "new"})
+    _wait_for_refresh(cache, "recs", "kept")
+
+    assert cache.get("recs", "kept") == "new"
+    assert cache.get("recs", "deleted", allow_stale=True) is None
+
+
+def test_one_refresh_per_key_and_failures_back_off(cache, monkeypatch):
+    release, calls = threading.Event(), []
+
+    def slow_loader(keys):
+        calls.append(keys)
+        release.wait(5)
+        raise RuntimeError("supabase down")
+
+    cache.refresh_in_background("recs", ["k"], slow_loader)
+    cache.refresh_in_background("recs", ["k"], slow_loader)  # already in flight
+    release.set()
+    _wait_for_refresh(cache, "recs", "k")
+    cache.refresh_in_background("recs", ["k"], slow_loader)  # failed just now: backing off
+    assert calls == [["k"]]
+
+    monkeypatch.setattr(lc, "REFRESH_RETRY_AFTER", 0)
+    cache.refresh_in_background("recs", ["k"], lambda keys: {"k": "back"})
+    _wait_for_refresh(cache, "recs", "k")
+    assert cache.get("recs", "k") == "back"
+
+
+def test_invalidate_drops_a_key_or_a_namespace_from_both_tiers(cache):
+    cache.set_many("recs", {"a": 1, "b": 2})
+    cache.set("prices", "a", 3)
+    cache.invalidate("recs", "a")
+    assert cache.get("recs", "a") is None and cache.get("recs", "b") == 2
+    cache.invalidate("recs")
+    assert cache.get("recs", "b") is None and cache.get("prices", "a") == 3
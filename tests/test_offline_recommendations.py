@@ -0,0 +1,54 @@
+"""Recommendation pipeline against the offline provider: no network, API keys or Supabase."""
+import pytest
+
+from utils import llm_providers, offline_provider
+from utils.recommendation_engine import (
+    fan_out_recommendations, research_recommendation, research_recommendations_batch, valid_products,
+)
+
+CATEGORIES = ["Infrastructure and Technology", "Data Management and Quality", "Talent and Skills"]
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "offline")
+    monkeypatch.setattr(llm_providers, "BACKOFF_BASE", 0.0)
+    saved = dict(offline_provider.SETTINGS)
+    offline_provider.configure(latency_ms=0, jitter_ms=0, error_rate=0.0)
+    for provider in llm_providers.RATE_LIMITS:
+        llm_providers.set_rate_limit(provider, 1000.0, 1000)
+    llm_providers.reset_metrics()
+    yield
+    offline_provider.configure(**saved)
+    for provider, limits in llm_providers.RATE_LIMITS.items():
+        llm_providers.set_rate_limit(provider, *limits)
+
+
+def test_single_recommendation_is_valid_and_deterministic():
+    result, content = research_recommendation("ai", "Talent and Skills")
+    assert valid_products(result["products"])
+    assert "Talent and Skills" in result["recommendation"]
+    assert research_recommendation("ai", "Talent and Skills")[1] == content
+
+    metrics = llm_providers.provider_metrics()
+    assert metrics["openai"]["calls"] == 2 and metrics["tavily"]["calls"] == 2
+
+
+def test_batch_recommendations_cover_every_category():
+    results = research_recommendations_batch("it", CATEGORIES)
+    assert set(results) == set(CATEGORIES)
+    assert all(valid_products(r["products"]) for r in results.values())
+    assert llm_providers.provider_metrics()["openai"]["calls"] == 1
+
+
+def test_fan_out_retries_injected_rate_limits():
+    offline_provider.configure(error_rate=0.5, seed=3)
+
+    def generate(category, show_status=False):
+        return research_recommendation("ai", category)[0]
+
+    results = dict(fan_out_recommendations(generate, CATEGORIES, max_workers=1))
+    assert set(results) == set(CATEGORIES)
+    assert not any(r.get("error") for r in results.values())
+    metrics = llm_providers.provider_metrics()
+    assert metrics["openai"]["retries"] + metrics["tavily"]["retries"] > 0
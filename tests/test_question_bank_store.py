@@ -0,0 +1,66 @@
+"""Versioned question banks: publishing, version conflicts, caching and answer migration."""
+import json
+
+import pytest
+
+from utils import question_bank_store as store
+from utils.scoring import bank_for_version
+
+
+@pytest.fixture(autouse=True)
+def bank_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "QUESTION_BANK_DIR", str(tmp_path))
+    store._version_lists.clear()
+    store.get_bank.cache_clear()
+    yield tmp_path
+    store._version_lists.clear()
+    store.get_bank.cache_clear()
+
+
+def _external_publish(bank_dir, version, questions):
+    """Another process publishing: a file appears without this process's caches knowing."""
+    (bank_dir / "it").mkdir(exist_ok=True)
+    (bank_dir / "it" / f"v{version}.json").write_text(json.dumps({"kind": "it", "version": version, "questions": questions}))
+
+
+def test_publish_takes_the_next_free_version_on_conflict(bank_dir, monkeypatch):
+    seed = store.seed_questions("it")
+    assert store.cached_versions("it") == [0]
+    # list_versions is stale (as with two processes publishing at once): both pick v1
+    monkeypatch.setattr(store, "latest_version", lambda kind, backend="local": 0)
+    _external_publish(bank_dir, 1, seed[:1])
+
+    assert store.publish_version("it", seed, note="mine") == 2
+    assert len(json.loads((bank_dir / "it" / "v1.json").read_text())["questions"]) == 1  # not overwritten
+    assert store.cached_versions("it") == [0, 1, 2]
+
+
+def test_version_list_is_cached_for_the_ttl(bank_dir, monkeypatch):
+    seed = store.seed_questions("it")
+    assert store.get_latest_bank("it").version == 0
+    _external_publish(bank_dir, 1, seed)
+    assert store.cached_versions("it") == [0]
+    assert store.get_latest_bank("it").version == 0
+
+    monkeypatch.setattr(store, "LATEST_VERSION_TTL", -1)
+    assert store.cached_versions("it") == [0, 1]
+    assert store.get_latest_bank("it").version == 1
+
+
+def test_answers_migrate_by_question_id():
+    seed = store.seed_questions("it")
+    edited = [dict(seed[0], question="Reworded: " + seed[0]["question"])] + seed[2:]
+    version = store.publish_version("it", edited)
+    old, new = store.get_bank("it", 0), store.get_bank("it", version)
+
+    answers = {old.keys[0]: "Yes", old.keys[1]: "Yes", old.keys[2]: "No"}
+    migrated = store.migrate_answers(answers, old, new)
+    assert migrated == {new.keys[0]: "Yes", new.keys[1]: "No"}  # the removed question is dropped
+    assert new.keys[0] != old.keys[0]
+
+
+def test_unknown_version_scores_against_the_latest_bank():
+    version = store.publish_version("it", store.seed_questions("it")[:5])
+    assert bank_for_version("it", 99).version == version
+    assert bank_for_version("it", "").version == 0
+    assert bank_for_version("ai", 3).kind == "ai"  # unversioned kinds ignore the version
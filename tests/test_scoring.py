@@ -0,0 +1,55 @@
+"""Weighted scoring model and roadmap rules on a small hand-built bank."""
+import numpy as np
+
+from utils.scoring import CompiledBank, WeightedScoringModel, assign_phase, roadmap_action
+
+
+def _bank():
+    questions = [
+        {"key": f"{cat}|{sec}|{i}", "category": cat, "section": sec, "question": f"{cat} {sec} {i}?"}
+        for cat in ("Identity", "Recover")
+        for sec in ("Survival", "Scalable")
+        for i in range(2)
+    ]
+    return CompiledBank("cyber", questions)
+
+
+def test_vectorize_counts_only_exact_yes():
+    bank = _bank()
+    vec = bank.vectorize({bank.keys[0]: " Yes ", bank.keys[1]: "yes", bank.keys[2]: "Y", "unknown": "Yes"})
+    assert vec.tolist() == [1, 0, 0, 0, 0, 0, 0, 0]
+
+
+def test_default_model_is_fraction_of_yes():
+    bank = _bank()
+    scores = WeightedScoringModel(bank).score(np.array([[1, 1, 1, 0, 0, 0, 0, 0]], dtype=np.float32))
+    assert scores["categories"][0].tolist() == [75.0, 0.0]
+    assert scores["sections"][0].tolist() == [50.0, 25.0]
+    assert scores["overall"][0] == 37.5
+
+
+def test_question_weights_and_section_multipliers():
+    bank = _bank()
+    model = WeightedScoringModel(bank, question_weights={bank.keys[0]: 3.0}, section_multipliers={"Scalable": 2.0})
+    identity = model.score(np.array([[1, 0, 0, 0, 0, 0, 0, 0]], dtype=np.float32))["categories"][0][0]
+    # 3 of (3 + 1) Survival points, Scalable's 2 points doubled: 3 / (4 + 4)
+    assert identity == 37.5
+
+
+def test_gate_caps_later_sections_within_the_category():
+    bank = _bank()
+    model = WeightedScoringModel(bank, gates=[{"section": "Survival", "min_score": 50, "cap": 0.0}])
+    # Identity: Scalable answered but Survival failed -> Scalable points dropped.
+    # Recover: Survival passed -> Scalable points kept.
+    answers = np.array([[0, 0, 1, 1, 1, 0, 1, 1]], dtype=np.float32)
+    assert model.score(answers)["categories"][0].tolist() == [0.0, 75.0]
+
+
+def test_roadmap_rules_work_on_arrays():
+    scores = np.array([10.0, 49.9, 50.0, 79.9, 80.0])
+    assert assign_phase(scores).tolist() == ["Q1", "Q1", "Q2", "Q2", "Q3"]
+    assert roadmap_action(scores)[[0, 2, 4]].tolist() == [
+        "Prioritize investment and leadership support",
+        "Standardize and document processes",
+        "Maintain and enhance automation",
+    ]
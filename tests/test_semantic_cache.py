@@ -0,0 +1,71 @@
+"""Semantic cache: content-token guard, context partitioning, expiry, bounds and calibration."""
+import json
+
+import pytest
+
+from utils import semantic_cache
+from utils.offline_provider import OfflineEmbeddings
+from utils.semantic_cache import SemanticCache, calibrate, content_tokens
+
+
+class FailingEmbeddings:
+    def embed_query(self, text):
+        raise RuntimeError("embedding API down")
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(embeddings=OfflineEmbeddings(), threshold=0.8)
+
+
+def test_content_tokens_keep_meaning_words_and_order():
+    assert content_tokens("How can we reduce our cloud costs?") == content_tokens("how do we reduce cloud costs")
+    assert content_tokens("Should we reduce spend?") != content_tokens("Should we increase spend?")
+    assert content_tokens("Move from AWS to Azure") != content_tokens("Move from Azure to AWS")
+    assert "not" in content_tokens("Why isn't the backup tested?")
+
+
+def test_rephrased_question_hits_and_opposite_question_misses(cache):
+    cache.store("How can we reduce spend on legacy systems?", "ctx", "answer")
+    assert cache.lookup("How do we reduce our spend on legacy systems?", "ctx") == "answer"
+    assert cache.lookup("How can we increase spend on legacy systems?", "ctx") is None
+    assert cache.lookup("How can we reduce spend on legacy systems?", "other project") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 2
+
+
+def test_similarity_threshold_still_applies(cache):
+    cache._threshold = 1.01
+    cache.store("How can we reduce spend on legacy systems?", "ctx", "answer")
+    assert cache.lookup("How do we reduce our spend on legacy systems?", "ctx") is None
+
+
+def test_entries_expire_and_are_lru_bounded():
+    cache = SemanticCache(embeddings=OfflineEmbeddings(), threshold=0.8, max_entries=2)
+    cache.store("Retire the ERP?", "ctx", "expired", ttl=-1)
+    assert cache.lookup("Retire the ERP?", "ctx") is None
+    for i in range(3):
+        cache.store(f"Consolidate {i} data centers?", "ctx", str(i))
+    assert len(cache._entries) == 2
+    assert cache.lookup("Consolidate 0 data centers?", "ctx") is None
+    assert cache.lookup("Consolidate 2 data centers?", "ctx") == "2"
+
+
+def test_embedding_failure_is_a_miss_not_an_error():
+    cache = SemanticCache(embeddings=FailingEmbeddings(), threshold=0.8)
+    cache.store("Retire the ERP?", "ctx", "answer")
+    assert cache.lookup("Retire the ERP?", "ctx") is None
+    assert cache.stats["embedding_errors"] == 1  # lookup had no candidate, so no second call
+
+
+def test_calibration_rejects_every_labeled_non_paraphrase(tmp_path, monkeypatch):
+    with open(semantic_cache.PAIRS_PATH, "r", encoding="utf-8") as f:
+        pairs = json.load(f)
+    result = calibrate(pairs, OfflineEmbeddings())
+    assert result["precision"] == 1.0
+    assert result["threshold"] >= semantic_cache.MIN_THRESHOLD
+    assert not any(r["same_tokens"] and not r["paraphrase"] and r["similarity"] >= result["threshold"]
+                   for r in result["pairs"])
+
+    monkeypatch.setattr(semantic_cache, "THRESHOLDS_PATH", str(tmp_path / "thresholds.json"))
+    (tmp_path / "thresholds.json").write_text(json.dumps({"OfflineEmbeddings": 0.91}))
+    assert SemanticCache(embeddings=OfflineEmbeddings()).threshold == 0.91
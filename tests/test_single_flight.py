@@ -0,0 +1,52 @@
+"""Single-flight: concurrent callers with one key share one call, its result and its error."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers=8):
+    """Start `callers` calls; release `fn` only once all but the leader are waiting on it."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def leader_fn():
+        started.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, leader_fn)]
+        started.wait(5)
+        futures += [pool.submit(flight.do, key, leader_fn) for _ in range(callers - 1)]
+        while flight.stats["saved_calls"] < callers - 1:
+            threading.Event().wait(0.005)
+        release.set()
+        return [f.exception() or f.result() for f in futures]
+
+
+def test_concurrent_callers_share_one_call():
+    flight, runs = SingleFlight(), []
+    results = _run_concurrently(flight, "Identity", lambda: runs.append(1) or "answer")
+    assert results == ["answer"] * 8
+    assert len(runs) == 1 and flight.stats == {"calls": 1, "saved_calls": 7}
+    assert flight.in_flight() == 0
+
+
+def test_the_leaders_error_reaches_every_waiter():
+    def boom():
+        raise RuntimeError("tavily down")
+
+    results = _run_concurrently(SingleFlight(), "Identity", boom, callers=4)
+    assert all(isinstance(r, RuntimeError) and str(r) == "tavily down" for r in results)
+
+
+def test_nothing_is_cached_after_the_call_finishes():
+    flight, runs = SingleFlight(), []
+    assert flight.do("k", lambda: runs.append(1) or len(runs)) == 1
+    assert flight.do("k", lambda: runs.append(1) or len(runs)) == 2
+    with pytest.raises(ValueError):
+        flight.do("other", int, "not a number")
+    assert flight.in_flight() == 0
@@ -0,0 +1,69 @@
+"""Incremental vector index: content-hashed chunks, add/delete counts and pruning."""
+import pytest
+
+from utils import vector_index
+
+
+def _sources(**overrides):
+    sources = {
+        "docs/a.txt": "alpha " * 300,
+        "docs/b.txt": "beta " * 300,
+        "utils/c.py": "def c():\n    return 'c'\n\n\ndef d():\n    return 'd'\n",
+    }
+    sources.update(overrides)
+    return {name: text for name, text in sources.items() if text is not None}
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "index")
+
+
+def _indexed_ids(store):
+    return set(store.index_to_docstore_id.values())
+
+
+def test_unchanged_sources_are_skipped(index_path):
+    store, first = vector_index.update_vector_index(_sources(), index_path, index_config={"type": "flat"})
+    assert first["sources_changed"] == 3 and first["chunks_added"] == store.index.ntotal > 0
+
+    _, second = vector_index.update_vector_index(_sources(), index_path, index_config={"type": "flat"})
+    assert (second["sources_unchanged"], second["sources_changed"], second["chunks_added"]) == (3, 0, 0)
+
+
+def test_changed_source_embeds_only_new_chunks_and_deletes_old_ones(index_path):
+    store, _ = vector_index.update_vector_index(_sources(), index_path, index_config={"type": "flat"})
+    before = _indexed_ids(store)
+
+    edited = "def c():\n    return 'changed'\n\n\ndef d():\n    return 'd'\n"
+    store, stats = vector_index.update_vector_index(_sources(**{"utils/c.py": edited}), index_path,
+                                                    index_config={"type": "flat"})
+    assert stats["sources_changed"] == 1
+    assert stats["chunks_added"] == stats["chunks_deleted"] == len(before ^ _indexed_ids(store)) // 2
+    assert store.index.ntotal == len(_indexed_ids(store))
+
+
+def test_prune_removes_unseen_sources(index_path):
+    vector_index.update_vector_index(_sources(), index_path, index_config={"type": "flat"})
+    _, kept = vector_index.update_vector_index(_sources(**{"docs/b.txt": None}), index_path,
+                                               index_config={"type": "flat"})
+    assert kept["sources_removed"] == 0
+
+    store, pruned = vector_index.update_vector_index(_sources(**{"docs/b.txt": None}), index_path,
+                                                     prune=True, index_config={"type": "flat"})
+    assert pruned["sources_removed"] == 1 and pruned["chunks_deleted"] > 0
+    assert not any(doc.metadata["source"] == "docs/b.txt" for doc in store.docstore._dict.values())
+
+
+def test_scan_prune_keeps_earlier_uploads(index_path):
+    upload = f"{vector_index.UPLOAD_PREFIX}notes.md"
+    vector_index.update_vector_index({upload: "uploaded notes " * 100}, index_path, index_config={"type": "flat"})
+    vector_index.update_vector_index(_sources(), index_path, index_config={"type": "flat"})
+
+    # A later scan no longer finds docs/b.txt and has no uploads in this run
+    store, stats = vector_index.update_vector_index(_sources(**{"docs/b.txt": None}), index_path,
+                                                    prune=vector_index.is_scanned_source,
+                                                    index_config={"type": "flat"})
+    sources = {doc.metadata["source"] for doc in store.docstore._dict.values()}
+    assert stats["sources_removed"] == 1
+    assert upload in sources and "docs/b.txt" not in sources
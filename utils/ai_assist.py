@@ -1,25 +1,25 @@
-import os
+import hashlib
 import json
+import threading
 import pandas as pd
 import streamlit as st
+from collections import OrderedDict
 from datetime import datetime
+from contextlib import closing
 
-from langchain_openai import ChatOpenAI
-from langchain_community.tools.tavily_search.tool import TavilySearchResults
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage
 
 from utils.intent_classifier import classify_intent
 from utils.supabase_client import supabase
+from utils.local_cache import local_cache
+from utils.single_flight import recommendation_flight
+from utils.semantic_cache import consultation_cache, context_fingerprint
+from utils.llm_providers import get_chat_model, search_tool
+from utils.recommendation_engine import fan_out_recommendations, research_recommendation, research_recommendations_batch
 from postgrest.exceptions import APIError
-from tavily import TavilyClient
 
-# ────────────────────────────────────────────────────────────────
-# API Keys
-# ────────────────────────────────────────────────────────────────
-openai_key = st.secrets["openai_api_key"]
-tavily_key = st.secrets["tavily_api_key"]
-os.environ["TAVILY_API_KEY"] = tavily_key or ""
+# API keys, pooled clients, rate limits and retries live in utils/llm_providers.py
 
 # ────────────────────────────────────────────────────────────────
 # TOOL DEFINITIONS
@@ -40,8 +40,6 @@ def app_module_summary() -> str:
 
     return "\n".join(summary)
 
-search_tool = TavilySearchResults()
-
 TOOLS = [search_tool, app_module_summary]
 
 # ────────────────────────────────────────────────────────────────
@@ -49,12 +47,7 @@ TOOLS = [search_tool, app_module_summary]
 # ────────────────────────────────────────────────────────────────
 @st.cache_resource
 def get_llm():
-    llm = ChatOpenAI(
-        model="gpt-3.5-turbo",
-        temperature=0,
-        openai_api_key=openai_key
-    )
-    return llm.bind_tools(TOOLS)
+    return get_chat_model("gpt-3.5-turbo", temperature=0).bind_tools(TOOLS)
 
 # ────────────────────────────────────────────────────────────────
 # TOOL-AWARE QUERY
@@ -76,6 +69,26 @@ def query_llm_with_tools(prompt: str) -> str:
     except Exception as e:
         return f"❌ AI error: {e}"
 
+def stream_llm_with_tools(prompt: str):
+    """Streaming variant of query_llm_with_tools: yields text chunks, then any tool output."""
+    try:
+        gathered = None
+        with closing(get_llm().stream([HumanMessage(content=prompt)])) as chunks:
+            for chunk in chunks:
+                gathered = chunk if gathered is None else gathered + chunk
+                if chunk.content:
+                    yield chunk.content
+
+        if gathered is not None and getattr(gathered, "tool_calls", None):
+            results = []
+            for call in gathered.tool_calls:
+                tool_fn = next(t for t in TOOLS if t.name == call["name"])
+                results.append(tool_fn.invoke(call["args"]))
+            yield "\n".join(results)
+
+    except Exception as e:
+        yield f"❌ AI error: {e}"
+
 # ────────────────────────────────────────────────────────────────
 # Deterministic Logic (unchanged)
 # ────────────────────────────────────────────────────────────────
@@ -106,119 +119,96 @@ def handle_ai_consultation(user_prompt, session_state, role="CIO", goal="Optimiz
     if intent == "adjust_category_forecast":
         return adjust_category_forecast(user_prompt, session_state)
 
+    # Near-identical questions about the same project state reuse the stored answer
+    context = context_fingerprint(session_state, role, goal)
+    cached = consultation_cache.lookup(user_prompt, context)
+    if cached is not None:
+        return cached
+
     full_prompt = f"You are advising a {role} focused on {goal}. {user_prompt}"
-    return query_llm_with_tools(full_prompt)
+    answer = query_llm_with_tools(full_prompt)
+    if not answer.startswith("❌"):
+        consultation_cache.store(user_prompt, context, answer)
+    return answer
 
-def generate_ai_maturity_recommendation_with_products(category: str) -> dict:
+def stream_ai_consultation(user_prompt, session_state, role="CIO", goal="Optimize Costs"):
+    """Like handle_ai_consultation, but yields the LLM answer in chunks as it is generated."""
+    intent = classify_intent(user_prompt)
+
+    if intent == "report_summary":
+        yield report_summary(user_prompt, session_state)
+        return
+    if intent == "adjust_category_forecast":
+        yield adjust_category_forecast(user_prompt, session_state)
+        return
+
+    context = context_fingerprint(session_state, role, goal)
+    cached = consultation_cache.lookup(user_prompt, context)
+    if cached is not None:
+        yield cached
+        return
+
+    full_prompt = f"You are advising a {role} focused on {goal}. {user_prompt}"
+    chunks = []
+    for chunk in stream_llm_with_tools(full_prompt):
+        chunks.append(chunk)
+        yield chunk
+    # Only complete answers are stored; an interrupted stream never gets here
+    answer = "".join(chunks)
+    if answer and not answer.startswith("❌"):
+        consultation_cache.store(user_prompt, context, answer)
+
+def generate_ai_maturity_recommendation_with_products(category: str, show_status: bool = True) -> dict:
+    """Concurrent requests for the same category share one Tavily/OpenAI call (and one upsert)."""
+    return recommendation_flight.do(
+        ("ai", category), _generate_ai_maturity_recommendation_with_products, category, show_status=show_status)
+
+def _generate_ai_maturity_recommendation_with_products(category: str, show_status: bool = True) -> dict:
     try:
-        response = supabase.table("ai_product_recommendations").select("*").eq("category", category).execute()
-        if response.data:
-            st.info(f"✅ Using cached recommendation for '{category}' from Supabase.")
-            return {
-                "recommendation": response.data[0]["recommendation"],
-                "products": response.data[0]["products"]
-            }
-
-        tavily = TavilyClient(api_key=tavily_key)
-        query = f"Top enterprise tools or platforms for improving {category} AI maturity"
-        results = tavily.search(query, max_results=5)
-
-        combined = " ".join([
-            f"{r.get('title', '')} — {r.get('snippet', '')}" for r in results if isinstance(r, dict) and r.get("snippet")
-        ])
-
-        prompt = (
-            f"Based on this content:\n{combined}\n\n"
-            f"List 3–5 tools for '{category}' in AI maturity. Format as JSON:\n"
-            "[{\"name\": \"\", \"features\": [\"\"], \"price_estimate\": \"\", \"suitability\": \"\"}]"
-        )
-
-        client = openai.OpenAI(api_key=openai_key)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-
-        content = response.choices[0].message.content
-        st.write(f"📦 Raw GPT Response for '{category}':\n", content)
-
-        parsed = json.loads(content)
-        recommendation = (
-            f"These tools are well-suited for improving **{category}** maturity. "
-            "Focus on high-suitability tools first."
-        )
-
-        # Save to Supabase
-        supabase.table("ai_product_recommendations").insert({
-            "category": category,
-            "recommendation": recommendation,
-            "products": parsed,
-            "created_at": datetime.utcnow().isoformat()
-        }).execute()
-
-        return {"recommendation": recommendation, "products": parsed}
+        # Checked inside the flight: an earlier flight may have stored this category after the caller's lookup
+        cached = fetch_cached_recommendations("ai_product_recommendations", [category])
+        if category in cached:
+            if show_status:
+                st.info(f"✅ Using cached recommendation for '{category}'.")
+            return cached[category]
+
+        result, content = research_recommendation("ai", category)
+        if show_status:
+            st.write(f"📦 Raw GPT Response for '{category}':\n", content)
+
+        store_recommendations("ai_product_recommendations", {category: result})
+        return result
 
     except Exception as e:
-        st.error(f"❌ Error generating AI maturity recommendation: {e}")
-        return {"recommendation": "Unable to generate recommendation.", "products": []}
+        if show_status:
+            st.error(f"❌ Error generating AI maturity recommendation: {e}")
+        return {"recommendation": "Unable to generate recommendation.", "products": [], "error": str(e)}
 
-from tavily import TavilyClient
-from openai import OpenAI
-import json
-from datetime import datetime
+def generate_it_maturity_recommendation_with_products(category: str, show_status: bool = True) -> dict:
+    """Concurrent requests for the same category share one Tavily/OpenAI call (and one upsert)."""
+    return recommendation_flight.do(
+        ("it", category), _generate_it_maturity_recommendation_with_products, category, show_status=show_status)
 
-def generate_it_maturity_recommendation_with_products(category: str) -> dict:
+def _generate_it_maturity_recommendation_with_products(category: str, show_status: bool = True) -> dict:
     try:
-        response = supabase.table("it_product_recommendations").select("*").eq("category", category).execute()
-        if response.data:
-            st.info(f"✅ Using cached recommendation for '{category}' from Supabase.")
-            return {
-                "recommendation": response.data[0]["recommendation"],
-                "products": response.data[0]["products"]
-            }
-
-        tavily = TavilyClient(api_key=tavily_key)
-        query = f"Top enterprise platforms or services for improving '{category}' IT maturity"
-        results = tavily.search(query, max_results=5)
-
-        combined = " ".join([
-            f"{r.get('title', '')} — {r.get('snippet', '')}" for r in results if isinstance(r, dict) and r.get("snippet")
-        ])
-
-        prompt = (
-            f"Based on this research:\n{combined}\n\n"
-            f"List 3–5 tools for '{category}' in IT maturity. Format as JSON:\n"
-            "[{\"name\": \"\", \"features\": [\"\"], \"price_estimate\": \"\", \"suitability\": \"\"}]"
-        )
-
-        client = OpenAI(api_key=openai_key)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-
-        content = response.choices[0].message.content
-        st.write(f"📦 Raw GPT Response for '{category}':\n", content)
-
-        parsed = json.loads(content)
-        recommendation = (
-            f"These tools help improve **{category}** maturity. Focus on the ones with high suitability first."
-        )
-
-        supabase.table("it_product_recommendations").insert({
-            "category": category,
-            "recommendation": recommendation,
-            "products": parsed,
-            "created_at": datetime.utcnow().isoformat()
-        }).execute()
-
-        return {"recommendation": recommendation, "products": parsed}
+        # Checked inside the flight: an earlier flight may have stored this category after the caller's lookup
+        cached = fetch_cached_recommendations("it_product_recommendations", [category])
+        if category in cached:
+            if show_status:
+                st.info(f"✅ Using cached recommendation for '{category}'.")
+            return cached[category]
+
+        result, content = research_recommendation("it", category)
+        if show_status:
+            st.write(f"📦 Raw GPT Response for '{category}':\n", content)
+
+        store_recommendations("it_product_recommendations", {category: result})
+        return result
 
     except Exception as e:
-        st.error(f"❌ Error generating IT maturity recommendation: {e}")
-        return {"recommendation": "Unable to generate recommendation.", "products": []}
+        if show_status:
+            st.error(f"❌ Error generating IT maturity recommendation: {e}")
+        return {"recommendation": "Unable to generate recommendation.", "products": [], "error": str(e)}
 
 def generate_cybersecurity_recommendation_with_products(category):
     # Define sample recommendations and products for each category
@@ -244,3 +234,142 @@ def generate_cybersecurity_recommendation_with_products(category):
         "recommendation": recommendations.get(category, "No recommendation available."),
         "products": [{"Product": p} for p in products.get(category, [])]
     }
+
+# ────────────────────────────────────────────────────────────────
+# Batched Supabase Cache Lookup
+# ────────────────────────────────────────────────────────────────
+RECOMMENDATION_COLUMNS = "category, recommendation, products"
+RECOMMENDATION_SOURCES = {
+    "ai": ("ai_product_recommendations", generate_ai_maturity_recommendation_with_products),
+    "it": ("it_product_recommendations", generate_it_maturity_recommendation_with_products),
+}
+
+RECOMMENDATION_CACHE_TTL = 7 * 24 * 3600  # rows are write-once; the TTL only bounds staleness after manual edits
+
+def _query_recommendations(table: str, categories) -> dict:
+    response = supabase.table(table).select(RECOMMENDATION_COLUMNS).in_("category", list(categories)).execute()
+    rows = {}
+    for row in response.data or []:
+        rows.setdefault(row["category"], {"recommendation": row["recommendation"], "products": row["products"]})
+    return rows
+
+def store_recommendations(table: str, results: dict):
+    """
+    Upsert on category (the table needs a unique index on it), so racing
+    writers leave one row per category, then update the local cache.
+    """
+    if not results:
+        return
+    created_at = datetime.utcnow().isoformat()
+    supabase.table(table).upsert(
+        [{"category": category, **result, "created_at": created_at} for category, result in results.items()],
+        on_conflict="category",
+    ).execute()
+    local_cache.set_many(table, results, ttl=RECOMMENDATION_CACHE_TTL)
+
+def fetch_cached_recommendations(table: str, categories) -> dict:
+    """
+    {category: {"recommendation", "products"}} via the local two-tier cache.
+    Only cache misses go to Supabase, as one `in_` query. Expired entries are
+    served as-is and refreshed in the background, so a slow Supabase never
+    blocks a warm page.
+    """
+    categories = list(dict.fromkeys(categories))
+    if not categories:
+        return {}
+    fresh, stale = local_cache.get_many(table, categories, allow_stale=True)
+    if stale:
+        local_cache.refresh_in_background(
+            table, stale, lambda keys: _query_recommendations(table, keys), ttl=RECOMMENDATION_CACHE_TTL)
+
+    cached = {**stale, **fresh}
+    misses = [c for c in categories if c not in cached]
+    if misses:
+        try:
+            found = _query_recommendations(table, misses)
+        except APIError as e:
+            print(f"[Recommendation cache lookup failed] {table}: {e}")
+            return cached
+        local_cache.set_many(table, found, ttl=RECOMMENDATION_CACHE_TTL)
+        cached.update(found)
+    return cached
+
+# ────────────────────────────────────────────────────────────────
+# Batched Recommendations: One Structured-Output Request
+# ────────────────────────────────────────────────────────────────
+BATCH_RECOMMENDATIONS = True
+
+def _generate_recommendations_batch(kind: str, categories) -> dict:
+    table = RECOMMENDATION_SOURCES[kind][0]
+    # Re-checked inside the flight, as in the per-category generators
+    cached = fetch_cached_recommendations(table, categories)
+    misses = [c for c in categories if c not in cached]
+    results = research_recommendations_batch(kind, misses) if misses else {}
+    store_recommendations(table, results)
+    return {**cached, **results}
+
+def generate_recommendations_batch(kind: str, categories) -> dict:
+    """
+    {category: result} for every category the combined request answered
+    validly. Categories missing from the returned dict are not
+    recommended yet. Never raises; a failed request returns {}.
+    """
+    categories = list(dict.fromkeys(categories))
+    try:
+        return recommendation_flight.do(
+            ("batch", kind, tuple(sorted(categories))), _generate_recommendations_batch, kind, categories)
+    except Exception as e:
+        print(f"[Batched recommendation failed] {kind}: {e}")
+        return {}
+
+def stream_recommendations(kind: str, categories, batch: bool = BATCH_RECOMMENDATIONS, **fan_out_kwargs):
+    """
+    Yield (category, result) for the 'ai' or 'it' results page. Cached rows
+    come from one bulk query. With `batch`, all misses go into one structured
+    OpenAI request. Only categories that fail validation, or every miss when
+    batching is off, go to the per-category concurrent fan-out.
+    """
+    table, generator = RECOMMENDATION_SOURCES[kind]
+    cached = fetch_cached_recommendations(table, categories)
+    for category in categories:
+        if category in cached:
+            yield category, cached[category]
+
+    misses = [c for c in categories if c not in cached]
+    if batch and len(misses) > 1:
+        batched = generate_recommendations_batch(kind, misses)
+        for category in misses:
+            if category in batched:
+                yield category, batched[category]
+        misses = [c for c in misses if c not in batched]
+    yield from fan_out_recommendations(generator, misses, **fan_out_kwargs)
+
+# ────────────────────────────────────────────────────────────────
+# Score-Fingerprint Result Sets
+# ────────────────────────────────────────────────────────────────
+RESULT_SET_LIMIT = 256
+_result_sets = OrderedDict()
+_result_sets_lock = threading.Lock()
+
+def score_fingerprint(scores: dict) -> str:
+    """Stable hash of {category: score}; scores are rounded so float noise does not change it."""
+    payload = json.dumps({c: round(float(s), 1) for c, s in scores.items()}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def cached_recommendation_set(kind: str, fingerprint: str):
+    """Full {category: result} set generated earlier, in any session, for the same scores."""
+    with _result_sets_lock:
+        results = _result_sets.get((kind, fingerprint))
+        if results is not None:
+            _result_sets.move_to_end((kind, fingerprint))
+        return results
+
+def remember_recommendation_set(kind: str, fingerprint: str, results: dict):
+    """Keep a complete result set; sets with failed or timed-out categories are not kept."""
+    if any(r.get("error") for r in results.values()):
+        return
+    with _result_sets_lock:
+        _result_sets[(kind, fingerprint)] = results
+        _result_sets.move_to_end((kind, fingerprint))
+        while len(_result_sets) > RESULT_SET_LIMIT:
+            _result_sets.popitem(last=False)
@@ -0,0 +1,176 @@
+# utils/ann_index.py
+"""
+Approximate-nearest-neighbour index types for the vector index.
+
+    flat      exact L2 search, every vector held as-is
+    ivf_flat  inverted lists over k-means cells; searches `nprobe` cells
+    hnsw      navigable small-world graph; `ef_search` trades speed for recall
+    ivf_pq    inverted lists with product-quantised codes (pq_m bytes per vector)
+
+All types use L2 distance and keep insertion order as ids, so they can
+replace the exact index under an existing LangChain FAISS docstore mapping.
+Indexes are read memory-mapped where FAISS supports it, so several worker
+processes share the same pages. evaluate() measures recall@k against exact
+search, plus per-query latency, on held-out query vectors or, without them,
+on indexed vectors perturbed by noise (an indexed vector is its own nearest
+neighbour, which overstates recall).
+"""
+import math
+import os
+import time
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+DEFAULT_CONFIG = {
+    "type": "flat",
+    "nlist": None,        # IVF cells; default ~4·sqrt(n), capped by training data
+    "nprobe": 8,
+    "hnsw_m": 32,
+    "ef_construction": 80,
+    "ef_search": 64,
+    "pq_m": None,         # PQ sub-quantizers; default: largest of 64/48/32/… leaving >= 8 dims each
+}
+MIN_POINTS_PER_CELL = 39   # below this FAISS k-means warns about poor centroids
+PQ_MIN_TRAINING = 256 * 4  # 8-bit PQ codebooks need a few points per centroid
+QUERY_NOISE = 0.25         # relative distance of evaluation queries from the vectors they are drawn from
+
+
+def resolve_config(config=None) -> dict:
+    """DEFAULT_CONFIG overlaid with `config`; raises ValueError for an unknown type."""
+    resolved = {**DEFAULT_CONFIG, **{k: v for k, v in (config or {}).items() if v is not None}}
+    resolved["type"] = str(resolved["type"]).lower()
+    if resolved["type"] not in INDEX_TYPES:
+        raise ValueError(f"Unknown vector index type {resolved['type']!r}; expected one of {', '.join(INDEX_TYPES)}")
+    return resolved
+
+
+def _nlist(n, config):
+    if config["nlist"]:
+        return max(1, min(int(config["nlist"]), n))
+    return max(1, min(int(4 * math.sqrt(n)), n // MIN_POINTS_PER_CELL))
+
+
+def _pq_m(dim, config):
+    if config["pq_m"]:
+        return int(config["pq_m"])
+    return next((m for m in (64, 48, 32, 24, 16, 12, 8, 4, 2) if dim % m == 0 and dim // m >= 8), 1)
+
+
+def apply_search_params(index, config):
+    """Set query-time knobs (nprobe / efSearch), which are not always kept on disk."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(int(config["nprobe"]), ivf.nlist)
+    if hasattr(index, "hnsw"):
+        index.hnsw.efSearch = int(config["ef_search"])
+
+
+def build_index(vectors: np.ndarray, config=None):
+    """
+    Train and fill an index of the configured type over `vectors` (float32, n×d).
+
+    Returns (index, effective_config). Falls back to a simpler type when
+    there are too few vectors to train the requested one (ivf_pq -> ivf_flat
+    -> flat); the effective config records what was actually built.
+    """
+    config = resolve_config(config)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+    index_type = config["type"]
+    if index_type == "ivf_pq" and n < PQ_MIN_TRAINING:
+        index_type = "ivf_flat"
+    if index_type in ("ivf_flat", "ivf_pq") and n < 2 * MIN_POINTS_PER_CELL:
+        index_type = "flat"
+
+    effective = {**config, "type": index_type}
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, int(config["hnsw_m"]))
+        index.hnsw.efConstruction = int(config["ef_construction"])
+    else:
+        effective["nlist"] = _nlist(n, config)
+        spec = f"IVF{effective['nlist']},Flat"
+        if index_type == "ivf_pq":
+            effective["pq_m"] = _pq_m(dim, config)
+            spec = f"IVF{effective['nlist']},PQ{effective['pq_m']}"
+        index = faiss.index_factory(dim, spec, faiss.METRIC_L2)
+        index.train(vectors)
+    index.add(vectors)
+    apply_search_params(index, effective)
+    return index, effective
+
+
+def read_index(path: str, config=None):
+    """Read an index memory-mapped and read-only, or fully into RAM if FAISS can't map this type."""
+    try:
+        index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        index = faiss.read_index(path)
+    if config:
+        apply_search_params(index, resolve_config(config))
+    return index
+
+
+def write_index(index, path: str):
+    """Write via a temp file and rename, so readers that mapped the old file are never truncated."""
+    faiss.write_index(index, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def _latencies_ms(index, queries, k):
+    timings = []
+    for q in queries:
+        start = time.perf_counter()
+        index.search(q[None, :], k)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, [50, 95])
+
+
+def perturbed_queries(vectors: np.ndarray, n_queries: int = 200, noise: float = QUERY_NOISE, seed: int = 0) -> np.ndarray:
+    """Sampled vectors moved in a random direction by `noise` times their own norm."""
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)]
+    direction = rng.standard_normal(sample.shape).astype(np.float32)
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    return sample + noise * np.linalg.norm(sample, axis=1, keepdims=True) * direction
+
+
+def evaluate(vectors: np.ndarray, index, k: int = 10, n_queries: int = 200, seed: int = 0,
+             queries: np.ndarray = None, noise: float = QUERY_NOISE) -> dict:
+    """
+    recall@k of `index` vs exact search, and p50/p95 single-query latency for
+    both. `queries` should be held out from `vectors` (e.g. embedded questions);
+    without them, perturbed_queries() stands in.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n = len(vectors)
+    k = max(1, min(k, n))
+    held_out = queries is not None
+    if held_out:
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+    else:
+        queries = perturbed_queries(vectors, n_queries, noise, seed)
+
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    _, found = index.search(queries, k)
+    recall = np.mean([len(set(t) & set(f)) / k for t, f in zip(truth, found)])
+
+    ann_p50, ann_p95 = _latencies_ms(index, queries, k)
+    exact_p50, exact_p95 = _latencies_ms(exact, queries, k)
+    return {
+        "vectors": n,
+        "dim": int(vectors.shape[1]),
+        "k": k,
+        "queries": len(queries),
+        "query_source": "held-out" if held_out else f"perturbed ({noise:g})",
+        f"recall@{k}": round(float(recall), 4),
+        "p50_ms": round(float(ann_p50), 3),
+        "p95_ms": round(float(ann_p95), 3),
+        "exact_p50_ms": round(float(exact_p50), 3),
+        "exact_p95_ms": round(float(exact_p95), 3),
+    }
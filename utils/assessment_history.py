@@ -0,0 +1,187 @@
+# utils/assessment_history.py
+"""
+Append-only assessment history per client project.
+
+Every save appends one compact snapshot row per assessment type to the
+Supabase "assessment_history" table: parallel category/score arrays plus a
+timestamp. Nothing is ever updated in place. Series are loaded into NumPy
+arrays sorted by time and cached per process. Because the table is
+append-only, a refresh fetches only rows newer than the cached tail. Each
+series has its own lock, so one project's fetch never blocks another's. A
+save inserts its row and then refreshes from the previous tail rather than
+advancing the tail itself, so rows other workers inserted meanwhile aren't
+skipped. Range queries are binary searches, and trend lines are bucket
+means over at most `max_points` buckets.
+"""
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from utils.supabase_client import supabase
+
+HISTORY_TABLE = "assessment_history"
+
+# Session-state DataFrames ("Category", "Score (%)") written by each assessment page
+SCORE_SESSION_KEYS = {
+    "it": "it_maturity_scores",
+    "ai": "ai_maturity_scores",
+    "cyber": "cyber_category_scores",
+}
+
+
+def _to_epoch(value):
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+class ScoreSeries:
+    """Time-sorted score snapshots: `timestamps` (T,) epoch seconds and `scores` (T × categories)."""
+
+    def __init__(self, categories=None):
+        self.categories = list(categories or [])
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.scores = np.empty((0, len(self.categories)), dtype=np.float32)
+        self.last_recorded_at = None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def extend(self, rows):
+        """Append snapshot rows ({recorded_at, categories, scores}) newer than the current tail."""
+        if not rows:
+            return
+        for row in rows:
+            for cat in row["categories"]:
+                if cat not in self.categories:
+                    self.categories.append(cat)
+        if self.scores.shape[1] < len(self.categories):
+            pad = np.full((len(self), len(self.categories) - self.scores.shape[1]), np.nan, dtype=np.float32)
+            self.scores = np.hstack([self.scores, pad])
+
+        col = {cat: i for i, cat in enumerate(self.categories)}
+        new_ts = np.array([_to_epoch(r["recorded_at"]) for r in rows], dtype=np.int64)
+        new_scores = np.full((len(rows), len(self.categories)), np.nan, dtype=np.float32)
+        for i, row in enumerate(rows):
+            new_scores[i, [col[c] for c in row["categories"]]] = row["scores"]
+
+        timestamps = np.concatenate([self.timestamps, new_ts])
+        scores = np.vstack([self.scores, new_scores])
+        order = np.argsort(timestamps, kind="stable")
+        self.timestamps, self.scores = timestamps[order], scores[order]
+
+        newest = max(rows, key=lambda r: _to_epoch(r["recorded_at"]))
+        if self.last_recorded_at is None or _to_epoch(newest["recorded_at"]) >= _to_epoch(self.last_recorded_at):
+            self.last_recorded_at = newest["recorded_at"]
+
+    def range(self, start=None, end=None):
+        """(timestamps, scores) views for start <= t <= end via binary search."""
+        lo = 0 if start is None else np.searchsorted(self.timestamps, _to_epoch(start), side="left")
+        hi = len(self) if end is None else np.searchsorted(self.timestamps, _to_epoch(end), side="right")
+        return self.timestamps[lo:hi], self.scores[lo:hi]
+
+    def latest(self):
+        if not len(self):
+            return {}
+        return {cat: round(float(s), 1) for cat, s in zip(self.categories, self.scores[-1]) if not np.isnan(s)}
+
+    def trend(self, start=None, end=None, max_points=120) -> pd.DataFrame:
+        """Per-category trend downsampled to at most `max_points` equal-time bucket means."""
+        ts, scores = self.range(start, end)
+        if not len(ts):
+            return pd.DataFrame(columns=self.categories)
+
+        if len(ts) > max_points:
+            span = max(int(ts[-1] - ts[0]), 1)
+            buckets = np.minimum((ts - ts[0]) * max_points // span, max_points - 1)
+            present = ~np.isnan(scores)
+            sums = np.zeros((max_points, scores.shape[1]), dtype=np.float64)
+            counts = np.zeros((max_points, scores.shape[1]), dtype=np.float64)
+            np.add.at(sums, buckets, np.where(present, scores, 0.0))
+            np.add.at(counts, buckets, present)
+            bucket_ts = np.zeros(max_points, dtype=np.float64)
+            np.add.at(bucket_ts, buckets, ts)
+            rows_per_bucket = np.bincount(buckets, minlength=max_points)
+            keep = rows_per_bucket > 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = (sums / counts)[keep]
+            ts = (bucket_ts[keep] / rows_per_bucket[keep]).astype(np.int64)
+
+        index = pd.to_datetime(ts, unit="s", utc=True)
+        return pd.DataFrame(np.round(scores, 1), index=index, columns=self.categories)
+
+
+# ────────────────────────────────────────────────────────────────
+# Process-wide cache with incremental refresh
+# ────────────────────────────────────────────────────────────────
+_series_cache = {}  # (project_id, kind) -> ScoreSeries
+_series_locks = {}  # (project_id, kind) -> lock held while that series is fetched and merged
+_cache_lock = threading.Lock()  # guards the two dicts only, never held across a fetch
+
+
+def _fetch_rows(project_id, kind, after=None):
+    query = (
+        supabase.table(HISTORY_TABLE)
+        .select("recorded_at, categories, scores")
+        .eq("project_id", project_id)
+        .eq("assessment", kind)
+    )
+    if after is not None:
+        query = query.gt("recorded_at", after)
+    return query.order("recorded_at").execute().data or []
+
+
+def _series_entry(project_id, kind):
+    with _cache_lock:
+        key = (project_id, kind)
+        if key not in _series_cache:
+            _series_cache[key] = ScoreSeries()
+            _series_locks[key] = threading.Lock()
+        return _series_cache[key], _series_locks[key]
+
+
+def load_history(project_id, kind) -> ScoreSeries:
+    """Cached series for a project; only snapshots newer than the cached tail are fetched."""
+    series, lock = _series_entry(project_id, kind)
+    with lock:
+        series.extend(_fetch_rows(project_id, kind, series.last_recorded_at))
+    return series
+
+
+def append_snapshot(project_id, kind, category_scores: dict, recorded_at=None):
+    """Append one snapshot unless it is identical to the latest stored one."""
+    if not project_id or not category_scores:
+        return None
+
+    series = load_history(project_id, kind)
+    rounded = {cat: round(float(score), 1) for cat, score in category_scores.items()}
+    if series.latest() == rounded:
+        return None
+
+    recorded_at = recorded_at or datetime.now(timezone.utc).isoformat()
+    row = {
+        "project_id": project_id,
+        "assessment": kind,
+        "recorded_at": recorded_at,
+        "categories": list(rounded.keys()),
+        "scores": list(rounded.values()),
+    }
+    supabase.table(HISTORY_TABLE).insert(row).execute()
+    # Fetch from the tail we had, not from this row's timestamp: that picks up this row
+    # together with any earlier-stamped rows other workers inserted since the last refresh.
+    load_history(project_id, kind)
+    return row
+
+
+def snapshot_session_scores(project_id, session_state):
+    """Append snapshots for every assessment with scores in the current session."""
+    for kind, session_key in SCORE_SESSION_KEYS.items():
+        score_df = session_state.get(session_key)
+        if isinstance(score_df, pd.DataFrame) and not score_df.empty:
+            append_snapshot(project_id, kind, dict(zip(score_df["Category"], score_df["Score (%)"])))
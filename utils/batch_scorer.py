@@ -0,0 +1,263 @@
+# utils/batch_scorer.py
+"""
+Headless batch scorer for offline assessment files (no Streamlit runtime).
+
+    python -m utils.batch_scorer workshop_exports/ --output-dir batch_output
+
+Every .csv/.json file in the input directory is split into chunks of
+CHUNK_ROWS input rows (whole assessments), the chunks are scored across a
+pool of worker processes with the weighted scoring model (utils/scoring.py),
+and the results are written as three Parquet files: category_scores.parquet,
+section_scores.parquet and roadmap.parquet.
+
+Accepted formats (answers are "Yes"/"No"; anything other than exactly "Yes",
+after trimming whitespace, counts as No, as on the assessment pages):
+- JSON: an assessment object or a list of them, shaped
+  {"assessment_id": "...", "assessment": "ai|it|cyber", "answers": {answer_key: "Yes"},
+   "question_bank_version": N}.
+  Session exports from the main page ("💾 Export Session") are accepted as-is.
+- CSV (wide): one row per assessment with assessment_id, an optional
+  assessment column and one column per question (answer key or question text).
+- CSV (long): one row per answer with assessment_id, answer and either key or
+  category/question (plus section for cybersecurity).
+IT answers are scored against the question bank version they were given
+against (question_bank_version field/column, or it_question_bank_version in
+session exports; version 0, the built-in bank, when absent), as on the IT page.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.question_banks import ANSWER_SESSION_KEYS, BANK_VERSION_SESSION_KEYS
+from utils.scoring import SCORING_MODEL_PATH, YES, assign_phase, bank_for_version, load_scoring_model, roadmap_action
+
+KINDS = list(ANSWER_SESSION_KEYS)
+VERSION_FIELD = "question_bank_version"
+CHUNK_ROWS = 5000  # input rows per worker task, so one large file is scored on every core
+
+# ────────────────────────────────────────────────────────────────
+# Column Lookups
+# ────────────────────────────────────────────────────────────────
+def _column_index(bank):
+    """Map answer keys and (unambiguous) question text to bank positions."""
+    index = dict(bank.key_index)
+    seen = {}
+    for i, q in enumerate(bank.questions):
+        seen.setdefault(q["question"], []).append(i)
+    for text, positions in seen.items():
+        if len(positions) == 1:
+            index.setdefault(text, positions[0])
+    return index
+
+def _row_lookup(bank, with_section):
+    lookup = {}
+    for i, q in enumerate(bank.questions):
+        parts = [q["category"], q["section"], q["question"]] if with_section else [q["category"], q["question"]]
+        lookup["\x1f".join(parts)] = i
+    return lookup
+
+def _is_yes(values):
+    return (pd.Series(values).astype(str).str.strip() == YES).to_numpy()
+
+# ────────────────────────────────────────────────────────────────
+# Readers → (kind, bank, assessment_ids, answers_matrix)
+# ────────────────────────────────────────────────────────────────
+def _from_wide(df, kind, bank):
+    index = _column_index(bank)
+    matrix = np.zeros((len(df), len(bank.keys)), dtype=np.float32)
+    for col in df.columns:
+        pos = index.get(str(col).strip())
+        if pos is not None:
+            matrix[:, pos] = _is_yes(df[col].to_numpy())
+    return kind, bank, df["assessment_id"].astype(str).to_numpy(), matrix
+
+def _from_long(df, kind, bank):
+    if "key" in df.columns:
+        positions = df["key"].astype(str).map(bank.key_index)
+    else:
+        with_section = "section" in df.columns and kind == "cyber"
+        parts = [df["category"].astype(str).str.strip()]
+        if with_section:
+            parts.append(df["section"].astype(str).str.strip())
+        parts.append(df["question"].astype(str).str.strip())
+        joined = parts[0].str.cat(parts[1:], sep="\x1f")
+        positions = joined.map(_row_lookup(bank, with_section))
+
+    codes, ids = pd.factorize(df["assessment_id"].astype(str))
+    matrix = np.zeros((len(ids), len(bank.keys)), dtype=np.float32)
+    known = positions.notna().to_numpy()
+    yes = _is_yes(df["answer"].to_numpy()) & known
+    matrix[codes[yes], positions.to_numpy()[yes].astype(np.int64)] = 1.0
+    return kind, bank, np.asarray(ids), matrix
+
+def _from_records(items, kind, bank):
+    matrix = np.stack([bank.vectorize(answers) for _, answers in items])
+    return kind, bank, np.array([aid for aid, _ in items]), matrix
+
+# ────────────────────────────────────────────────────────────────
+# Files → scoring tasks of at most `chunk_rows` input rows
+# ────────────────────────────────────────────────────────────────
+def _long_chunks(df, chunk_rows):
+    """Split answer rows into chunks of whole assessments, so no assessment is scored in two parts."""
+    codes, ids = pd.factorize(df["assessment_id"])
+    per_chunk = max(1, int(chunk_rows * len(ids) / max(len(df), 1)))
+    for lo in range(0, len(ids), per_chunk):
+        yield df[(codes >= lo) & (codes < lo + per_chunk)]
+
+def _csv_tasks(path, default_kind, chunk_rows):
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    if "assessment_id" not in df.columns:
+        df.insert(0, "assessment_id", [f"{os.path.basename(path)}:{i}" for i in range(len(df))])
+    if "assessment" not in df.columns:
+        df["assessment"] = default_kind
+    if VERSION_FIELD not in df.columns:
+        df[VERSION_FIELD] = ""
+    reader = _from_long if "answer" in df.columns else _from_wide
+    tasks = []
+    for (kind, version), group in df.groupby(["assessment", VERSION_FIELD], sort=False):
+        kind = kind.strip().lower()
+        if kind not in KINDS:
+            continue
+        chunks = (_long_chunks(group, chunk_rows) if reader is _from_long
+                  else (group.iloc[i:i + chunk_rows] for i in range(0, len(group), chunk_rows)))
+        tasks.extend((kind, version.strip(), reader, chunk) for chunk in chunks)
+    return tasks
+
+def _json_tasks(path, default_kind, chunk_rows):
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    records = payload if isinstance(payload, list) else [payload]
+    by_kind = {}
+    for i, rec in enumerate(records):
+        if "answers" in rec:
+            kind = (rec.get("assessment") or default_kind).strip().lower()
+            by_kind.setdefault((kind, rec.get(VERSION_FIELD)), []).append(
+                (str(rec.get("assessment_id", f"{stem}:{i}")), rec["answers"] or {}))
+        else:
+            # Session export: one assessment per answered page
+            for kind, session_key in ANSWER_SESSION_KEYS.items():
+                if isinstance(rec.get(session_key), dict) and rec[session_key]:
+                    version = rec.get(BANK_VERSION_SESSION_KEYS.get(kind))
+                    by_kind.setdefault((kind, version), []).append((f"{stem}:{i}", rec[session_key]))
+
+    return [
+        (kind, version, _from_records, items[i:i + chunk_rows])
+        for (kind, version), items in by_kind.items() if kind in KINDS
+        for i in range(0, len(items), chunk_rows)
+    ]
+
+def read_tasks(path, default_kind="it", chunk_rows=CHUNK_ROWS):
+    """(kind, bank version, reader, rows) scoring tasks for one file, each at most ~`chunk_rows` input rows."""
+    reader = _json_tasks if path.lower().endswith(".json") else _csv_tasks
+    return reader(path, default_kind, chunk_rows)
+
+# ────────────────────────────────────────────────────────────────
+# Scoring → long DataFrames
+# ────────────────────────────────────────────────────────────────
+def _long_frame(kind, ids, labels, scores, label_col):
+    return pd.DataFrame({
+        "assessment_id": np.repeat(ids, len(labels)),
+        "assessment": kind,
+        label_col: np.tile(np.asarray(labels, dtype=object), len(ids)),
+        "Score (%)": scores.reshape(-1),
+    })
+
+def _roadmap_frame(categories_df):
+    scores = categories_df["Score (%)"].to_numpy()
+    roadmap = categories_df.rename(columns={"Score (%)": "Score"}).copy()
+    roadmap["Quarter"] = assign_phase(scores)
+    roadmap["Action Item"] = roadmap_action(scores)
+    return roadmap
+
+def score_chunk(task, model_path=SCORING_MODEL_PATH, bank_backend="local"):
+    """(category frame, section frame or None) for one task from read_tasks()."""
+    kind, version, reader, rows = task
+    _, bank, ids, matrix = reader(rows, kind, bank_for_version(kind, version, bank_backend))
+    if not len(ids):
+        return None, None
+    model = load_scoring_model(kind, model_path, bank=bank)
+    scores = model.score(matrix)
+    categories = _long_frame(kind, ids, model.bank.categories, scores["categories"], "Category")
+    sections = _long_frame(kind, ids, model.bank.sections, scores["sections"], "Section") if model.bank.sections else None
+    return categories, sections
+
+def score_file(path, default_kind="it", model_path=SCORING_MODEL_PATH, bank_backend="local"):
+    """Score one file in this process; returns (category frames, section frames)."""
+    results = [score_chunk(task, model_path, bank_backend) for task in read_tasks(path, default_kind)]
+    return [c for c, _ in results if c is not None], [s for _, s in results if s is not None]
+
+def discover_files(input_dir):
+    return sorted(
+        os.path.join(root, name)
+        for root, _, files in os.walk(input_dir)
+        for name in files
+        if name.lower().endswith((".csv", ".json"))
+    )
+
+def run_batch(input_dir, output_dir, workers=None, default_kind="it", model_path=SCORING_MODEL_PATH,
+              bank_backend="local", chunk_rows=CHUNK_ROWS):
+    """
+    Files are parsed in this process (pandas' C reader); the row chunks they
+    are split into are scored across the worker pool, so one large workshop
+    export still uses every core.
+    """
+    files = discover_files(input_dir)
+    tasks = [task for path in files for task in read_tasks(path, default_kind, chunk_rows)]
+    categories, sections = [], []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        args = ([model_path] * len(tasks), [bank_backend] * len(tasks))
+        for cats, secs in pool.map(score_chunk, tasks, *args):
+            if cats is not None:
+                categories.append(cats)
+            if secs is not None:
+                sections.append(secs)
+
+    os.makedirs(output_dir, exist_ok=True)
+    category_df = pd.concat(categories, ignore_index=True) if categories else pd.DataFrame(
+        columns=["assessment_id", "assessment", "Category", "Score (%)"])
+    section_df = pd.concat(sections, ignore_index=True) if sections else pd.DataFrame(
+        columns=["assessment_id", "assessment", "Section", "Score (%)"])
+
+    category_df.to_parquet(os.path.join(output_dir, "category_scores.parquet"), index=False)
+    section_df.to_parquet(os.path.join(output_dir, "section_scores.parquet"), index=False)
+    _roadmap_frame(category_df).to_parquet(os.path.join(output_dir, "roadmap.parquet"), index=False)
+
+    return {
+        "files": len(files),
+        "chunks": len(tasks),
+        "assessments": category_df[["assessment", "assessment_id"]].drop_duplicates().shape[0],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score offline assessment files and write Parquet results.")
+    parser.add_argument("input_dir", help="Directory of .csv/.json assessment files")
+    parser.add_argument("--output-dir", default="batch_output", help="Where to write the Parquet files")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS,
+                        help="Input rows per worker task; large files are split across workers")
+    parser.add_argument("--assessment", choices=KINDS, default="it",
+                        help="Assessment type for files without an 'assessment' field")
+    parser.add_argument("--scoring-model", default=SCORING_MODEL_PATH,
+                        help="Weighted scoring model JSON (plain fraction of 'Yes' if missing)")
+    parser.add_argument("--question-bank-backend", choices=["local", "supabase"], default="local",
+                        help="Where versioned question banks are stored (as question_bank_backend in secrets)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = run_batch(args.input_dir, args.output_dir, args.workers, args.assessment, args.scoring_model,
+                        args.question_bank_backend, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {summary['assessments']:,} assessments from {summary['files']} files "
+          f"({summary['chunks']} chunks) in {elapsed:.1f}s → {args.output_dir}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
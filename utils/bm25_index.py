@@ -0,0 +1,143 @@
+# utils/bm25_index.py
+"""
+Local BM25 inverted index over vector-index chunks, for hybrid retrieval.
+
+Tokens are code-aware: every identifier is indexed whole (`run_simulation`,
+`LocalEmbeddings`) and also by its snake_case / camelCase parts, so both
+exact names and plain words match. The index also maps defined symbols
+(chunk metadata "symbols", see utils/code_chunker.py) to the chunks that
+define them.
+
+lookup_identifiers() is the fast path for identifier-shaped queries: dict
+lookups only, with no embedding call. search() ranks chunks with BM25, and
+reciprocal_rank_fusion() merges that ranking with the FAISS ranking.
+"""
+import heapq
+import math
+import os
+import pickle
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60  # rank offset from the original RRF paper
+
+_WORD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+_PART_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+# snake_case, camelCase/PascalCase with an inner capital, or dotted names like Class.method
+_IDENTIFIER_RE = re.compile(r"\b[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+|\b\w*_\w+|\b[a-z]+[A-Z]\w*|\b[A-Z][a-z0-9]+[A-Z]\w*")
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        tokens.append(word.lower())
+        parts = [p.lower() for piece in word.split("_") for p in _PART_RE.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def query_identifiers(query: str) -> List[str]:
+    """Identifier-shaped tokens in a question, e.g. run_simulation, LocalEmbeddings.embed_query."""
+    return list(dict.fromkeys(m.strip("._") for m in _IDENTIFIER_RE.findall(query) if m.strip("._")))
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = RRF_K) -> List[str]:
+    """Merge ranked id lists: score(id) = Σ 1 / (k + rank)."""
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def hybrid_rank(query: str, bm25: "BM25Index", vector_search: Callable[[int], List[str]], k: int,
+                candidates: int = 20) -> List[str]:
+    """
+    Top-k chunk ids for `query`: the identifier fast path when it matches,
+    otherwise RRF over BM25 and `vector_search(n)` (the n nearest chunk ids).
+    """
+    exact = bm25.lookup_identifiers(query, k)
+    if exact:
+        return exact
+    candidates = max(candidates, 4 * k)
+    lexical = [chunk_id for chunk_id, _ in bm25.search(query, candidates)]
+    return reciprocal_rank_fusion([vector_search(candidates), lexical])[:k]
+
+
+class BM25Index:
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Dict[int, int]] = {}   # term -> {doc: term frequency}
+        self.definitions: Dict[str, List[int]] = {}     # symbol / qualified name -> defining docs
+        self.avg_length = 0.0
+
+    @classmethod
+    def build(cls, chunks: Iterable[Tuple[str, str, Sequence[str]]], **params) -> "BM25Index":
+        """Index (chunk_id, text, symbols) triples."""
+        index = cls(**params)
+        for doc, (chunk_id, text, symbols) in enumerate(chunks):
+            counts = Counter(tokenize(text))
+            index.ids.append(chunk_id)
+            index.lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                index.postings.setdefault(term, {})[doc] = tf
+            for symbol in symbols or []:
+                for name in {symbol, symbol.rsplit(".", 1)[-1]}:
+                    index.definitions.setdefault(name, []).append(doc)
+        index.avg_length = sum(index.lengths) / len(index.lengths) if index.lengths else 0.0
+        return index
+
+    def _scores(self, terms) -> Dict[int, float]:
+        n = len(self.ids)
+        scores = {}
+        for term in set(terms):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc, tf in posting.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self.lengths[doc] / (self.avg_length or 1))
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return scores
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (chunk_id, score) by BM25."""
+        scores = self._scores(tokenize(query))
+        return [(self.ids[doc], score) for doc, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1])]
+
+    def lookup_identifiers(self, query: str, k: int = 10) -> List[str]:
+        """
+        Chunk ids for identifiers named in the query: defining chunks first,
+        then chunks that mention them, ranked by BM25 on those identifiers
+        only. Empty when the query names no identifier this index knows.
+        """
+        identifiers = []
+        for name in query_identifiers(query):
+            if "." in name and name not in self.definitions:
+                # Unknown dotted name: use whichever parts are defined symbols ("e.g" yields nothing)
+                identifiers += [part for part in name.split(".") if part in self.definitions]
+            elif name in self.definitions or name.lower() in self.postings:
+                identifiers.append(name)
+        if not identifiers:
+            return []
+        ranked = [doc for i in identifiers for doc in self.definitions.get(i, [])]
+        mentions = self._scores([i.lower() for i in identifiers if "." not in i])
+        ranked += heapq.nlargest(k, mentions, key=mentions.get)
+        return [self.ids[doc] for doc in dict.fromkeys(ranked)][:k]
+
+    def save(self, path: str):
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def load(path: str) -> "BM25Index":
+        with open(path, "rb") as f:
+            return pickle.load(f)
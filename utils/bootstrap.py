@@ -1,6 +1,7 @@
 # utils/bootstrap.py
 import streamlit as st
-from utils.ai_assist import handle_ai_consultation
+from utils.ai_assist import handle_ai_consultation, stream_ai_consultation
+from utils.streaming import render_stream
 
 
 def page_bootstrap(current_page="Overview", required_keys=None):
@@ -33,11 +34,12 @@ def page_bootstrap(current_page="Overview"):
     with st.sidebar.expander("💬 AI Assistant", expanded=False):
         user_prompt = st.text_input("Ask the AI Assistant:")
         if st.button("Submit"):
-            response = ai_assist_overlay(
+            st.caption("AI Response:")
+            # Rendered as it streams; a new Submit interrupts this run and closes the stream
+            render_stream(st.empty(), stream_ai_consultation(
                 user_prompt=user_prompt,
                 session_state=st.session_state,
                 role="CIO",
                 goal="Optimize Costs"
-            )
-            st.text_area("AI Response:", response)
+            ))
 
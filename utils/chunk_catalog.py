@@ -0,0 +1,154 @@
+# utils/chunk_catalog.py
+"""
+SQLite sidecar catalog of indexed chunks, for the Vector Index Admin page.
+
+Written next to the FAISS files (catalog.sqlite3) on every index update. It
+lists chunk ids, sources, qualified names, line ranges, sizes and a short
+preview, so the admin page never has to deserialize the docstore.
+- Rows are numbered in (source, start line) order, so an unfiltered page is
+  a primary-key range lookup.
+- Totals live in a meta table, so the page's cost doesn't grow with the index.
+- Filtered queries (source / symbol substring) use LIMIT/OFFSET.
+The file is rebuilt under a temp name and renamed into place, so readers
+never see a half-written catalog.
+"""
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Iterable, Optional, Tuple
+
+CATALOG_FILE = "catalog.sqlite3"
+PREVIEW_CHARS = 1000
+
+
+def write_catalog(index_path: str, chunks: Iterable[Tuple[str, object]]):
+    """Rebuild the catalog from (chunk_id, Document) pairs."""
+    rows = sorted(
+        (
+            doc.metadata.get("source", ""),
+            doc.metadata.get("start_line") or 0,
+            chunk_id,
+            doc.metadata.get("qualified_name"),
+            doc.metadata.get("end_line"),
+            len(doc.page_content),
+            doc.page_content[:PREVIEW_CHARS],
+        )
+        for chunk_id, doc in chunks
+    )
+    final_path = os.path.join(index_path, CATALOG_FILE)
+    tmp_path = final_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(
+            "CREATE TABLE chunks (id INTEGER PRIMARY KEY, chunk_id TEXT NOT NULL, source TEXT NOT NULL,"
+            " qualified_name TEXT, start_line INTEGER, end_line INTEGER, chars INTEGER NOT NULL, preview TEXT NOT NULL);"
+            "CREATE INDEX chunks_source ON chunks (source);"
+            "CREATE TABLE sources (id INTEGER PRIMARY KEY, source TEXT NOT NULL UNIQUE, chunks INTEGER NOT NULL,"
+            " chars INTEGER NOT NULL);"
+            "CREATE TABLE meta (key TEXT PRIMARY KEY, value);"
+        )
+        conn.executemany(
+            "INSERT INTO chunks (source, start_line, chunk_id, qualified_name, end_line, chars, preview)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT INTO sources (source, chunks, chars)"
+            " SELECT source, COUNT(*), SUM(chars) FROM chunks GROUP BY source ORDER BY source"
+        )
+        conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+            ("chunks", len(rows)),
+            ("sources", conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]),
+            ("chars", sum(row[5] for row in rows)),
+            ("built_at", time.time()),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, final_path)
+
+
+def _connect(index_path: str) -> Optional[sqlite3.Connection]:
+    path = os.path.join(index_path, CATALOG_FILE)
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def catalog_summary(index_path: str) -> Optional[dict]:
+    """{"chunks", "sources", "chars", "built_at"}, or None when no catalog has been written."""
+    conn = _connect(index_path)
+    if conn is None:
+        return None
+    with closing(conn):
+        return {row["key"]: row["value"] for row in conn.execute("SELECT key, value FROM meta")}
+
+
+def _page(conn, table, filters, params, limit, offset, total):
+    if filters:
+        where = " AND ".join(filters)
+        total = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT * FROM {table} WHERE {where} ORDER BY id LIMIT ? OFFSET ?", [*params, limit, offset]
+        ).fetchall()
+    else:
+        # ids are dense 1..n in display order, so an unfiltered page is a key range
+        rows = conn.execute(
+            f"SELECT * FROM {table} WHERE id > ? AND id <= ? ORDER BY id", (offset, offset + limit)
+        ).fetchall()
+    return [dict(row) for row in rows], total
+
+
+def _contains(column: str, text: str):
+    """(filter, param) matching `text` literally anywhere in `column`; % and _ in user input aren't wildcards."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{column} LIKE ? ESCAPE '\\'", f"%{escaped}%"
+
+
+def list_sources(index_path: str, contains: str = "", limit: int = 50, offset: int = 0):
+    """(rows, total) of indexed sources whose path contains `contains`; limit=0 just counts."""
+    conn = _connect(index_path)
+    if conn is None:
+        return [], 0
+    with closing(conn):
+        total = conn.execute("SELECT value FROM meta WHERE key = 'sources'").fetchone()[0]
+        filters, params = [], []
+        if contains:
+            condition, param = _contains("source", contains)
+            filters, params = [condition], [param]
+        return _page(conn, "sources", filters, params, limit, offset, total)
+
+
+def query_chunks(index_path: str, source_contains: str = "", symbol_contains: str = "", limit: int = 20, offset: int = 0):
+    """(rows, total) of chunks filtered by source path and qualified-name substrings; limit=0 just counts."""
+    conn = _connect(index_path)
+    if conn is None:
+        return [], 0
+    with closing(conn):
+        total = conn.execute("SELECT value FROM meta WHERE key = 'chunks'").fetchone()[0]
+        filters, params = [], []
+        for column, text in (("source", source_contains), ("qualified_name", symbol_contains)):
+            if text:
+                condition, param = _contains(column, text)
+                filters.append(condition)
+                params.append(param)
+        return _page(conn, "chunks", filters, params, limit, offset, total)
+
+
+def sources_matching(index_path: str, names) -> set:
+    """The subset of `names` that appear in at least one indexed source path."""
+    conn = _connect(index_path)
+    if conn is None:
+        return set()
+    with closing(conn):
+        matches = set()
+        for name in names:
+            condition, param = _contains("source", name)
+            if conn.execute(f"SELECT 1 FROM sources WHERE {condition} LIMIT 1", (param,)).fetchone():
+                matches.add(name)
+        return matches
@@ -0,0 +1,115 @@
+# utils/code_chunker.py
+"""
+AST-aware chunking for Python sources in the code-context index.
+
+Files are split along module, class and function boundaries instead of every
+1000 characters:
+- a function or class that fits in `max_chars` stays whole, together with
+  its decorators and the comment block directly above it;
+- a class that is too long is split into its header (class line, docstring,
+  class attributes) and one unit per method, recursively;
+- a function or statement run that is still too long falls back to the
+  Python-aware character splitter, and every part after the first is
+  prefixed with "# <qualified name> (continued)";
+- adjacent small units are packed together up to `max_chars`, so answers
+  retrieve fewer, denser chunks.
+
+Each Document carries `qualified_name` (first symbol in the chunk, or
+"<module>"), `symbols` (every qualified name it contains) and
+`start_line`/`end_line`. Files that don't parse are split by characters.
+"""
+import ast
+from typing import List
+
+from langchain.schema import Document
+from langchain.text_splitter import Language, RecursiveCharacterTextSplitter
+
+PYTHON_CHUNK_CHARS = 1500
+CHUNKER_VERSION = "py-ast-2"  # stored per source in the index manifest; bump to force re-chunking
+
+_DEFS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _with_leading_comments(lines, start, floor):
+    while start - 1 >= floor and lines[start - 2].lstrip().startswith("#"):
+        start -= 1
+    return start
+
+
+def _regions(body, lines, scope, first, last):
+    """(qualname, node, first, last) spans covering lines first..last, split around the defs in `body`."""
+    regions, cursor = [], first
+    for node in body:
+        if not isinstance(node, _DEFS):
+            continue
+        start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+        start = _with_leading_comments(lines, start, cursor)
+        if start > cursor:
+            regions.append((scope, None, cursor, start - 1))
+        regions.append((f"{scope}.{node.name}" if scope else node.name, node, start, node.end_lineno))
+        cursor = node.end_lineno + 1
+    if cursor <= last:
+        regions.append((scope, None, cursor, last))
+    return regions
+
+
+def _pieces(lines, qualname, node, first, last, max_chars, fallback):
+    text = "".join(lines[first - 1:last])
+    if not text.strip():
+        return []
+    symbols = [qualname] if qualname else []
+    if len(text) <= max_chars:
+        return [{"text": text, "symbols": symbols, "start_line": first, "end_line": last, "packable": True}]
+    if isinstance(node, ast.ClassDef):
+        pieces = []
+        for region in _regions(node.body, lines, qualname, first, last):
+            pieces.extend(_pieces(lines, *region, max_chars, fallback))
+        return pieces
+    label = qualname or "<module>"
+    pieces, offset = [], 0
+    for i, part in enumerate(fallback.split_text(text)):
+        # Parts come back in order (overlapping, whitespace-stripped); locate each to get its own lines
+        found = text.find(part, offset)
+        if found >= 0:
+            offset = found
+        start_line = first + text.count("\n", 0, offset)
+        end_line = first + text.count("\n", 0, offset + len(part)) if found >= 0 else last
+        pieces.append({"text": part if i == 0 else f"# {label} (continued)\n{part}", "symbols": symbols,
+                       "start_line": start_line, "end_line": min(end_line, last), "packable": False})
+        offset += 1
+    return pieces
+
+
+def split_python(text: str, metadata: dict, max_chars: int = PYTHON_CHUNK_CHARS) -> List[Document]:
+    """Documents for one Python file; `metadata` (e.g. source) is copied onto every chunk."""
+    fallback = RecursiveCharacterTextSplitter.from_language(Language.PYTHON, chunk_size=max_chars, chunk_overlap=50)
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return fallback.create_documents([text], metadatas=[metadata])
+
+    lines = text.splitlines(keepends=True)
+    pieces = []
+    for region in _regions(tree.body, lines, "", 1, len(lines)):
+        pieces.extend(_pieces(lines, *region, max_chars, fallback))
+
+    chunks = []
+    for piece in pieces:
+        prev = chunks[-1] if chunks else None
+        if prev and prev["packable"] and piece["packable"] and len(prev["text"]) + len(piece["text"]) <= max_chars:
+            prev["text"] += piece["text"]
+            prev["symbols"] += [s for s in piece["symbols"] if s not in prev["symbols"]]
+            prev["end_line"] = piece["end_line"]
+        else:
+            chunks.append(dict(piece, symbols=list(piece["symbols"])))
+
+    return [
+        Document(page_content=chunk["text"], metadata={
+            **metadata,
+            "qualified_name": chunk["symbols"][0] if chunk["symbols"] else "<module>",
+            "symbols": chunk["symbols"],
+            "start_line": chunk["start_line"],
+            "end_line": chunk["end_line"],
+        })
+        for chunk in chunks if chunk["text"].strip()
+    ]
@@ -1,29 +1,24 @@
-import os
 import re
 import ast
 import json
-import streamlit as st
-from langchain_openai import ChatOpenAI
-from langchain_community.tools.tavily_search.tool import TavilySearchResults
 
-# ✅ Load API keys from Streamlit secrets or environment
-openai_key = st.secrets.get("openai_api_key") or os.getenv("OPENAI_API_KEY")
-tavily_key = st.secrets.get("tavily_api_key") or os.getenv("TAVILY_API_KEY")
+from utils.llm_providers import get_chat_model, search
+from utils.single_flight import recommendation_flight
 
-# ✅ Ensure Tavily key is set in the environment
-os.environ["TAVILY_API_KEY"] = tavily_key
-
-# ✅ Instantiate LLM and search tool
-llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0, api_key=openai_key)
-tavily = TavilySearchResults()
+# ✅ Shared, rate-limited LLM (keys and pooled clients come from utils/llm_providers.py)
+llm = get_chat_model("gpt-3.5-turbo", temperature=0)
 
 def get_dynamic_product_recommendations(category: str):
     """
     Retrieve a list of tools for the given AI maturity category using Tavily or fallback to OpenAI.
     Each item returned will include: name, features, price_estimate, and source.
+    Concurrent calls for the same category share one in-flight lookup.
     """
+    return recommendation_flight.do(("dynamic", category), _get_dynamic_product_recommendations, category)
+
+def _get_dynamic_product_recommendations(category: str):
     query = f"Top enterprise software tools for {category} in AI maturity"
-    results = tavily.run(query)
+    results = search(query, max_results=5)
 
     if results and isinstance(results, list):
         product_list = []
@@ -0,0 +1,110 @@
+# utils/embedding_benchmark.py
+"""
+Embedding throughput benchmark: local sentence-transformers vs the remote API.
+
+    python -m utils.embedding_benchmark --texts 512 --batch-sizes 16 64 128 --threads 4
+
+The corpus is this repository's own .py/.md files, chunked the same way as
+the vector index (1000 characters, 50 overlap). Each local batch size is
+timed after a warm-up call, so model loading is reported separately
+(load_s). The remote row goes through utils/llm_providers.get_embeddings,
+including its rate limiter, and is skipped when no OpenAI key is configured.
+Neither backend goes through the on-disk embedding cache.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from utils import llm_providers
+from utils.local_embeddings import DEFAULT_LOCAL_MODEL, LocalEmbeddings, load_model
+
+SKIP_DIRS = (".git", ".venv", "__pycache__", ".cache", "vector_store")
+
+
+def load_corpus(root, n):
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=50)
+    texts = []
+    for dirpath, dirnames, files in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in sorted(files):
+            if name.endswith((".py", ".md")):
+                with open(os.path.join(dirpath, name), encoding="utf-8", errors="ignore") as f:
+                    texts.extend(splitter.split_text(f.read()))
+            if len(texts) >= n:
+                return texts[:n]
+    # Small trees: repeat the corpus rather than benchmark a handful of texts
+    return (texts * (n // max(1, len(texts)) + 1))[:n]
+
+
+def time_backend(embeddings, texts, repeat):
+    timings, dim = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        vectors = embeddings.embed_documents(texts)
+        timings.append(time.perf_counter() - start)
+        dim = len(vectors[0]) if vectors else 0
+    return statistics.median(timings), dim
+
+
+def row(backend, batch_size, threads, texts, wall, dim, load_s=0.0):
+    chars = sum(len(t) for t in texts)
+    return {
+        "backend": backend,
+        "batch_size": batch_size,
+        "threads": threads or "auto",
+        "texts": len(texts),
+        "dim": dim,
+        "load_s": round(load_s, 2),
+        "wall_s": round(wall, 2),
+        "texts_per_s": round(len(texts) / wall, 1),
+        "kchars_per_s": round(chars / wall / 1000, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark local vs remote embedding throughput.")
+    parser.add_argument("--root", default=".", help="Directory whose .py/.md files form the corpus")
+    parser.add_argument("--texts", type=int, default=512, help="Number of chunks to embed")
+    parser.add_argument("--model", default=DEFAULT_LOCAL_MODEL)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 128])
+    parser.add_argument("--threads", type=int, default=None, help="PyTorch CPU threads (default: all cores)")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per configuration (median reported)")
+    parser.add_argument("--no-remote", action="store_true", help="Skip the remote (OpenAI) backend")
+    args = parser.parse_args(argv)
+
+    texts = load_corpus(args.root, args.texts)
+    rows = []
+
+    start = time.perf_counter()
+    load_model(args.model, threads=args.threads)
+    load_s = time.perf_counter() - start
+    for batch_size in args.batch_sizes:
+        local = LocalEmbeddings(args.model, batch_size=batch_size, threads=args.threads)
+        local.embed_documents(texts[:batch_size])  # warm-up
+        wall, dim = time_backend(local, texts, args.repeat)
+        rows.append(row("local", batch_size, args.threads, texts, wall, dim, load_s))
+
+    if args.no_remote:
+        pass
+    elif not (llm_providers.openai_api_key() or llm_providers.is_offline()):
+        print("Remote backend skipped: no OpenAI API key configured.", file=sys.stderr)
+    else:
+        remote = llm_providers.get_embeddings(backend="openai")
+        wall, dim = time_backend(remote, texts, args.repeat)
+        name = "offline" if llm_providers.is_offline() else "openai"
+        rows.append(row(name, getattr(remote, "chunk_size", "-"), "-", texts, wall, dim))
+
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in columns))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
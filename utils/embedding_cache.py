@@ -0,0 +1,137 @@
+# utils/embedding_cache.py
+"""
+Persistent embedding cache keyed by (model, text hash).
+
+Vectors are appended to one float32 file per model and read back through a
+read-only np.memmap, so cached lookups never deserialize the whole store.
+A SQLite table maps (model, sha1) to a row in that file. CachedEmbeddings
+wraps any LangChain Embeddings; FAISS builders and query paths that use it
+only pay for text they have never embedded with that model before.
+Writers serialize on a SQLite write transaction, so several processes can
+share the same cache directory.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_CACHE_DIR = os.path.join(".cache", "embeddings")
+_SQL_BATCH = 500  # stay well under SQLite's bound-parameter limit
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    def __init__(self, inner: Embeddings, cache_dir: str = EMBEDDING_CACHE_DIR):
+        self.inner = inner
+        self.model = getattr(inner, "model", None) or getattr(inner, "model_name", None) or type(inner).__name__
+        self.cache_dir = cache_dir
+        self._vectors_path = os.path.join(cache_dir, f"{_sha(str(self.model))[:16]}.f32")
+        self._lock = threading.Lock()
+        self._conn = None
+        self._dim = None
+        self._matrix = None  # read-only memmap over the rows written so far
+        self.stats = {"hits": 0, "misses": 0}
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    # --- Storage ---
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(
+                os.path.join(self.cache_dir, "index.sqlite3"), check_same_thread=False, timeout=30,
+                isolation_level=None,
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS vectors ("
+                " model TEXT NOT NULL, hash TEXT NOT NULL, row INTEGER NOT NULL, PRIMARY KEY (model, hash))"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS models (model TEXT PRIMARY KEY, dim INTEGER NOT NULL)")
+            row = self._conn.execute("SELECT dim FROM models WHERE model = ?", (self.model,)).fetchone()
+            self._dim = row[0] if row else None
+        return self._conn
+
+    def _rows(self, hashes):
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        for i in range(0, len(unique), _SQL_BATCH):
+            batch = unique[i:i + _SQL_BATCH]
+            found.update(self._db().execute(
+                f"SELECT hash, row FROM vectors WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+                [self.model, *batch],
+            ).fetchall())
+        return found
+
+    def _read(self, rows):
+        if self._dim is None:  # first written by another process after we connected
+            self._dim = self._db().execute("SELECT dim FROM models WHERE model = ?", (self.model,)).fetchone()[0]
+        needed = max(rows) + 1
+        if self._matrix is None or len(self._matrix) < needed:
+            count = os.path.getsize(self._vectors_path) // (4 * self._dim)
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(count, self._dim))
+        return self._matrix[rows]
+
+    def _append(self, hashes, vectors):
+        conn = self._db()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another thread or process may have stored some of these while we were embedding
+            existing = self._rows(hashes)
+            fresh = [(h, v) for h, v in zip(hashes, vectors) if h not in existing]
+            if fresh:
+                matrix = np.asarray([v for _, v in fresh], dtype=np.float32)
+                if self._dim is None:
+                    self._dim = matrix.shape[1]
+                    conn.execute("INSERT OR IGNORE INTO models (model, dim) VALUES (?, ?)", (self.model, self._dim))
+                elif matrix.shape[1] != self._dim:
+                    raise ValueError(f"Embedding size changed for {self.model}: {matrix.shape[1]} != {self._dim}")
+                with open(self._vectors_path, "ab") as f:
+                    start = f.seek(0, os.SEEK_END) // (4 * self._dim)
+                    f.write(matrix.tobytes())
+                conn.executemany(
+                    "INSERT INTO vectors (model, hash, row) VALUES (?, ?, ?)",
+                    [(self.model, h, start + i) for i, (h, _) in enumerate(fresh)],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # --- Embeddings API ---
+    def _embed(self, texts: List[str], prefix: str, embed_fn) -> List[List[float]]:
+        hashes = [_sha(prefix + text) for text in texts]
+        with self._lock:
+            found = self._rows(hashes)
+            cached = {}
+            if found:
+                keys = list(found)
+                cached = dict(zip(keys, self._read([found[h] for h in keys]).tolist()))
+            missing = {h: text for h, text in zip(hashes, texts) if h not in cached}
+            hits = sum(1 for h in hashes if h in cached)
+            self.stats["hits"] += hits
+            self.stats["misses"] += len(hashes) - hits
+
+        if missing:
+            vectors = embed_fn(list(missing.values()))
+            cached.update(zip(missing, vectors))
+            with self._lock:
+                self._append(list(missing), vectors)
+        return [cached[h] for h in hashes]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "", self.inner.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        # Some models embed queries differently from documents, so they get their own keys
+        return self._embed([text], "q:", lambda texts: [self.inner.embed_query(texts[0])])[0]
@@ -1,8 +1,6 @@
 import os
-from langchain_openai import ChatOpenAI
-from langchain.chains import RetrievalQA
 from langchain.vectorstores import FAISS
-from utils.vector_utils import load_vector_index  # adjust if needed
+from utils.vector_index import get_qa_chain
 import streamlit as st
 
 # Load OpenAI key securely from Streamlit secrets
@@ -13,13 +11,9 @@ def answer_with_code_context(query: str):
         return "❌ OpenAI API key not configured. Please check your Streamlit secrets."
 
     try:
-        vectorstore = load_vector_index()
-        retriever = vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": 5})
-        qa = RetrievalQA.from_chain_type(
-            llm=ChatOpenAI(temperature=0, api_key=openai_key),
-            chain_type="stuff",
-            retriever=retriever
-        )
+        qa = get_qa_chain()
+        if qa is None:
+            return "Vector index not found. Please build it first from your code or documentation."
         return qa.run(query)
     except Exception as e:
         return f"❌ Error during AI execution: {e}"
@@ -0,0 +1,411 @@
+# utils/llm_providers.py
+"""
+Single provider layer for OpenAI and Tavily calls.
+
+- One pooled HTTP client per provider per process: httpx for OpenAI and
+  ChatOpenAI, a requests.Session for Tavily. Clients are built lazily and
+  never per rerun.
+- A process-wide token bucket per provider. Every call, from any session or
+  thread, takes a token before it goes out.
+- Exponential backoff with jitter on 429 and 5xx responses. A Retry-After
+  header is honoured.
+- Per-provider latency metrics (calls, errors, retries, p50/p95) for the admin
+  page.
+
+Call sites use chat_completion / stream_completion / search, or get_chat_model
+/ get_embeddings / search_tool for LangChain, instead of building their own
+clients. Setting `llm_provider = "offline"` (secrets) or LLM_PROVIDER=offline
+swaps both providers for the deterministic stand-in in utils/offline_provider.py.
+"""
+import os
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+import httpx
+import requests
+import streamlit as st
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+from langchain_core.tools import tool
+from openai import APIConnectionError, APIStatusError, OpenAI, RateLimitError
+
+# (requests per second, burst) per provider
+RATE_LIMITS = {"openai": (3.0, 10), "tavily": (1.0, 5)}
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0   # seconds; doubles per attempt
+BACKOFF_CAP = 30.0
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+DEFAULT_TIMEOUT = 60
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+def _secret(*names):
+    for name in names:
+        try:
+            value = st.secrets.get(name)
+        except Exception:
+            value = None
+        value = value or os.getenv(name.upper())
+        if value:
+            return value
+    return None
+
+def openai_api_key():
+    key = _secret("openai_api_key", "OPENAI_API_KEY")
+    if not key:
+        try:
+            key = dict(st.secrets.get("openai", {})).get("api_key")  # [openai] api_key = "..."
+        except Exception:
+            key = None
+    return key
+
+def _require_openai_key():
+    """The key for building an OpenAI client; only asked for when a call resolves to OpenAI."""
+    key = openai_api_key()
+    if not key:
+        raise KeyError("OpenAI API key is missing. Please configure it in the Streamlit secrets.")
+    return key
+
+def tavily_api_key():
+    return _secret("tavily_api_key", "TAVILY_API_KEY")
+
+def is_offline() -> bool:
+    return str(_secret("llm_provider") or "").lower() == "offline"
+
+@lru_cache(maxsize=1)
+def _offline():
+    """The offline provider module, configured once from the [offline_provider] secrets table."""
+    from utils import offline_provider
+    try:
+        settings = dict(st.secrets.get("offline_provider", {}))
+    except Exception:
+        settings = {}
+    if settings:
+        offline_provider.configure(**settings)
+    return offline_provider
+
+def _offline_retryable(e):
+    return getattr(e, "status_code", None) == 429 and type(e).__name__ == "OfflineProviderError"
+
+# ────────────────────────────────────────────────────────────────
+# Rate Limiting & Metrics
+# ────────────────────────────────────────────────────────────────
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1.0):
+        """Block until `tokens` are available; returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ProviderMetrics:
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.calls = self.errors = self.retries = 0
+        self.throttled_seconds = 0.0
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self.calls += 1
+            self.errors += int(error)
+            self.latencies.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            lat = sorted(self.latencies)
+            pick = lambda q: round(lat[min(len(lat) - 1, int(q * len(lat)))] * 1000, 1) if lat else None
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "retries": self.retries,
+                "throttled_s": round(self.throttled_seconds, 2),
+                "p50_ms": pick(0.50),
+                "p95_ms": pick(0.95),
+                "mean_ms": round(sum(lat) / len(lat) * 1000, 1) if lat else None,
+            }
+
+
+_buckets = {name: TokenBucket(*limits) for name, limits in RATE_LIMITS.items()}
+_metrics = {name: ProviderMetrics() for name in RATE_LIMITS}
+
+def provider_metrics() -> dict:
+    """{provider: {calls, errors, retries, throttled_s, p50_ms, p95_ms, mean_ms}}"""
+    return {name: m.snapshot() for name, m in _metrics.items()}
+
+def reset_metrics():
+    for name in _metrics:
+        _metrics[name] = ProviderMetrics()
+
+def set_rate_limit(provider, rate, burst):
+    """Replace a provider's token bucket (e.g. for benchmarks)."""
+    _buckets[provider] = TokenBucket(rate, burst)
+
+def _throttle(provider):
+    waited = _buckets[provider].acquire()
+    if waited:
+        with _metrics[provider]._lock:
+            _metrics[provider].throttled_seconds += waited
+
+def _backoff_delay(attempt, retry_after=None):
+    if retry_after:
+        try:
+            return min(BACKOFF_CAP, float(retry_after))
+        except ValueError:
+            pass
+    return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) * (0.5 + random.random() / 2)
+
+def _call(provider, fn, is_retryable, retry_after_of=lambda e: None):
+    """Throttle, time and retry fn() for `provider`."""
+    metrics = _metrics[provider]
+    for attempt in range(MAX_RETRIES + 1):
+        _throttle(provider)
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            metrics.record(time.perf_counter() - start, error=True)
+            if attempt == MAX_RETRIES or not is_retryable(e):
+                raise
+            with metrics._lock:
+                metrics.retries += 1
+            time.sleep(_backoff_delay(attempt, retry_after_of(e)))
+            continue
+        metrics.record(time.perf_counter() - start)
+        return result
+
+# ────────────────────────────────────────────────────────────────
+# OpenAI
+# ────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=1)
+def _openai_http_client():
+    return httpx.Client(limits=POOL_LIMITS, timeout=DEFAULT_TIMEOUT)
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    # Retries are handled here (with the shared limiter), not by the SDK
+    return OpenAI(api_key=_require_openai_key(), http_client=_openai_http_client(), max_retries=0)
+
+def _openai_retryable(e):
+    if _offline_retryable(e):
+        return True
+    if isinstance(e, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(e, APIStatusError) and e.status_code >= 500
+
+def _openai_retry_after(e):
+    response = getattr(e, "response", None)
+    return response.headers.get("retry-after") if response is not None else None
+
+def chat_completion(messages, model="gpt-3.5-turbo", timeout=None, **kwargs):
+    """client.chat.completions.create through the limiter, with backoff; returns the SDK response."""
+    if is_offline():
+        offline = _offline()
+
+        def respond():
+            offline.simulate_call("openai")
+            return offline.chat_response(offline.chat_content(messages, kwargs.get("response_format")), model)
+        return _call("openai", respond, _offline_retryable)
+
+    client = get_openai_client()
+    if timeout is not None:
+        client = client.with_options(timeout=timeout)
+    return _call(
+        "openai",
+        lambda: client.chat.completions.create(model=model, messages=messages, **kwargs),
+        _openai_retryable, _openai_retry_after,
+    )
+
+def complete_text(prompt, model="gpt-3.5-turbo", **kwargs) -> str:
+    response = chat_completion([{"role": "user", "content": prompt}], model=model, **kwargs)
+    return response.choices[0].message.content
+
+def stream_completion(messages, model="gpt-3.5-turbo", **kwargs):
+    """Yield text deltas. Only opening the stream is retried; latency is recorded up to the first byte."""
+    if is_offline():
+        offline = _offline()
+        _call("openai", lambda: offline.simulate_call("openai"), _offline_retryable)
+        yield from offline.stream_chunks(offline.chat_content(messages))
+        return
+
+    client = get_openai_client()
+    stream = _call(
+        "openai",
+        lambda: client.chat.completions.create(model=model, messages=messages, stream=True, **kwargs),
+        _openai_retryable, _openai_retry_after,
+    )
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        stream.close()
+
+
+class _ProviderCallback(BaseCallbackHandler):
+    """Routes LangChain model calls through the provider limiter and metrics."""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self.on_llm_start(serialized, [], run_id=run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        _throttle(self.provider)
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        start = self._started.pop(run_id, None)
+        if start is not None:
+            _metrics[self.provider].record(time.perf_counter() - start)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        start = self._started.pop(run_id, None)
+        if start is not None:
+            _metrics[self.provider].record(time.perf_counter() - start, error=True)
+
+@lru_cache(maxsize=16)
+def get_chat_model(model="gpt-3.5-turbo", temperature=0, streaming=False):
+    """Shared ChatOpenAI on the pooled client. The SDK's own backoff handles 429s for LangChain calls."""
+    if is_offline():
+        return _offline().OfflineChatModel(model_name=model, callbacks=[_ProviderCallback("openai")])
+
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        streaming=streaming,
+        api_key=_require_openai_key(),
+        http_client=_openai_http_client(),
+        max_retries=MAX_RETRIES,
+        callbacks=[_ProviderCallback("openai")],
+    )
+
+def embedding_backend() -> str:
+    """"openai" (default) or "local" (sentence-transformers on CPU, see utils/local_embeddings.py)."""
+    return str(_secret("embedding_backend") or "openai").lower()
+
+@lru_cache(maxsize=4)
+def get_local_embeddings(model=None, batch_size=None, threads=None):
+    """LocalEmbeddings configured from the [local_embeddings] secrets table; explicit arguments win."""
+    from utils import local_embeddings
+    try:
+        settings = dict(st.secrets.get("local_embeddings", {}))
+    except Exception:
+        settings = {}
+    return local_embeddings.LocalEmbeddings(
+        model=model or settings.get("model", local_embeddings.DEFAULT_LOCAL_MODEL),
+        batch_size=batch_size or settings.get("batch_size", local_embeddings.DEFAULT_BATCH_SIZE),
+        threads=threads or settings.get("threads"),
+    )
+
+class _ProviderEmbeddings(Embeddings):
+    """
+    Routes embedding calls through the provider limiter, backoff and metrics.
+    Embeddings fire no LangChain callbacks, so _ProviderCallback can't do it.
+    """
+
+    def __init__(self, inner, provider="openai"):
+        self.inner = inner
+        self.provider = provider
+        self.model = getattr(inner, "model", None)
+
+    def embed_documents(self, texts):
+        return _call(self.provider, lambda: self.inner.embed_documents(texts), _openai_retryable, _openai_retry_after)
+
+    def embed_query(self, text):
+        return _call(self.provider, lambda: self.inner.embed_query(text), _openai_retryable, _openai_retry_after)
+
+@lru_cache(maxsize=4)
+def get_embeddings(model="text-embedding-ada-002", backend=None):
+    """Shared embeddings: offline stand-in, local sentence-transformers, or rate-limited OpenAI."""
+    if is_offline():
+        return _offline().OfflineEmbeddings()
+    if (backend or embedding_backend()) == "local":
+        return get_local_embeddings()
+
+    from langchain_openai import OpenAIEmbeddings
+    # Retries are handled by _call (with the shared limiter), not by the SDK
+    return _ProviderEmbeddings(OpenAIEmbeddings(
+        model=model, api_key=_require_openai_key(), http_client=_openai_http_client(), max_retries=0
+    ))
+
+# ────────────────────────────────────────────────────────────────
+# Tavily
+# ────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=1)
+def _tavily_session():
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=20)
+    session.mount("https://", adapter)
+    return session
+
+class TavilyHTTPError(Exception):
+    def __init__(self, status_code, body, retry_after=None):
+        super().__init__(f"Tavily HTTP {status_code}: {body[:200]}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+def _tavily_retryable(e):
+    if _offline_retryable(e):
+        return True
+    if isinstance(e, TavilyHTTPError):
+        return e.status_code == 429 or e.status_code >= 500
+    return isinstance(e, (requests.ConnectionError, requests.Timeout))
+
+def search(query, max_results=5, search_depth="basic", **kwargs) -> list:
+    """
+    Tavily web search. Returns a list of result dicts: title, url, content,
+    plus a `snippet` alias of content for existing call sites.
+    """
+    if is_offline():
+        offline = _offline()
+
+        def respond():
+            offline.simulate_call("tavily")
+            return offline.search_results(query, max_results)
+        return _call("tavily", respond, _offline_retryable)
+
+    api_key = tavily_api_key()
+    payload = {"api_key": api_key, "query": query, "max_results": max_results, "search_depth": search_depth, **kwargs}
+
+    def post():
+        response = _tavily_session().post(
+            TAVILY_SEARCH_URL, json=payload, timeout=DEFAULT_TIMEOUT,
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+        if response.status_code != 200:
+            raise TavilyHTTPError(response.status_code, response.text, response.headers.get("retry-after"))
+        return response.json()
+
+    data = _call("tavily", post, _tavily_retryable, lambda e: getattr(e, "retry_after", None))
+    return [{**r, "snippet": r.get("snippet") or r.get("content", "")} for r in data.get("results", [])]
+
+@tool("tavily_search_results_json")
+def search_tool(query: str) -> list:
+    """A search engine optimized for comprehensive, accurate, and trusted results. Useful for answering
+    questions about current events and products. Input should be a search query."""
+    return [{"url": r.get("url"), "content": r.get("content", "")} for r in search(query)]
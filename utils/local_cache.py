@@ -0,0 +1,176 @@
+# utils/local_cache.py
+"""
+Two-tier local cache in front of Supabase lookup tables.
+
+Tier 1 is a process-wide in-memory LRU, shared by every Streamlit session in
+the server process, so warm lookups are dict hits that take microseconds.
+Tier 2 is a SQLite file that survives restarts and is shared across worker
+processes. Entries carry a TTL. An expired entry is still returned as "stale"
+so callers can keep serving it while Supabase is slow or down, and refresh it
+in the background. At most one background refresh per key is in flight, a key
+whose refresh failed is retried after REFRESH_RETRY_AFTER seconds, and keys
+the loader no longer returns (deleted rows) are evicted. invalidate() drops
+one key or a whole namespace (table) from both tiers.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_DB_PATH = os.path.join(".cache", "itrm_cache.sqlite3")
+MEMORY_MAX_ITEMS = 4096
+DEFAULT_TTL = 24 * 3600
+REFRESH_RETRY_AFTER = 60  # seconds; stops a Supabase outage from starting a refresh per lookup
+
+
+class TwoTierCache:
+    def __init__(self, path=CACHE_DB_PATH, max_items=MEMORY_MAX_ITEMS):
+        self.path = path
+        self.max_items = max_items
+        self._memory = OrderedDict()  # (namespace, key) -> (expires_at, value)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._refreshing = set()     # (namespace, key) with a background refresh in flight
+        self._refresh_failed = {}    # (namespace, key) -> time of the last failed refresh
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0}
+
+    # --- SQLite tier ---
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, namespace, key, expires_at, value):
+        self._memory[(namespace, key)] = (expires_at, value)
+        self._memory.move_to_end((namespace, key))
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    # --- Public API ---
+    def get_many(self, namespace, keys, allow_stale=False):
+        """Return (fresh, stale) dicts for `keys`; stale only when allow_stale."""
+        now = time.time()
+        fresh, stale, disk_keys = {}, {}, []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._memory.get((namespace, key))
+                if entry is None:
+                    disk_keys.append(key)
+                    continue
+                self._memory.move_to_end((namespace, key))
+                if entry[0] >= now:
+                    fresh[key] = entry[1]
+                    self.stats["memory_hits"] += 1
+                elif allow_stale:
+                    stale[key] = entry[1]
+                    self.stats["stale_hits"] += 1
+
+            if disk_keys:
+                placeholders = ",".join("?" * len(disk_keys))
+                rows = self._db().execute(
+                    f"SELECT key, value, expires_at FROM cache WHERE namespace = ? AND key IN ({placeholders})",
+                    [namespace, *disk_keys],
+                ).fetchall()
+                for key, raw, expires_at in rows:
+                    value = json.loads(raw)
+                    self._remember(namespace, key, expires_at, value)
+                    if expires_at >= now:
+                        fresh[key] = value
+                        self.stats["disk_hits"] += 1
+                    elif allow_stale:
+                        stale[key] = value
+                        self.stats["stale_hits"] += 1
+
+            self.stats["misses"] += len(set(keys) - set(fresh) - set(stale))
+        return fresh, stale
+
+    def get(self, namespace, key, default=None, allow_stale=False):
+        fresh, stale = self.get_many(namespace, [key], allow_stale=allow_stale)
+        return fresh.get(key, stale.get(key, default))
+
+    def set_many(self, namespace, items: dict, ttl=DEFAULT_TTL):
+        if not items:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            for key, value in items.items():
+                self._remember(namespace, key, expires_at, value)
+            self._db().executemany(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                [(namespace, key, json.dumps(value, default=str), expires_at) for key, value in items.items()],
+            )
+            self._db().commit()
+
+    def set(self, namespace, key, value, ttl=DEFAULT_TTL):
+        self.set_many(namespace, {key: value}, ttl=ttl)
+
+    def invalidate(self, namespace, key=None):
+        """Drop one key, or the whole namespace when key is None, from both tiers."""
+        if key is None:
+            with self._lock:
+                for cached in [k for k in self._memory if k[0] == namespace]:
+                    del self._memory[cached]
+                self._db().execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+                self._db().commit()
+        else:
+            self.invalidate_many(namespace, [key])
+
+    def invalidate_many(self, namespace, keys):
+        keys = list(keys)
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._memory.pop((namespace, key), None)
+            self._db().executemany("DELETE FROM cache WHERE namespace = ? AND key = ?", [(namespace, k) for k in keys])
+            self._db().commit()
+
+    def refresh_in_background(self, namespace, keys, loader, ttl=DEFAULT_TTL):
+        """
+        Reload stale keys with loader(keys) -> {key: value} without blocking the
+        caller. Keys already being refreshed, or whose last refresh failed less
+        than REFRESH_RETRY_AFTER seconds ago, are skipped; keys missing from
+        the loader's result are evicted instead of being served stale forever.
+        """
+        now = time.time()
+        with self._lock:
+            pending = [
+                key for key in dict.fromkeys(keys)
+                if (namespace, key) not in self._refreshing
+                and now - self._refresh_failed.get((namespace, key), 0) >= REFRESH_RETRY_AFTER
+            ]
+            self._refreshing.update((namespace, key) for key in pending)
+        if not pending:
+            return
+
+        def run():
+            try:
+                found = loader(list(pending))
+                self.set_many(namespace, found, ttl=ttl)
+                self.invalidate_many(namespace, [key for key in pending if key not in found])
+                with self._lock:
+                    for key in pending:
+                        self._refresh_failed.pop((namespace, key), None)
+            except Exception as e:
+                with self._lock:
+                    for key in pending:
+                        self._refresh_failed[(namespace, key)] = time.time()
+                print(f"[Cache refresh failed] {namespace}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update((namespace, key) for key in pending)
+        threading.Thread(target=run, daemon=True, name=f"cache-refresh-{namespace}").start()
+
+
+# Process-wide instance shared by all Streamlit sessions
+local_cache = TwoTierCache()
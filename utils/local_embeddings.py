@@ -0,0 +1,65 @@
+# utils/local_embeddings.py
+"""
+Local CPU embedding backend built on sentence-transformers.
+
+The model is loaded lazily on first use and then shared by every session and
+thread in the process. Texts are encoded in batches of `batch_size`. PyTorch
+intra-op threads (`threads`, default: all cores) parallelise each batch on
+the CPU. Vectors are L2-normalised, so FAISS L2 distance ranks the same way
+as cosine similarity.
+
+Select it with `embedding_backend = "local"` in .streamlit/secrets.toml (or
+EMBEDDING_BACKEND=local). Options go in a [local_embeddings] table:
+
+    [local_embeddings]
+    model = "sentence-transformers/all-MiniLM-L6-v2"
+    batch_size = 64
+    threads = 4
+"""
+import threading
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_LOCAL_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_BATCH_SIZE = 64
+
+_models = {}
+_model_lock = threading.Lock()
+
+
+def load_model(model_name: str = DEFAULT_LOCAL_MODEL, device: str = "cpu", threads: Optional[int] = None):
+    """The process-wide SentenceTransformer for (model_name, device), loaded on first call."""
+    with _model_lock:
+        if (model_name, device) not in _models:
+            import torch
+            from sentence_transformers import SentenceTransformer
+
+            if threads:
+                torch.set_num_threads(int(threads))
+            _models[(model_name, device)] = SentenceTransformer(model_name, device=device)
+        return _models[(model_name, device)]
+
+
+class LocalEmbeddings(Embeddings):
+    def __init__(self, model: str = DEFAULT_LOCAL_MODEL, batch_size: int = DEFAULT_BATCH_SIZE,
+                 threads: Optional[int] = None, device: str = "cpu"):
+        self.model = model
+        self.batch_size = int(batch_size)
+        self.threads = threads
+        self.device = device
+
+    def _encode(self, texts: List[str]):
+        if not texts:
+            return []
+        encoder = load_model(self.model, self.device, self.threads)
+        return encoder.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True,
+            convert_to_numpy=True, show_progress_bar=False,
+        ).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0]
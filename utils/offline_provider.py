@@ -0,0 +1,192 @@
+# utils/offline_provider.py
+"""
+Offline stand-in for OpenAI and Tavily, for load tests and no-network CI.
+
+Enable it with `llm_provider = "offline"` in .streamlit/secrets.toml or
+LLM_PROVIDER=offline in the environment. Settings live in the
+[offline_provider] secrets table, or can be set with configure():
+
+    [offline_provider]
+    latency_ms = 400        # mean simulated latency per call
+    jitter_ms = 100         # ± uniform jitter
+    error_rate = 0.05       # fraction of calls that fail with a simulated 429
+    seed = 7
+
+Responses are deterministic for a given input:
+- chat completions return JSON product lists or category→products objects
+  when the prompt asks for JSON, and a short advisory answer otherwise;
+- searches return stable titles, URLs and snippets.
+Only latency and injected errors are random. Calls still go through the
+limiter, backoff and metrics in utils/llm_providers.py, so throughput and
+concurrency behaviour can be measured in isolation.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+SETTINGS = {"latency_ms": 300.0, "jitter_ms": 100.0, "error_rate": 0.0, "seed": 7}
+_rng = random.Random(SETTINGS["seed"])
+_rng_lock = threading.Lock()
+
+VENDORS = [
+    "ServiceNow", "Splunk", "Datadog", "Databricks", "Snowflake", "Okta", "CrowdStrike", "Palo Alto Networks",
+    "Microsoft", "AWS", "Google Cloud", "IBM", "Atlassian", "Dynatrace", "UiPath", "Informatica",
+    "Collibra", "HashiCorp", "Rubrik", "Zscaler", "Tenable", "Workday", "SAP", "Salesforce",
+]
+PRODUCT_SUFFIXES = ["Platform", "Cloud", "Suite", "Enterprise", "Insights", "Automation", "Governance", "Analytics"]
+FEATURES = [
+    "Policy automation", "Role-based access control", "Real-time dashboards", "Audit trails",
+    "Model monitoring", "Workflow orchestration", "Data lineage", "SLA reporting", "API integrations",
+    "Anomaly detection", "Self-service portal", "Cost analytics",
+]
+
+
+class OfflineProviderError(Exception):
+    """Simulated provider failure; status 429 is retried like a real rate limit."""
+
+    def __init__(self, provider, status_code=429):
+        super().__init__(f"Simulated {provider} error (HTTP {status_code})")
+        self.status_code = status_code
+        self.retry_after = None
+
+
+def configure(**settings):
+    """Override SETTINGS (latency_ms, jitter_ms, error_rate, seed) at runtime."""
+    global _rng
+    SETTINGS.update({k: v for k, v in settings.items() if v is not None})
+    with _rng_lock:
+        _rng = random.Random(SETTINGS["seed"])
+
+
+def simulate_call(provider):
+    """Sleep for the configured latency and maybe raise an injected error."""
+    with _rng_lock:
+        jitter = _rng.uniform(-1, 1) * float(SETTINGS["jitter_ms"])
+        fail = _rng.random() < float(SETTINGS["error_rate"])
+    time.sleep(max(0.0, float(SETTINGS["latency_ms"]) + jitter) / 1000)
+    if fail:
+        raise OfflineProviderError(provider)
+
+# ────────────────────────────────────────────────────────────────
+# Deterministic Content
+# ────────────────────────────────────────────────────────────────
+def _seed(text):
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:12], 16)
+
+def products_for(category, n=None):
+    rng = random.Random(_seed(category))
+    vendors = rng.sample(VENDORS, n or rng.randint(3, 5))
+    return [
+        {
+            "name": f"{vendor} {rng.choice(PRODUCT_SUFFIXES)}",
+            "features": rng.sample(FEATURES, 3),
+            "price_estimate": f"${rng.randrange(10, 250) * 1000:,}/yr",
+            "suitability": rng.choice(["High", "Medium", "High", "Low"]),
+        }
+        for vendor in vendors
+    ]
+
+def chat_content(messages, response_format=None) -> str:
+    prompt = "\n".join(str(m.get("content", "")) for m in messages if isinstance(m, dict))
+    if response_format and response_format.get("type") == "json_object":
+        categories = re.findall(r"^### (.+)$", prompt, flags=re.MULTILINE)
+        return json.dumps({category.strip(): products_for(category.strip()) for category in categories})
+
+    single = re.search(r"List 3–5 tools for '(.+?)'", prompt)
+    if single:
+        return json.dumps(products_for(single.group(1)))
+
+    rng = random.Random(_seed(prompt))
+    focus = rng.choice(["cost transparency", "automation", "risk reduction", "vendor consolidation", "governance"])
+    answer = (
+        f"Offline answer: prioritise {focus} first, then measure the impact against your IT spend "
+        f"baseline over the next two quarters."
+    )
+    # ReAct agents (page 15) expect a final-answer marker
+    return f"Thought: I can answer directly.\nFinal Answer: {answer}" if "Thought:" in prompt else answer
+
+def chat_response(content, model):
+    message = SimpleNamespace(role="assistant", content=content, tool_calls=None)
+    return SimpleNamespace(
+        model=f"offline-{model}",
+        choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+    )
+
+def stream_chunks(content):
+    for word in re.findall(r"\S+\s*", content):
+        yield word
+
+def search_results(query, max_results=5):
+    rng = random.Random(_seed(query))
+    results = []
+    for i, product in enumerate(products_for(query, n=min(max_results, len(VENDORS)))):
+        slug = product["name"].lower().replace(" ", "-")
+        snippet = (
+            f"{product['name']} offers {', '.join(product['features']).lower()}. "
+            f"List price from {product['price_estimate']}."
+        )
+        results.append({
+            "title": f"{product['name']} — {query[:60]}",
+            "url": f"https://example.com/{slug}",
+            "content": snippet,
+            "snippet": snippet,
+            "score": round(1 - i * 0.1 - rng.random() * 0.05, 3),
+        })
+    return results
+
+# ────────────────────────────────────────────────────────────────
+# LangChain Stand-ins
+# ────────────────────────────────────────────────────────────────
+class OfflineChatModel(BaseChatModel):
+    """Deterministic chat model; never returns tool calls."""
+    model_name: str = "gpt-3.5-turbo"
+
+    @property
+    def _llm_type(self) -> str:
+        return "offline"
+
+    def _generate(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        simulate_call("openai")
+        content = chat_content([{"content": m.content} for m in messages])
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any):
+        simulate_call("openai")
+        for word in stream_chunks(chat_content([{"content": m.content} for m in messages])):
+            if run_manager:
+                run_manager.on_llm_new_token(word)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+class OfflineEmbeddings(Embeddings):
+    """Deterministic unit vectors from hashed character trigrams."""
+
+    def __init__(self, dim=384):
+        self.dim = dim
+
+    def _embed(self, text):
+        vec = [0.0] * self.dim
+        padded = f"  {text.lower()}  "
+        for i in range(len(padded) - 2):
+            vec[_seed(padded[i:i + 3]) % self.dim] += 1.0
+        norm = sum(v * v for v in vec) ** 0.5 or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
@@ -0,0 +1,89 @@
+# utils/paged_assessment.py
+"""
+Paged assessment mode: one category per page instead of every question in a
+single form.
+
+Only the current category's radios are rendered on each rerun, and answers
+live in a compact per-form state object (one byte per question) rather than in
+one widget key per question. Nothing is returned to the page until "Submit"
+is pressed on the last page, so pages keep their single-submit save logic.
+"""
+import streamlit as st
+
+from utils.scoring import compile_bank
+
+
+class PagedAnswers:
+    """Current page plus a Yes(1)/No(0) byte per question, in bank order."""
+    __slots__ = ("page", "answers", "visited")
+
+    def __init__(self, bank, previous_answers=None):
+        self.page = 0
+        self.answers = bytearray(bank.vectorize(previous_answers or {}).astype("uint8").tobytes())
+        self.visited = {0}
+
+    def to_dict(self, bank):
+        return {key: "Yes" if self.answers[i] else "No" for i, key in enumerate(bank.keys)}
+
+
+def _state(form_key, bank, previous_answers):
+    state_key = f"{form_key}__paged"
+    state = st.session_state.get(state_key)
+    if not isinstance(state, PagedAnswers) or len(state.answers) != len(bank.keys):
+        state = PagedAnswers(bank, previous_answers)
+        st.session_state[state_key] = state
+    return state
+
+
+def reset_paged_assessment(form_key):
+    st.session_state.pop(f"{form_key}__paged", None)
+
+
+def render_paged_assessment(kind, previous_answers=None, form_key="paged_assessment", bank=None):
+    """
+    Render the current category page of the 'ai', 'it' or 'cyber' bank.
+    Returns the full {answer_key: "Yes"/"No"} dict once submitted, else None.
+    """
+    bank = bank or compile_bank(kind)
+    state = _state(form_key, bank, previous_answers)
+    n_pages = len(bank.categories)
+    page = min(state.page, n_pages - 1)
+    category = bank.categories[page]
+
+    st.progress(
+        (page + 1) / n_pages,
+        text=f"Category {page + 1} of {n_pages}: {category} · {len(state.visited)}/{n_pages} pages visited",
+    )
+
+    with st.form(f"{form_key}_page"):
+        st.subheader(category)
+        page_responses = {}
+        current_section = None
+        for idx in bank.category_positions[page]:
+            q = bank.questions[idx]
+            if q["section"] and q["section"] not in (current_section, category):
+                current_section = q["section"]
+                st.write(current_section)
+            page_responses[idx] = st.radio(
+                q["question"], ["Yes", "No"],
+                key=f"{form_key}::{idx}",
+                index=0 if state.answers[idx] else 1,
+            )
+
+        cols = st.columns(3)
+        go_back = cols[0].form_submit_button("⬅️ Previous", disabled=page == 0)
+        go_next = cols[1].form_submit_button("Next ➡️", disabled=page == n_pages - 1)
+        submitted = cols[2].form_submit_button("Submit Assessment", disabled=page != n_pages - 1)
+
+    if not (go_back or go_next or submitted):
+        return None
+
+    for idx, answer in page_responses.items():
+        state.answers[idx] = 1 if answer == "Yes" else 0
+
+    if submitted:
+        return state.to_dict(bank)
+
+    state.page = page - 1 if go_back else page + 1
+    state.visited.add(state.page)
+    st.rerun()
@@ -0,0 +1,131 @@
+# utils/provider_benchmark.py
+"""
+Throughput/concurrency benchmark for the recommendation pipeline against the
+offline provider (no network, no API quota, no Supabase).
+
+    python -m utils.provider_benchmark --sessions 8 --categories 12 --latency-ms 300 --error-rate 0.05
+
+Each simulated session asks for recommendations for every category at the same
+time, the way several consultants opening the results page would. Modes:
+  fanout  one Tavily search + one completion per category (concurrent fan-out)
+  batch   one structured request per session; invalid categories fan out
+Add --coalesce to share identical in-flight calls across sessions (single-flight).
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("LLM_PROVIDER", "offline")
+
+from utils import llm_providers, offline_provider  # noqa: E402
+from utils.question_banks import AI_GROUPED_QUESTIONS, IT_GROUPED_QUESTIONS  # noqa: E402
+from utils.recommendation_engine import (  # noqa: E402
+    MAX_CONCURRENT_RECOMMENDATIONS, fan_out_recommendations, research_recommendation, research_recommendations_batch,
+)
+from utils.single_flight import SingleFlight  # noqa: E402
+
+MODES = ["fanout", "batch"]
+
+
+def _categories(kind, n):
+    base = list((AI_GROUPED_QUESTIONS if kind == "ai" else IT_GROUPED_QUESTIONS).keys())
+    return (base + [f"Synthetic Category {i}" for i in range(max(0, n - len(base)))])[:n]
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+def run_session(kind, categories, mode, flight, max_workers):
+    def generate(category, show_status=False):
+        call = lambda: research_recommendation(kind, category)[0]
+        return flight.do((kind, category), call) if flight else call()
+
+    results = {}
+    if mode == "batch" and len(categories) > 1:
+        try:
+            call = lambda: research_recommendations_batch(kind, categories)
+            results = flight.do(("batch", kind, tuple(categories)), call) if flight else call()
+        except Exception:
+            results = {}
+    misses = [c for c in categories if c not in results]
+    for category, result in fan_out_recommendations(generate, misses, max_workers=max_workers):
+        results[category] = result
+    return results
+
+
+def run_mode(kind, categories, mode, sessions, coalesce, max_workers):
+    llm_providers.reset_metrics()
+    flight = SingleFlight() if coalesce else None
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def session():
+        start = time.perf_counter()
+        results = run_session(kind, categories, mode, flight, max_workers)
+        with lock:
+            latencies.append(time.perf_counter() - start)
+            errors.append(sum(1 for r in results.values() if r.get("error")))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    metrics = llm_providers.provider_metrics()
+    return {
+        "mode": mode + (" +coalesce" if coalesce else ""),
+        "wall_s": round(wall, 2),
+        "recs_per_s": round(sessions * len(categories) / wall, 1),
+        "session_p50_s": round(_percentile(latencies, 0.5), 2),
+        "session_p95_s": round(_percentile(latencies, 0.95), 2),
+        "failed_recs": sum(errors),
+        "openai_calls": metrics["openai"]["calls"],
+        "tavily_calls": metrics["tavily"]["calls"],
+        "retries": metrics["openai"]["retries"] + metrics["tavily"]["retries"],
+        "saved_calls": flight.stats["saved_calls"] if flight else 0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the recommendation pipeline on the offline provider.")
+    parser.add_argument("--kind", choices=["ai", "it"], default="ai")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent simulated sessions")
+    parser.add_argument("--categories", type=int, default=8, help="Categories per session")
+    parser.add_argument("--mode", choices=MODES + ["all"], default="all")
+    parser.add_argument("--coalesce", action="store_true", help="Share identical in-flight calls across sessions")
+    parser.add_argument("--workers", type=int, default=MAX_CONCURRENT_RECOMMENDATIONS, help="Fan-out threads per session")
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls failing with a simulated 429")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--openai-rps", type=float, default=None, help="Override the OpenAI token bucket rate")
+    parser.add_argument("--tavily-rps", type=float, default=None, help="Override the Tavily token bucket rate")
+    args = parser.parse_args(argv)
+
+    offline_provider.configure(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=args.seed)
+    for provider, rps in (("openai", args.openai_rps), ("tavily", args.tavily_rps)):
+        if rps:
+            llm_providers.set_rate_limit(provider, rps, max(1, int(rps)))
+
+    categories = _categories(args.kind, args.categories)
+    modes = MODES if args.mode == "all" else [args.mode]
+    rows = [run_mode(args.kind, categories, m, args.sessions, args.coalesce, args.workers) for m in modes]
+
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in columns))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
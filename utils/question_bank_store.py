@@ -0,0 +1,171 @@
+# utils/question_bank_store.py
+"""
+Versioned, persisted question banks.
+
+Every edit publishes a new immutable version. Versions live as JSON files under
+question_banks/<kind>/v<N>.json or as rows in the Supabase
+"question_bank_versions" table. Questions carry stable IDs, so saved answers
+can be migrated from any version to any other. Compiled banks (key index plus
+scoring matrices) are cached per (backend, kind, version), so all sessions in
+the process share one copy. The version list (and so the latest version) is
+cached for LATEST_VERSION_TTL seconds, so page reruns don't list versions
+every time.
+"""
+import hashlib
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
+
+from utils.question_banks import ai_answer_key, cyber_answer_key, it_answer_key, iter_bank
+from utils.scoring import CompiledBank
+
+QUESTION_BANK_DIR = "question_banks"
+SUPABASE_TABLE = "question_bank_versions"
+LATEST_VERSION_TTL = 60  # seconds; publishes from this process are visible immediately
+
+_version_lists = {}  # (kind, backend) -> (versions, fetched at)
+
+_KEY_FUNCS = {
+    "ai": lambda q: ai_answer_key(q["category"], q["question"]),
+    "it": lambda q: it_answer_key(q["category"], q["question"]),
+    "cyber": lambda q: cyber_answer_key(q["category"], q["section"], q["question"]),
+}
+
+# ────────────────────────────────────────────────────────────────
+# Question IDs
+# ────────────────────────────────────────────────────────────────
+def seed_question_id(key: str) -> str:
+    """IDs for the built-in questions are derived from their original answer key."""
+    return "q_" + hashlib.md5(key.encode()).hexdigest()[:10]
+
+def new_question_id() -> str:
+    return "q_" + uuid.uuid4().hex[:10]
+
+def seed_questions(kind: str) -> list:
+    return [
+        {"id": seed_question_id(q["key"]), "category": q["category"], "section": q["section"], "question": q["question"]}
+        for q in iter_bank(kind)
+    ]
+
+# ────────────────────────────────────────────────────────────────
+# Storage Backends
+# ────────────────────────────────────────────────────────────────
+def _local_path(kind, version):
+    return os.path.join(QUESTION_BANK_DIR, kind, f"v{version}.json")
+
+def _local_versions(kind):
+    folder = os.path.join(QUESTION_BANK_DIR, kind)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(
+        int(name[1:-5]) for name in os.listdir(folder)
+        if name.startswith("v") and name.endswith(".json") and name[1:-5].isdigit()
+    )
+
+def list_versions(kind: str, backend: str = "local") -> list:
+    """Version numbers in ascending order; version 0 is the built-in bank."""
+    if backend == "supabase":
+        from utils.supabase_client import supabase
+        response = supabase.table(SUPABASE_TABLE).select("version").eq("kind", kind).order("version").execute()
+        stored = [row["version"] for row in response.data or []]
+    else:
+        stored = _local_versions(kind)
+    return [0] + stored
+
+def latest_version(kind: str, backend: str = "local") -> int:
+    return list_versions(kind, backend)[-1]
+
+def cached_versions(kind: str, backend: str = "local") -> list:
+    """list_versions(), re-read at most every LATEST_VERSION_TTL seconds; for page reruns."""
+    cached = _version_lists.get((kind, backend))
+    if cached is None or time.monotonic() - cached[1] > LATEST_VERSION_TTL:
+        cached = (list_versions(kind, backend), time.monotonic())
+        _version_lists[(kind, backend)] = cached
+    return list(cached[0])
+
+def load_version(kind: str, version: int, backend: str = "local") -> dict:
+    if version == 0:
+        return {"kind": kind, "version": 0, "note": "Built-in question bank", "questions": seed_questions(kind)}
+
+    if backend == "supabase":
+        from utils.supabase_client import supabase
+        response = (
+            supabase.table(SUPABASE_TABLE)
+            .select("kind, version, note, created_at, questions")
+            .eq("kind", kind).eq("version", version)
+            .execute()
+        )
+        if not response.data:
+            raise KeyError(f"Question bank {kind} v{version} not found")
+        return response.data[0]
+
+    with open(_local_path(kind, version), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def publish_version(kind: str, questions: list, note: str = "", backend: str = "local") -> int:
+    """Store `questions` as the next version and return its number. Versions are never overwritten."""
+    version = latest_version(kind, backend) + 1
+    doc = {
+        "kind": kind,
+        "note": note,
+        "created_at": datetime.utcnow().isoformat(),
+        "questions": [
+            {
+                "id": q.get("id") or new_question_id(),
+                "category": q["category"].strip(),
+                "section": (q.get("section") or "").strip(),
+                "question": q["question"].strip(),
+            }
+            for q in questions
+        ],
+    }
+
+    if backend == "supabase":
+        from utils.supabase_client import supabase
+        supabase.table(SUPABASE_TABLE).insert({**doc, "version": version}).execute()
+    else:
+        os.makedirs(os.path.join(QUESTION_BANK_DIR, kind), exist_ok=True)
+        while True:
+            try:
+                # "x" fails if a concurrent publish already took this number; take the next one
+                with open(_local_path(kind, version), "x", encoding="utf-8") as f:
+                    json.dump({**doc, "version": version}, f, indent=2)
+                break
+            except FileExistsError:
+                version += 1
+    _version_lists.pop((kind, backend), None)  # re-read on next use; other processes may have published too
+    return version
+
+# ────────────────────────────────────────────────────────────────
+# Compiled, Cached Banks
+# ────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=64)
+def get_bank(kind: str, version: int, backend: str = "local") -> CompiledBank:
+    """Compile a stored version once per process; versions are immutable, so no invalidation is needed."""
+    doc = load_version(kind, version, backend)
+    to_key = _KEY_FUNCS[kind]
+    questions = [{**q, "key": to_key(q)} for q in doc["questions"]]
+    if kind == "it":
+        # IT categories are maturity levels (see iter_bank)
+        questions = [{**q, "section": q["section"] or q["category"]} for q in questions]
+    return CompiledBank(kind, questions, version=version)
+
+def get_latest_bank(kind: str, backend: str = "local") -> CompiledBank:
+    return get_bank(kind, cached_versions(kind, backend)[-1], backend)
+
+def migrate_answers(answers: dict, from_bank: CompiledBank, to_bank: CompiledBank) -> dict:
+    """Re-key answers by stable question ID; answers to removed questions are dropped."""
+    if from_bank is to_bank:
+        return dict(answers or {})
+    migrated = {}
+    from_ids = {pos: qid for qid, pos in from_bank.id_index.items()}
+    for key, value in (answers or {}).items():
+        pos = from_bank.key_index.get(key)
+        qid = from_ids.get(pos) if pos is not None else None
+        new_pos = to_bank.id_index.get(qid) if qid else to_bank.key_index.get(key)
+        if new_pos is not None:
+            migrated[to_bank.keys[new_pos]] = value
+    return migrated
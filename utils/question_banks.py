@@ -0,0 +1,483 @@
+# utils/question_banks.py
+"""
+Assessment question banks shared by the Streamlit pages and headless tools.
+
+Answer keys match exactly what each page stores in session state and saves to
+Supabase, so answers from the forms, saved projects and offline files line up.
+"""
+import hashlib
+
+# ────────────────────────────────────────────────────────────────
+# AI Maturity (pages/6_AI_Assessment.py)
+# ────────────────────────────────────────────────────────────────
+AI_GROUPED_QUESTIONS = {
+    "Infrastructure and Technology": [
+        "Do you have a robust data storage solution that can handle large volumes of data?",
+        "Is your network infrastructure capable of supporting high-speed data transfer?",
+        "Do you have cloud services integrated into your technology stack?",
+        "Are you utilizing modern programming languages and frameworks suitable for AI development?",
+        "Do you have secure systems in place to protect sensitive data from cyber threats?",
+        "Is there a dedicated platform for AI experimentation and deployment available within your organization?",
+        "Are your hardware resources (like GPUs) sufficient for AI processing needs?",
+        "Do you monitor and manage compute resource utilization for AI workloads?",
+        "Are edge devices or IoT integrations part of your AI architecture?",
+        "Do you have observability tools in place to monitor AI system performance and availability in real time?"
+    ],
+    "Data Management and Quality": [
+        "Do you have a centralized data repository for easy access to data across departments?",
+        "Is your data regularly cleaned and updated to ensure accuracy?",
+        "Do you have established protocols for data governance and compliance?",
+        "Is your organization collecting data relevant to your AI use cases?",
+        "Are there processes in place to assess and improve data quality continuously?",
+        "Is there an existing strategy for data privacy that aligns with legal standards?",
+        "Do you have historical data available for training AI models?",
+        "Is metadata consistently captured and maintained across datasets?",
+        "Do you use data catalogs or data lineage tools?",
+        "Are data access controls in place to ensure only authorized personnel can retrieve or manipulate critical datasets?"
+    ],
+    "Talent and Skills": [
+        "Do you have employees with expertise in data science or machine learning?",
+        "Is there a training program in place to upskill staff in AI and related technologies?",
+        "Are interdisciplinary teams formed to collaborate on AI projects?",
+        "Is there a clear understanding of AI concepts and terminology among your leadership team?",
+        "Do you have access to external AI consultants or partnerships?",
+        "Is there a culture of innovation that encourages risk-taking and experimentation?",
+        "Are you actively recruiting for AI-related positions?",
+        "Do you have product managers or business analysts involved in AI use case definition?",
+        "Do project teams have access to MLOps or model deployment skills?",
+        "Do you have a succession or continuity plan for key AI/ML personnel or roles?"
+    ],
+    "Strategy and Vision": [
+        "Do you have a clear AI strategy that aligns with your business goals?",
+        "Is there a dedicated budget allocated for AI projects?",
+        "Are there measurable KPIs established to track the success of AI initiatives?",
+        "Do you have a roadmap for AI implementation over the next 1–3 years?",
+        "Are you regularly revisiting and updating your AI strategy based on industry trends?",
+        "Is there commitment from executive leadership to support AI initiatives?",
+        "Are AI projects prioritized based on their potential business impact?",
+        "Is AI considered a core enabler in your digital transformation agenda?",
+        "Do you conduct regular reviews of AI use cases to ensure alignment with ROI?",
+        "Have business units been engaged in identifying and prioritizing AI use cases that address real operational pain points?"
+    ],
+    "Ethics and Governance": [
+        "Do you have an ethical framework guiding your AI initiatives?",
+        "Is there a process for assessing the potential biases in your AI models?",
+        "Are you transparent with stakeholders about how AI is used in your organization?",
+        "Do you have mechanisms in place to address public concerns about AI?",
+        "Have you established guidelines for responsible AI use?",
+        "Is there a designated team responsible for monitoring AI compliance and ethics?",
+        "Are stakeholders involved in discussions about the ethical implications of AI applications?",
+        "Is there a protocol for handling model failures or unintended AI behavior?",
+        "Do you track AI model performance post-deployment for fairness and drift?",
+        "Is there a clear audit trail or documentation process for how AI decisions are made in critical applications?"
+    ]
+}
+
+# ────────────────────────────────────────────────────────────────
+# IT Maturity (pages/7_IT_Assessment.py)
+# ────────────────────────────────────────────────────────────────
+IT_GROUPED_QUESTIONS = {
+    "Survival / Legacy / Ad-Hoc": [
+        "Infrastructure is manually provisioned with minimal automation.",
+        "Separate physical servers and storage are used for each workload.",
+        "Backups exist but are manual and inconsistently tested.",
+        "No formal incident response process or security oversight.",
+        "Monitoring is siloed or reactive only."
+    ],
+    "Standardized / Service-Aligned": [
+        "Standard operating environments (SOEs) exist for OS, middleware, and database.",
+        "IT service management (ITSM) processes are documented and partially adopted.",
+        "SLAs and RTO/RPOs are defined for key applications.",
+        "Service request and incident tracking is centralized (e.g. via ITSM tool).",
+        "Network architecture is documented and maintained to reference standards."
+    ],
+    "Virtualized / Cloud-Ready": [
+        "Most workloads are virtualized or containerized.",
+        "Cloud usage (public/private) is governed via policy.",
+        "Infrastructure is provisioned through templates or IaC (e.g., Terraform, CloudFormation).",
+        "Role-based access controls are centrally managed.",
+        "Security patches and updates are deployed on a defined schedule."
+    ],
+    "Automated / Observability-Driven": [
+        "Infrastructure provisioning and app deployment are fully automated via CI/CD.",
+        "Centralized observability is in place (e.g., logs, metrics, traces).",
+        "Configuration drift is automatically detected and remediated.",
+        "Automated testing is included in deployment pipelines.",
+        "Automated scaling and self-healing systems are in use."
+    ],
+    "Business-Aligned / Self-Service": [
+        "Business KPIs are directly tied to IT service metrics and dashboards.",
+        "Users can self-provision services from a defined catalog.",
+        "Cost allocation is activity-based or tagged per service/user/project.",
+        "Cross-functional teams collaborate on IT planning and forecasting.",
+        "IT investment decisions are driven by business value and outcome modeling."
+    ],
+    "Innovative / Predictive / Autonomous": [
+        "AI/ML is used for predictive capacity planning or anomaly detection.",
+        "Security is integrated into CI/CD pipelines (DevSecOps).",
+        "Cloud cost optimization is automated with policy-based actions.",
+        "Disaster recovery and failover are tested regularly and auto-validated.",
+        "Digital twin or simulation models are used for infrastructure planning."
+    ]
+}
+
+# ────────────────────────────────────────────────────────────────
+# Cybersecurity Maturity (pages/9_Cybersecurity_Assessment.py)
+# ────────────────────────────────────────────────────────────────
+CYBER_QUESTIONNAIRE = [
+    {
+        "category": "Identity",
+        "section": "Survival",
+        "questions": [
+            "Does your organization maintain an inventory of all authorized and unauthorized devices connected to your network?",
+            "Do you have an inventory of all authorized and unauthorized software within your organization?",
+            "Have you established an asset management process that tracks the lifecycle of devices and software?",
+            "Does your organization have a documented policy for identity and access management?"
+        ]
+    },
+    {
+        "category": "Identity",
+        "section": "Awareness",
+        "questions": [
+            "Have you implemented multi-factor authentication (MFA) for accessing sensitive systems and data?",
+            "Is there a process in place to grant and revoke user access based on job roles and responsibilities?",
+            "Do you regularly review and update user access permissions and privileges?",
+            "Have you implemented strong password policies, including password complexity and expiration rules?"
+        ]
+    },
+    {
+        "category": "Identity",
+        "section": "Committed",
+        "questions": [
+            "Is there a process for promptly deactivating accounts for employees who leave your organization?",
+            "Do you use automated account provisioning and deprovisioning for user accounts?",
+            "Have you implemented secure methods for user authentication and authorization?",
+            "Does your organization enforce the principle of least privilege (users have the minimum access required to perform their duties)?"
+        ]
+    },
+    {
+        "category": "Identity",
+        "section": "Service Aligned",
+        "questions": [
+            "Is there a process for reviewing and addressing accounts with excessive privileges?",
+            "Do you maintain logs of user access and authorization activities?",
+            "Is there a process for monitoring and detecting suspicious or unauthorized access attempts?",
+            "Have you implemented encryption for sensitive data at rest and in transit?"
+        ]
+    },
+    {
+        "category": "Identity",
+        "section": "Innovation Optimized",
+        "questions": [
+            "Does your organization conduct security awareness training for employees?",
+            "Have you established an incident response plan that includes identity and access management considerations?",
+            "Is there a process for regular auditing and testing of identity and access controls?",
+            "Does your organization regularly assess the effectiveness of your identity and access management program and make improvements as needed?"
+         ]
+    },
+    {
+        "category": "Protect",
+        "section": "Survival",
+        "questions": [
+            "Do you have a documented information security policy",
+            "Is there a process for classifying data ancd information assets based on sensitivity?",
+            "Have you implemented access control measures to restrict unauthorized access to sensitive data?",
+            "Do you regularly update and patch your software and systems to address known vulnerabilities?"
+        ]
+    },
+    {
+        "category": "Protect",
+        "section": "Awareness",
+        "questions": [
+            "Is there an established process for secure software development and code review?",
+            "Have you implemented network segmentation to isolate critical systems and data from less secure areas?",
+            "Is there an intrusion detection system (IDS) in place to monitor for suspicious network activities?",
+            "Have you implemented firewalls to control inbound and outbound network traffic?"
+        ]
+    },
+    {
+        "category": "Protect",
+        "section": "Committed",
+        "questions": [
+            "Is there a process for monitoring and responding to cybersecurity threats and incidents?",
+            "Do you use encryption to protect sensitive data in transit and at rest?",
+            "Have you implemented endpoint protection solutions (e.g., antivirus, anti-malware) on all devices?",
+            "Is there a documented incident response plan that includes communication and coordination with stakeholders?"
+        ]
+    },
+    {
+        "category": "Protect",
+        "section": "Service Aligned",
+        "questions": [
+            "Have you established secure configurations for your hardware and software?",
+            "Do you conduct regular security awareness training for employees?",
+            "Is there a process for managing and securing removable media (e.g., USB drives)?",
+            "Have you implemented secure email and web browsing practices and technologies?"
+        ]
+    },
+    {
+        "category": "Protect",
+        "section": "Innovation Optimized",
+        "questions": [
+            "Is there a data backup and recovery plan in place, and are backups regularly tested?",
+            "Do you have a secure mobile device management (MDM) solution for company-owned and BYOD devices?",
+            "Is there a process for securely disposing of hardware and media containing sensitive data?",
+            "Have you established secure supply chain practices to verify the security of third-party products and services?"
+        ]
+    },
+    {
+        "category": "Detect",
+        "section": "Survival",
+        "questions": [
+            "Do you have a dedicated team responsible for monitoring and detecting cybersecurity threats?",
+            "Is there a process in place to continuously monitor network traffic for unusual or suspicious activities?",
+            "Have you implemented intrusion detection systems (IDS) and intrusion prevention systems (IPS)?",
+            "Is there a process for monitoring system and application logs for security events?"
+        ]
+    },
+    {
+        "category": "Detect",
+        "section": "Awareness",
+        "questions": [
+            "Do you regularly review and analyze security logs to detect potential threats?",
+            "Is there a documented incident detection and reporting process in your organization?",
+            "Have you implemented security information and event management (SIEM) solutions for centralized log and event analysis?",
+            "Is there a process for threat intelligence collection and analysis to stay informed about emerging threats?"
+        ]
+    },
+    {
+        "category": "Detect",
+        "section": "Committed",
+        "questions": [
+            "Do you use vulnerability scanning tools to identify weaknesses in your systems and applications?",
+            "Have you implemented file integrity monitoring (FIM) to detect unauthorized changes to critical files?",
+            "Is there a process for monitoring and detecting anomalies in user account activities and access?",
+            "Do you use behavioral analytics to detect abnormal user behavior that may indicate a security threat?"
+        ]
+    },
+    {
+        "category": "Detect",
+        "section": "Service Aligned",
+        "questions": [
+            "Is there a process for monitoring email traffic for phishing attempts and malicious attachments?",
+            "Have you implemented endpoint detection and response (EDR) solutions on your devices?",
+            "Is there a process for identifying and responding to unauthorized or rogue devices on your network?",
+            "Do you use threat hunting techniques to proactively search for hidden threats within your network?"
+        ]
+    },
+    {
+        "category": "Detect",
+        "section": "Innovation Optimized",
+        "questions": [
+            "Is there a process for correlating and prioritizing security alerts based on risk?",
+            "Do you conduct regular tabletop exercises to test your incident detection and response capabilities?",
+            "Have you established key performance indicators (KPIs) to measure the effectiveness of your detection capabilities?",
+            "Is there a documented process for communicating and coordinating incident detection and response with external stakeholders, such as law enforcement or industry groups?"
+        ]
+    },
+    {
+        "category": "Respond",
+        "section": "Survival",
+        "questions": [
+            "Do you have an incident response plan place?",
+            "Is there a dedicated incident response team ora clearly defined incident response role within your organization?",
+            "Have you established an incident notification process to report and escalate security incidents?",
+            "Is there a process for classifying and prioritizing incidents based on severity?"
+        ]
+    },
+    {
+        "category": "Respond",
+        "section": "Awareness",
+        "questions": [
+            "Do you have predefined communication procedures for internal and external stakeholders during an incident?",
+            "Have you identified and established contact information for key incident response contacts, both internal and external?",
+            "Is there a documented procedure for preserving evidence and maintaining chain of custody during an incident?",
+            "Do you regularly conduct tabletop exercises and simulations to test your incident response plan?"
+        ]
+    },
+    {
+        "category": "Respond",
+        "section": "Committed",
+        "questions": [
+            "Is there a process for isolating and containing affected systems or networks during an incident?",
+            "Have you established a procedure for collecting and analyzing forensic evidence to determine the scope and impact of an incident?",
+            "Is there a process for documenting incident details, actions taken, and lessons learned?",
+            "Have you identified and documented legal and regulatory reporting requirements in case of a data breach or incident?"
+        ]
+    },
+    {
+        "category": "Respond",
+        "section": "Service Aligned",
+        "questions": [
+            "Is there a process for notifying affected individuals or organizations in compliance with data breach notification laws?",
+            "Do you have predefined incident response playbooks for common incident types?",
+            "Is there a process for coordinating incident response activities with external organizations, such as law enforcement or industry peers?",
+            "Have you established a post-incident review process to assess the effectiveness of your response and identify areas for improvement?"
+        ]
+    },
+    {
+        "category": "Respond",
+        "section": "Innovation Optimized",
+        "questions": [
+            "Is there a documented process for providing executive management and relevant stakeholders with incident status updates?",
+            "Do you maintain a record of past incidents and the actions taken to resolve them?",
+            "Is there a process for conducting a root cause analysis of incidents to prevent future occurrences?",
+            "Have you established key performance indicators (KPIs) and metrics to measure the effectiveness of your incident response capabilities?"
+        ]
+    },
+    {
+        "category": "Recover",
+        "section": "Survival",
+        "questions": [
+            "Do you have a documented business continuity and disaster recovery (BC/DR) plan in place?",
+            "Is there a dedicated BC/DR team or a clearly defined BC/DR role within your organization?",
+            "Have you identified critical business processes and assets that need to be prioritized for recovery?",
+            "Is there a process for regularly backing up critical data and systems?"
+        ]
+    },
+    {
+        "category": "Recover",
+        "section": "Awareness",
+        "questions": [
+            "Have you established recovery time objectives (RTOs) and recovery point objectives (RPOs) for key systems and data?",
+            "Is there a process for testing and validating backups to ensure they can be restored successfully?",
+            "Do you have off-site or remote data backups to protect against physical disasters?",
+            "Is there a documented procedure for restoring critical systems and data in a timely manner?"
+        ]
+    },
+    {
+        "category": "Recover",
+        "section": "Committed",
+        "questions": [
+            "Have you identified and documented alternative IT infrastructure and facilities for use during recovery?",
+            "Is there a process for notifying employees and stakeholders about recovery procedures and expectations?",
+            "Do you conduct regular disaster recovery exercises to test your BC/DR plan?",
+            "Is there a documented process for re-establishing network connectivity and access after an incident?"
+        ]
+    },
+    {
+        "category": "Recover",
+        "section": "Service Aligned",
+        "questions": [
+            "Have you established a process for restoring user access and privileges in a secure manner?",
+            "Is there a procedure for conducting a post-incident assessment to identify areas for recovery process improvement?",
+            "Do you have a plan for ensuring that employees can work remotely if needed during a disruption?",
+            "Is there a process for coordinating recovery efforts with third-party service providers and suppliers?"
+        ]
+    },
+    {
+        "category": "Recover",
+        "section": "Innovation Optimized",
+        "questions": [
+            "Have you identified and documented legal and regulatory reporting requirements related to recovery?",
+            "Is there a process for communicating recovery progress and status updates to internal and external stakeholders?",
+            "Do you maintain a record of past recovery efforts and lessons learned from incidents?",
+            "Have you established key performance indicators (KPIs) and metrics to measure the effectiveness of your recovery capabilities?"
+        ]
+    },
+    {
+        "category": "CIS Controls",
+        "section": "Survival",
+        "questions": [
+            "Have you established and documented an inventory of authorized and unauthorized devices on your network?",
+            "Is there a process in place to actively manage and control the use of administrative privileges?",
+            "Do you regularly review and update software and systems to address known vulnerabilities?",
+            "Have you implemented secure configurations for hardware and software used within your organization?"
+        ]
+    },
+    {
+        "category": "CIS Controls",
+        "section": "Awareness",
+        "questions": [
+            "Is there a process for continuous vulnerability assessment and remediation?",
+            "Do you restrict and monitor the use of PowerShell, command-line tools, and other scripting languages?",
+            "Have you implemented a process for the secure handling of account credentials, such as passwords and keys?",
+            "Is there a documented process for data protection, including encryption, data classification, and data loss prevention?"
+        ]
+    },
+    {
+        "category": "CIS Controls",
+        "section": "Committed",
+        "questions": [
+            "Do you actively monitor and analyze network traffic for signs of malicious activities?",
+            "Have you established an incident response plan that includes roles, responsibilities, and communication procedures?",
+            "Is there a process for logging and retaining security events and data for analysis?",
+            "Do you regularly conduct security awareness training for employees and contractors?"
+        ]
+    },
+    {
+        "category": "CIS Controls",
+        "section": "Service Aligned",
+        "questions": [
+            "Have you implemented secure email and web browsing practices and technologies?",
+            "Is there a process for securely configuring and managing mobile devices used in your organization?",
+            "Do you have a data backup and recovery plan that includes regular testing of backups?",
+            "Is there a documented process for securely disposing of hardware and media containing sensitive data?"
+        ]
+    },
+    {
+        "category": "CIS Controls",
+        "section": "Innovation Optimized",
+        "questions": [
+            "Have you established a secure software development lifecycle (SDLC) process?",
+            "Is there a process for securely configuring and monitoring cloud resources?",
+            "Do you have a process for managing third-party security risks and ensuring secure supply chain practices?",
+            "Is there a documented process for regular security assessments and audits?"
+        ]
+    },
+]
+
+CYBER_CATEGORIES = ["CIS Controls", "Detect", "Identity", "Protect", "Recover", "Respond"]
+CYBER_SECTIONS = ["Survival", "Awareness", "Committed", "Service Aligned", "Innovation Optimized"]
+
+# Session-state key each page stores its answers under
+ANSWER_SESSION_KEYS = {
+    "ai": "ai_maturity_answers",
+    "it": "it_maturity_answers",
+    "cyber": "cybersecurity_answers",
+}
+
+# Session-state / saved session_data key holding the question bank version the
+# answers were given against (only the IT bank is versioned, see question_bank_store.py)
+BANK_VERSION_SESSION_KEYS = {
+    "it": "it_question_bank_version",
+}
+
+# ────────────────────────────────────────────────────────────────
+# Answer Keys
+# ────────────────────────────────────────────────────────────────
+def ai_answer_key(category: str, question: str) -> str:
+    return f"{category}::{question}"
+
+def it_answer_key(category: str, question: str) -> str:
+    return f"{category.strip()}::{question.strip()}"
+
+def cyber_answer_key(category: str, section: str, question: str) -> str:
+    hashed_q = hashlib.md5(question.encode()).hexdigest()[:8]
+    return f"{category}_{section}_{hashed_q}"
+
+def iter_bank(kind: str):
+    """
+    Yield every question of the 'ai', 'it' or 'cyber' bank in page order as
+    dicts with key, category, section and question. IT categories are maturity
+    levels, so their section is the category itself; AI questions have no section.
+    """
+    if kind == "ai":
+        for category, questions in AI_GROUPED_QUESTIONS.items():
+            for q in questions:
+                yield {"key": ai_answer_key(category, q), "category": category, "section": "", "question": q}
+    elif kind == "it":
+        for category, questions in IT_GROUPED_QUESTIONS.items():
+            for q in questions:
+                yield {"key": it_answer_key(category, q), "category": category.strip(), "section": category.strip(), "question": q.strip()}
+    elif kind == "cyber":
+        for block in sorted(CYBER_QUESTIONNAIRE, key=lambda x: x["category"]):
+            for q in block["questions"]:
+                yield {
+                    "key": cyber_answer_key(block["category"], block["section"], q),
+                    "category": block["category"],
+                    "section": block["section"],
+                    "question": q,
+                }
+    else:
+        raise ValueError(f"Unknown assessment type: {kind}")
@@ -0,0 +1,154 @@
+# utils/recommendation_engine.py
+"""
+The provider-bound half of the recommendation pipeline: Tavily research, the
+OpenAI product prompts (per category or batched), response validation and the
+concurrent fan-out. It has no Supabase or Streamlit-session dependency, so it
+can run headless against the offline provider (see utils/provider_benchmark.py).
+Caching and persistence are layered on top in utils/ai_assist.py.
+"""
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils.llm_providers import chat_completion, search
+
+MAX_CONCURRENT_RECOMMENDATIONS = 4
+RECOMMENDATION_TIMEOUT = 45  # seconds per category, measured from when its call starts
+BATCH_CONTEXT_CHARS = 1200  # Tavily context kept per category in the combined prompt
+
+PRODUCT_SCHEMA = "{\"name\": \"\", \"features\": [\"\"], \"price_estimate\": \"\", \"suitability\": \"\"}"
+
+RECOMMENDATION_SPECS = {
+    "ai": {
+        "label": "AI maturity",
+        "query": "Top enterprise tools or platforms for improving {category} AI maturity",
+        "context_intro": "Based on this content",
+        "recommendation": "These tools are well-suited for improving **{category}** maturity. "
+                          "Focus on high-suitability tools first.",
+    },
+    "it": {
+        "label": "IT maturity",
+        "query": "Top enterprise platforms or services for improving '{category}' IT maturity",
+        "context_intro": "Based on this research",
+        "recommendation": "These tools help improve **{category}** maturity. "
+                          "Focus on the ones with high suitability first.",
+    },
+}
+
+# ────────────────────────────────────────────────────────────────
+# Research & Prompts
+# ────────────────────────────────────────────────────────────────
+def search_context(query: str, max_chars=None) -> str:
+    results = search(query, max_results=5)
+    combined = " ".join([
+        f"{r.get('title', '')} — {r.get('snippet', '')}" for r in results if isinstance(r, dict) and r.get("snippet")
+    ])
+    return combined[:max_chars] if max_chars else combined
+
+def valid_products(products) -> bool:
+    return (
+        isinstance(products, list) and len(products) > 0
+        and all(isinstance(p, dict) and str(p.get("name", "")).strip() for p in products)
+    )
+
+def research_recommendation(kind: str, category: str):
+    """One Tavily search and one completion for a category → (result, raw_model_output). Raises on failure."""
+    spec = RECOMMENDATION_SPECS[kind]
+    combined = search_context(spec["query"].format(category=category))
+    prompt = (
+        f"{spec['context_intro']}:\n{combined}\n\n"
+        f"List 3–5 tools for '{category}' in {spec['label']}. Format as JSON:\n"
+        f"[{PRODUCT_SCHEMA}]"
+    )
+    response = chat_completion(
+        [{"role": "user", "content": prompt}],
+        model="gpt-3.5-turbo",
+        temperature=0.3,
+        timeout=RECOMMENDATION_TIMEOUT,
+    )
+    content = response.choices[0].message.content
+    parsed = json.loads(content)
+    return {"recommendation": spec["recommendation"].format(category=category), "products": parsed}, content
+
+def research_recommendations_batch(kind: str, categories) -> dict:
+    """
+    Research all categories concurrently, then send one structured-output
+    request. Returns {category: result} for categories whose part of the
+    response validates.
+    """
+    spec = RECOMMENDATION_SPECS[kind]
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_RECOMMENDATIONS, thread_name_prefix="tavily") as pool:
+        contexts = dict(zip(categories, pool.map(
+            lambda c: search_context(spec["query"].format(category=c), BATCH_CONTEXT_CHARS), categories)))
+
+    research = "\n\n".join(f"### {category}\n{contexts[category]}" for category in categories)
+    prompt = (
+        f"Based on this research, grouped by category:\n{research}\n\n"
+        f"For each category, list 3–5 tools for improving it in {spec['label']}. "
+        "Respond with one JSON object whose keys are the category names exactly as given above:\n"
+        f"{{\"<category>\": [{PRODUCT_SCHEMA}]}}"
+    )
+    response = chat_completion(
+        [{"role": "user", "content": prompt}],
+        model="gpt-3.5-turbo",
+        temperature=0.3,
+        response_format={"type": "json_object"},
+        timeout=RECOMMENDATION_TIMEOUT,
+    )
+    parsed = json.loads(response.choices[0].message.content)
+    if not isinstance(parsed, dict):
+        return {}
+
+    # Validate each category on its own; invalid or missing ones fall back to single calls
+    return {
+        category: {"recommendation": spec["recommendation"].format(category=category), "products": parsed[category]}
+        for category in categories
+        if valid_products(parsed.get(category))
+    }
+
+# ────────────────────────────────────────────────────────────────
+# Concurrent Fan-out for Per-Category Recommendations
+# ────────────────────────────────────────────────────────────────
+def fan_out_recommendations(generator, categories, max_workers=MAX_CONCURRENT_RECOMMENDATIONS, timeout=RECOMMENDATION_TIMEOUT, **generator_kwargs):
+    """
+    Run generator(category) for each category on a bounded thread pool and
+    yield (category, result) as each one completes, so pages can render
+    progressively. Generators are called with show_status=False because
+    Streamlit elements can only be written from the script thread. A call
+    running longer than `timeout` yields a fallback result; its thread is left
+    to finish in the background.
+    """
+    started = {}
+
+    def run(category):
+        started[category] = time.monotonic()
+        return generator(category, show_status=False, **generator_kwargs)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recommendations")
+    pending = {pool.submit(run, category): category for category in dict.fromkeys(categories)}
+    try:
+        while pending:
+            now = time.monotonic()
+            deadlines = [started[c] + timeout for c in pending.values() if c in started]
+            wait_for = max(0.0, min(deadlines) - now) if deadlines else timeout
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                category = pending.pop(future)
+                try:
+                    yield category, future.result()
+                except Exception as e:
+                    yield category, {"recommendation": "Unable to generate recommendation.", "products": [], "error": str(e)}
+
+            now = time.monotonic()
+            for future, category in list(pending.items()):
+                if category in started and now - started[category] >= timeout:
+                    pending.pop(future)
+                    future.cancel()
+                    yield category, {
+                        "recommendation": "Recommendation timed out. Please try again.",
+                        "products": [],
+                        "error": f"Timed out after {timeout}s",
+                    }
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
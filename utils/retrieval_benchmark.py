@@ -0,0 +1,238 @@
+# utils/retrieval_benchmark.py
+"""
+Retrieval quality/latency benchmark for the code-context vector index.
+
+    python -m utils.retrieval_benchmark --chunkers chars:1000:50 chars:500:50 ast:1500 \
+        --index-types flat hnsw --retrievers vector hybrid --k 3 5 10
+
+For every chunker, the repository's .py/.md/.txt files are chunked and
+embedded once. The vectors are then indexed with each index type
+(utils/ann_index.py). The labeled questions in retrieval_questions.json are
+run through each retriever and value of k. Reported per row:
+- recall@k and MRR@k;
+- mean retrieved context size in characters (a proxy for prompt tokens);
+- p50/p95 retrieval latency, excluding the query embedding;
+- serialized index size;
+- build time: chunking + embedding + index (+ BM25 for hybrid).
+
+Embedding time includes hits in the on-disk embedding cache.
+
+Labels name a source file and optionally a qualified symbol. A retrieved
+chunk is relevant when it comes from that file and overlaps the symbol's
+lines, so the same labels work for every chunker. Chunker specs:
+  chars:<size>:<overlap>  RecursiveCharacterTextSplitter for every file
+  ast[:<max_chars>]       utils/code_chunker.py for .py, 1000/50 characters otherwise
+Embeddings come from the configured backend (utils/llm_providers.get_embeddings);
+pass --backend local or --backend offline to benchmark without the API.
+"""
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+
+import faiss
+import numpy as np
+import pandas as pd
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from utils import ann_index, llm_providers
+from utils.bm25_index import BM25Index, hybrid_rank
+from utils.code_chunker import PYTHON_CHUNK_CHARS, split_python
+from utils.embedding_cache import CachedEmbeddings
+from utils.source_loader import iter_source_files, iter_source_texts
+
+QUESTIONS_PATH = "retrieval_questions.json"
+RETRIEVERS = ["vector", "hybrid"]
+HYBRID_CANDIDATES = 20
+
+
+# ────────────────────────────────────────────────────────────────
+# Corpus & Chunkers
+# ────────────────────────────────────────────────────────────────
+def load_sources(root):
+    paths = sorted(iter_source_files(root))
+    return {os.path.relpath(path, root): text for path, text in iter_source_texts(paths)}
+
+
+def _char_chunks(splitter, text):
+    chunks, cursor = [], 0
+    for part in splitter.split_text(text):
+        pos = text.find(part, cursor)
+        pos = pos if pos >= 0 else max(0, text.find(part))
+        start = text.count("\n", 0, pos) + 1
+        chunks.append((part, start, start + part.count("\n"), []))
+        cursor = pos + 1
+    return chunks
+
+
+def chunk_corpus(sources, spec):
+    """[{id, source, text, start, end, symbols}] for one chunker spec."""
+    kind, *params = spec.split(":")
+    default_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=50)
+    if kind == "chars":
+        splitter = RecursiveCharacterTextSplitter(chunk_size=int(params[0]), chunk_overlap=int(params[1]) if len(params) > 1 else 0)
+    elif kind != "ast":
+        raise ValueError(f"Unknown chunker {spec!r}; use chars:<size>:<overlap> or ast[:<max_chars>]")
+
+    chunks = []
+    for source, text in sources.items():
+        if kind == "ast" and source.endswith(".py"):
+            docs = split_python(text, {"source": source}, max_chars=int(params[0]) if params else PYTHON_CHUNK_CHARS)
+            parts = [(d.page_content, d.metadata.get("start_line", 1), d.metadata.get("end_line", 1),
+                      d.metadata.get("symbols", [])) for d in docs]
+        else:
+            parts = _char_chunks(splitter if kind == "chars" else default_splitter, text)
+        for i, (part, start, end, symbols) in enumerate(parts):
+            chunks.append({"id": f"{source}:{i}", "source": source, "text": part,
+                           "start": start, "end": end, "symbols": symbols})
+    return chunks
+
+
+# ────────────────────────────────────────────────────────────────
+# Labels
+# ────────────────────────────────────────────────────────────────
+def _symbol_spans(text):
+    spans = {}
+    def visit(body, scope):
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                name = f"{scope}.{node.name}" if scope else node.name
+                spans[name] = (min([node.lineno] + [d.lineno for d in node.decorator_list]), node.end_lineno)
+                visit(node.body, name)
+    visit(ast.parse(text).body, "")
+    return spans
+
+
+def resolve_labels(questions, sources):
+    """Attach (source, first_line, last_line) targets to each question; whole-file when a symbol is unknown."""
+    spans = {}
+    for q in questions:
+        q["targets"] = []
+        for label in q["relevant"]:
+            source, symbol = os.path.normpath(label["source"]), label.get("symbol")
+            if source not in sources:
+                print(f"warning: {source} is not in the corpus ({q['question']!r})", file=sys.stderr)
+                continue
+            span = None
+            if symbol:
+                if source not in spans:
+                    spans[source] = _symbol_spans(sources[source]) if source.endswith(".py") else {}
+                span = spans[source].get(symbol)
+                if span is None:
+                    print(f"warning: {symbol} not found in {source}; matching the whole file", file=sys.stderr)
+            q["targets"].append((source, span))
+    return [q for q in questions if q["targets"]]
+
+
+def _hits(chunk, target):
+    source, span = target
+    return chunk["source"] == source and (span is None or (chunk["start"] <= span[1] and chunk["end"] >= span[0]))
+
+
+def score(questions, results, chunks_by_id, k):
+    recalls, reciprocal_ranks, context = [], [], []
+    for q, ids in zip(questions, results):
+        retrieved = [chunks_by_id[i] for i in ids[:k]]
+        recalls.append(sum(any(_hits(c, t) for c in retrieved) for t in q["targets"]) / len(q["targets"]))
+        rank = next((r for r, c in enumerate(retrieved, 1) if any(_hits(c, t) for t in q["targets"])), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+        context.append(sum(len(c["text"]) for c in retrieved))
+    return float(np.mean(recalls)), float(np.mean(reciprocal_ranks)), float(np.mean(context))
+
+
+# ────────────────────────────────────────────────────────────────
+# Benchmark
+# ────────────────────────────────────────────────────────────────
+def run_grid(sources, questions, embeddings, chunkers, index_types, retrievers, ks):
+    # Queries are embedded the way FAISS similarity_search does it in the app
+    query_vectors = np.asarray([embeddings.embed_query(q["question"]) for q in questions], dtype=np.float32)
+    rows = []
+    for spec in chunkers:
+        start = time.perf_counter()
+        chunks = chunk_corpus(sources, spec)
+        chunk_s = time.perf_counter() - start
+        chunks_by_id = {c["id"]: c for c in chunks}
+        ids = [c["id"] for c in chunks]
+
+        start = time.perf_counter()
+        vectors = np.asarray(embeddings.embed_documents([c["text"] for c in chunks]), dtype=np.float32)
+        embed_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bm25 = BM25Index.build((c["id"], c["text"], c["symbols"]) for c in chunks)
+        bm25_s = time.perf_counter() - start
+
+        for index_type in index_types:
+            start = time.perf_counter()
+            index, effective = ann_index.build_index(vectors, {"type": index_type})
+            index_s = time.perf_counter() - start
+            size_mb = faiss.serialize_index(index).nbytes / 2**20
+            label = index_type if effective["type"] == index_type else f"{index_type}->{effective['type']}"
+
+            for retriever in retrievers:
+                for k in ks:
+                    results, latencies = [], []
+                    for q, qv in zip(questions, query_vectors):
+                        def vector_search(n, qv=qv):
+                            _, found = index.search(qv[None, :], min(n, len(ids)))
+                            return [ids[i] for i in found[0] if i >= 0]
+                        start = time.perf_counter()
+                        if retriever == "vector":
+                            ranked = vector_search(k)
+                        else:
+                            ranked = hybrid_rank(q["question"], bm25, vector_search, k, HYBRID_CANDIDATES)
+                        latencies.append((time.perf_counter() - start) * 1000)
+                        results.append(ranked)
+                    recall, mrr, context = score(questions, results, chunks_by_id, k)
+                    build_s = chunk_s + embed_s + index_s + (bm25_s if retriever == "hybrid" else 0)
+                    rows.append({
+                        "chunker": spec,
+                        "index": label,
+                        "retriever": retriever,
+                        "k": k,
+                        "chunks": len(chunks),
+                        "recall@k": round(recall, 3),
+                        "mrr": round(mrr, 3),
+                        "ctx_chars": int(context),
+                        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+                        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+                        "size_mb": round(size_mb, 2),
+                        "build_s": round(build_s, 2),
+                    })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark retrieval quality and latency per index configuration.")
+    parser.add_argument("--root", default=".", help="Repository root to index")
+    parser.add_argument("--questions", default=QUESTIONS_PATH, help="Labeled question set (JSON)")
+    parser.add_argument("--chunkers", nargs="+", default=["chars:1000:50", "chars:500:50", "chars:2000:100", "ast:1500"])
+    parser.add_argument("--index-types", nargs="+", choices=ann_index.INDEX_TYPES, default=["flat", "hnsw", "ivf_flat"])
+    parser.add_argument("--retrievers", nargs="+", choices=RETRIEVERS, default=RETRIEVERS)
+    parser.add_argument("--k", type=int, nargs="+", default=[3, 5, 10])
+    parser.add_argument("--backend", choices=["openai", "local", "offline"], default=None,
+                        help="Embedding backend (default: as configured in secrets/env)")
+    parser.add_argument("--csv", default=None, help="Also write the table to this CSV file")
+    args = parser.parse_args(argv)
+
+    if args.backend == "offline":
+        os.environ["LLM_PROVIDER"] = "offline"
+    embeddings = CachedEmbeddings(llm_providers.get_embeddings(backend=args.backend if args.backend != "offline" else None))
+
+    sources = load_sources(args.root)
+    with open(args.questions, "r", encoding="utf-8") as f:
+        questions = resolve_labels(json.load(f), sources)
+    print(f"{len(sources)} sources, {len(questions)} labeled questions, embeddings: {embeddings.model}", file=sys.stderr)
+
+    rows = run_grid(sources, questions, embeddings, args.chunkers, args.index_types, args.retrievers, args.k)
+    table = pd.DataFrame(rows)
+    print(table.to_string(index=False))
+    if args.csv:
+        table.to_csv(args.csv, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
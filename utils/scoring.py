@@ -0,0 +1,256 @@
+# utils/scoring.py
+"""
+Streamlit-free maturity scoring shared by the assessment pages and batch tools.
+
+A question bank compiles once into a key index in bank order, and the weighted
+scoring model turns it into matrices, so scoring any number of assessments is a
+few matrix products.
+"""
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from utils.question_banks import BANK_VERSION_SESSION_KEYS, iter_bank
+
+YES = "Yes"  # the pages' radio value; anything else (including "yes", "Y", "true") is No
+
+# ────────────────────────────────────────────────────────────────
+# Compiled Banks
+# ────────────────────────────────────────────────────────────────
+class CompiledBank:
+    def __init__(self, kind, questions, version=None):
+        self.kind = kind
+        self.version = version
+        self.keys = []
+        self.key_index = {}
+        self.id_index = {}
+        self.questions = []
+        self.categories = []
+        self.sections = []
+        self.category_positions = []
+
+        for q in questions:
+            if q["key"] in self.key_index:
+                continue
+            self.key_index[q["key"]] = len(self.keys)
+            self.id_index[q.get("id") or q["key"]] = len(self.keys)
+            self.keys.append(q["key"])
+            self.questions.append(q)
+            if q["category"] not in self.categories:
+                self.categories.append(q["category"])
+                self.category_positions.append([])
+            self.category_positions[self.categories.index(q["category"])].append(len(self.keys) - 1)
+            if q["section"] and q["section"] not in self.sections:
+                self.sections.append(q["section"])
+
+    def grouped_questions(self) -> dict:
+        """{category: [question text]} in bank order, as the page forms expect."""
+        return {
+            cat: [self.questions[i]["question"] for i in positions]
+            for cat, positions in zip(self.categories, self.category_positions)
+        }
+
+    def vectorize(self, answers: dict) -> np.ndarray:
+        """Turn a {answer_key: "Yes"/"No"} dict into a 0/1 vector in bank order."""
+        vec = np.zeros(len(self.keys), dtype=np.float32)
+        for key, value in (answers or {}).items():
+            idx = self.key_index.get(key)
+            if idx is not None and str(value).strip() == YES:
+                vec[idx] = 1.0
+        return vec
+
+@lru_cache(maxsize=None)
+def compile_bank(kind: str) -> CompiledBank:
+    return CompiledBank(kind, iter_bank(kind))
+
+def bank_for_version(kind: str, version=None, backend: str = "local") -> CompiledBank:
+    """
+    The compiled bank answers were saved against. Versioned kinds resolve
+    through question_bank_store.get_bank (compiled once per version); unknown
+    versions fall back to the latest bank, as the IT page does.
+    """
+    if kind not in BANK_VERSION_SESSION_KEYS:
+        return compile_bank(kind)
+    from utils.question_bank_store import get_bank, get_latest_bank  # imports CompiledBank from here
+
+    try:
+        return get_bank(kind, int(version or 0), backend)
+    except (KeyError, FileNotFoundError, ValueError):
+        return get_latest_bank(kind, backend)
+
+# ────────────────────────────────────────────────────────────────
+# Scoring
+# ────────────────────────────────────────────────────────────────
+def _percent(yes_counts, totals):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(totals > 0, yes_counts / totals * 100, 0.0)
+    return np.round(scores, 1)
+
+# ────────────────────────────────────────────────────────────────
+# Roadmap
+# ────────────────────────────────────────────────────────────────
+def assign_phase(scores) -> np.ndarray:
+    """Roadmap quarter for each category score (%): Q1 below 50, Q2 below 80, else Q3."""
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.select([scores < 50, scores < 80], ["Q1", "Q2"], "Q3")
+
+def roadmap_action(scores) -> np.ndarray:
+    """Roadmap action item for each category score (%)."""
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.select(
+        [scores >= 80, scores >= 50],
+        ["Maintain and enhance automation", "Standardize and document processes"],
+        "Prioritize investment and leadership support",
+    )
+
+# ────────────────────────────────────────────────────────────────
+# Weighted Scoring Model
+# ────────────────────────────────────────────────────────────────
+SCORING_MODEL_PATH = "scoring_model.json"
+
+# Neutral defaults reproduce the plain fraction-of-"Yes" scores
+DEFAULT_SCORING_CONFIG = {"question_weights": {}, "section_multipliers": {}, "gates": []}
+
+class WeightedScoringModel:
+    """
+    Per-question weights, per-section multipliers and gating rules compiled
+    into matrices over (category, section) cells.
+
+    A gate such as {"section": "Survival", "min_score": 50, "cap": 0.0} scales
+    the earned points of every later section by `cap` until the gate section
+    scores at least `min_score`%. The gate is checked within the same category
+    when it has that section, otherwise across the whole assessment (IT
+    categories are themselves maturity levels).
+    """
+
+    def __init__(self, bank, question_weights=None, section_multipliers=None, gates=None):
+        self.bank = bank
+        question_weights = question_weights or {}
+        section_multipliers = section_multipliers or {}
+
+        cells = []
+        q_cell = []
+        for q in bank.questions:
+            cell = (q["category"], q["section"])
+            if cell not in cells:
+                cells.append(cell)
+            q_cell.append(cells.index(cell))
+        self.cells = cells
+
+        n, m = len(bank.keys), len(cells)
+        weights = np.array([
+            float(next((question_weights[k] for k in (q.get("id"), q["key"], q["question"]) if k in question_weights), 1.0))
+            for q in bank.questions
+        ], dtype=np.float32)
+        self.weight_matrix = np.zeros((n, m), dtype=np.float32)
+        self.weight_matrix[np.arange(n), q_cell] = weights
+        self.cell_max = self.weight_matrix.sum(axis=0)
+        self.cell_multiplier = np.array([float(section_multipliers.get(s, 1.0)) for _, s in cells], dtype=np.float32)
+
+        self.cell_to_category = np.zeros((m, len(bank.categories)), dtype=np.float32)
+        self.cell_to_section = np.zeros((m, len(bank.sections)), dtype=np.float32)
+        for c, (cat, sec) in enumerate(cells):
+            self.cell_to_category[c, bank.categories.index(cat)] = 1.0
+            if sec:
+                self.cell_to_section[c, bank.sections.index(sec)] = 1.0
+
+        # One (cells × cells) source matrix per gate: column c sums the gate
+        # cells that decide whether cell c earns full points.
+        self.gates = []
+        for gate in gates or []:
+            if gate["section"] not in bank.sections:
+                continue
+            order = bank.sections.index(gate["section"])
+            source = np.zeros((m, m), dtype=np.float32)
+            for c, (cat, sec) in enumerate(cells):
+                if not sec or bank.sections.index(sec) <= order:
+                    continue
+                local = [i for i, (k, s) in enumerate(cells) if k == cat and s == gate["section"]]
+                rows = local or [i for i, (_, s) in enumerate(cells) if s == gate["section"]]
+                source[rows, c] = 1.0
+            self.gates.append((source, float(gate.get("min_score", 50)), float(gate.get("cap", 0.0))))
+
+    def score(self, answers_matrix: np.ndarray) -> dict:
+        """Score a (assessments × questions) 0/1 matrix; returns category, section and overall %."""
+        answers_matrix = np.atleast_2d(answers_matrix).astype(np.float32, copy=False)
+        earned = answers_matrix @ self.weight_matrix
+
+        factor = np.ones_like(earned)
+        for source, min_score, cap in self.gates:
+            gate_max = self.cell_max @ source
+            gate_pct = _percent(earned @ source, gate_max)
+            passed = (gate_pct >= min_score) | (gate_max == 0)
+            factor *= np.where(passed, 1.0, cap)
+
+        earned = earned * factor * self.cell_multiplier
+        possible = self.cell_max * self.cell_multiplier
+        return {
+            "categories": _percent(earned @ self.cell_to_category, possible @ self.cell_to_category),
+            "sections": _percent(earned @ self.cell_to_section, possible @ self.cell_to_section),
+            "overall": _percent(earned.sum(axis=1), possible.sum()),
+        }
+
+    def category_scores(self, answers: dict) -> dict:
+        scores = self.score(self.bank.vectorize(answers))["categories"][0]
+        return {cat: float(s) for cat, s in zip(self.bank.categories, scores)}
+
+    def section_scores(self, answers: dict) -> dict:
+        scores = self.score(self.bank.vectorize(answers))["sections"][0]
+        return {sec: float(s) for sec, s in zip(self.bank.sections, scores)}
+
+def load_scoring_config(path=SCORING_MODEL_PATH):
+    """Read {"ai": {...}, "it": {...}, "cyber": {...}} model settings if the file exists."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@lru_cache(maxsize=None)
+def load_scoring_model(kind: str, path: str = SCORING_MODEL_PATH, bank=None) -> WeightedScoringModel:
+    """Cached per (kind, config path, compiled bank); pass a versioned bank to score against it."""
+    config = {**DEFAULT_SCORING_CONFIG, **(load_scoring_config(path).get(kind) or {})}
+    return WeightedScoringModel(
+        bank or compile_bank(kind),
+        question_weights=config.get("question_weights"),
+        section_multipliers=config.get("section_multipliers"),
+        gates=config.get("gates"),
+    )
+
+def score_projects(projects, kind: str, model=None, backend: str = "local", model_path: str = SCORING_MODEL_PATH):
+    """
+    Bulk-score saved Supabase projects (rows from the "projects" table) with
+    one matrix product per question bank version. IT answers are scored
+    against the version saved with them (session_data "it_question_bank_version");
+    pass `model` to score every project with one model instead. Returns a long
+    DataFrame of category scores.
+    """
+    import pandas as pd
+
+    session_key = {"ai": "ai_maturity_answers", "it": "maturity_answers", "cyber": "cyber_answers"}[kind]
+    version_key = BANK_VERSION_SESSION_KEYS.get(kind)
+    groups = {}
+    for p in projects:
+        session = p.get("session_data") or {}
+        answers = session.get(session_key)
+        if not (isinstance(answers, dict) and answers):
+            continue
+        group_model = model or load_scoring_model(
+            kind, model_path, bank=bank_for_version(kind, session.get(version_key), backend)
+        )
+        groups.setdefault(group_model, []).append((p.get("id"), answers))
+    if not groups:
+        return pd.DataFrame(columns=["project_id", "Category", "Score (%)"])
+
+    frames = []
+    for group_model, rows in groups.items():
+        matrix = np.stack([group_model.bank.vectorize(answers) for _, answers in rows])
+        scores = group_model.score(matrix)["categories"]
+        categories = group_model.bank.categories
+        frames.append(pd.DataFrame({
+            "project_id": np.repeat([pid for pid, _ in rows], len(categories)),
+            "Category": np.tile(np.asarray(categories, dtype=object), len(rows)),
+            "Score (%)": scores.reshape(-1),
+        }))
+    return pd.concat(frames, ignore_index=True)
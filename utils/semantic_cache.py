@@ -0,0 +1,275 @@
+# utils/semantic_cache.py
+"""
+Semantic response cache for free-form AI consultation questions.
+
+Prompts are embedded with the configured embedding model
+(llm_providers.get_embeddings: OpenAI, local sentence-transformers or the
+offline stand-in), through the on-disk embedding cache. Entries are
+partitioned by a context fingerprint: project, role, goal and the session
+figures the assistant reasons over. A stored answer is reused only when all
+of these hold:
+- the question is about the same project state;
+- both questions have the same content tokens in the same order: words
+  other than stopwords and question filler, lightly stemmed, numbers
+  included. Named entities (AWS vs Azure), opposite verbs (reduce vs
+  increase, retire vs keep) and swapped roles (AWS to Azure vs Azure to AWS)
+  embed close together, so similarity alone can't tell them apart;
+- the cosine similarity clears the threshold calibrated for the embedding
+  model from labeled paraphrase / non-paraphrase pairs:
+
+      python -m utils.semantic_cache --pairs semantic_cache_pairs.json --write
+
+  Until a model is calibrated, the conservative SIMILARITY_THRESHOLD is used.
+Entries expire after a TTL, and the total entry count is LRU-bounded. One
+process-wide instance is shared by all sessions.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+SIMILARITY_THRESHOLD = 0.95  # used until the embedding model has a calibrated threshold
+MIN_THRESHOLD = 0.80         # calibration never goes below this
+CALIBRATION_MARGIN = 0.005
+THRESHOLDS_PATH = os.path.join(".cache", "semantic_cache_thresholds.json")
+PAIRS_PATH = "semantic_cache_pairs.json"
+DEFAULT_TTL = 15 * 60  # answers may include live search results
+MAX_ENTRIES = 2000
+
+# Session values the consultation answers depend on (see utils/bootstrap.page_bootstrap)
+CONTEXT_KEYS = ["revenue", "it_expense", "revenue_growth", "expense_growth"]
+
+_TOKEN_RE = re.compile(r"[a-z0-9$%]+")
+_CONTRACTIONS = [("n't", " not"), ("'re", " are"), ("'s", " is"), ("'m", " am"), ("'ve", " have"), ("'ll", " will")]
+
+# Function words and question filler. Negations (not, no, without) and
+# comparatives (more, less) are content: they change the answer.
+STOPWORDS = frozenset("""
+a an the is are was were be been being am do does did have has had having
+i me my we our ours us you your they them their this that these those there here
+what which who whom whose when where why how
+can could would should will shall may might must
+to of in on at by for from with about into onto as and or but if so than then
+please tell explain describe give show help know let
+some any best good way ways idea ideas advice option options approach
+""".split())
+_SUFFIXES = [("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", ""), ("e", "")]
+
+
+def _words(prompt: str):
+    text = prompt.lower().replace("’", "'")
+    for short, full in _CONTRACTIONS:
+        text = text.replace(short, full)
+    return _TOKEN_RE.findall(text)
+
+def _stem(word: str) -> str:
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+def content_tokens(prompt: str) -> tuple:
+    """Stemmed non-stopword tokens in order (repeats dropped), numbers included; a hit requires these to match."""
+    return tuple(dict.fromkeys(_stem(w) for w in _words(prompt) if w not in STOPWORDS))
+
+def context_fingerprint(session_state, role="CIO", goal="Optimize Costs") -> str:
+    """Hash of the project and session figures an answer depends on."""
+    project = session_state.get("project_data") or {}
+    components = session_state.get("components") or []
+    spend = sum(float(c.get("Spend", 0) or 0) for c in components if isinstance(c, dict))
+    payload = {
+        "project": project.get("id") if isinstance(project, dict) else None,
+        "role": role,
+        "goal": goal,
+        "components": [len(components), round(spend, 2)],
+        **{key: session_state.get(key) for key in CONTEXT_KEYS},
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+# ────────────────────────────────────────────────────────────────
+# Embeddings & Calibrated Thresholds
+# ────────────────────────────────────────────────────────────────
+def default_embeddings(backend=None):
+    from utils.embedding_cache import CachedEmbeddings
+    from utils.llm_providers import get_embeddings
+    return CachedEmbeddings(get_embeddings(backend=backend))
+
+def _unit(vector) -> np.ndarray:
+    vec = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+def load_thresholds(path=None) -> dict:
+    path = path or THRESHOLDS_PATH
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def calibrate(pairs, embeddings) -> dict:
+    """
+    Threshold for `embeddings` from labeled pairs ({"a", "b", "paraphrase"}).
+    Only pairs the content-token guard lets through matter. The threshold is
+    set just above the most similar such non-paraphrase, so no labeled
+    non-paraphrase is served, or at the least similar paraphrase when none
+    pass the guard; never below MIN_THRESHOLD. Also returns per-pair
+    similarities and the resulting precision/recall.
+    """
+    texts = list(dict.fromkeys(t for p in pairs for t in (p["a"], p["b"])))
+    vectors = dict(zip(texts, (_unit(v) for v in embeddings.embed_documents(texts))))
+    rows = [
+        {**p, "similarity": round(float(vectors[p["a"]] @ vectors[p["b"]]), 4),
+         "same_tokens": content_tokens(p["a"]) == content_tokens(p["b"])}
+        for p in pairs
+    ]
+    guarded = [r for r in rows if r["same_tokens"]]
+    negatives = [r["similarity"] for r in guarded if not r["paraphrase"]]
+    positives = [r["similarity"] for r in guarded if r["paraphrase"]]
+    if negatives:
+        threshold = max(negatives) + CALIBRATION_MARGIN
+    else:
+        threshold = min(positives) if positives else SIMILARITY_THRESHOLD
+    threshold = round(min(1.0, max(MIN_THRESHOLD, threshold)), 4)
+
+    hits = [r for r in guarded if r["similarity"] >= threshold]
+    paraphrases = sum(r["paraphrase"] for r in rows)
+    return {
+        "threshold": threshold,
+        "precision": sum(r["paraphrase"] for r in hits) / len(hits) if hits else 1.0,
+        "recall": sum(r["paraphrase"] for r in hits) / paraphrases if paraphrases else 0.0,
+        "pairs": rows,
+    }
+
+# ────────────────────────────────────────────────────────────────
+# Cache
+# ────────────────────────────────────────────────────────────────
+class SemanticCache:
+    def __init__(self, embeddings=None, threshold=None, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES):
+        self._embeddings = embeddings   # resolved on first use, so importing needs no API key
+        self._threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # entry_id -> (context, vector, answer, expires_at, content tokens)
+        self._by_context = {}           # context -> [entry_id, ...]
+        self._next_id = 0
+        self.stats = {"hits": 0, "misses": 0, "embedding_errors": 0}
+
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            self._embeddings = default_embeddings()
+        return self._embeddings
+
+    @property
+    def threshold(self) -> float:
+        """Explicit threshold, else the one calibrated for the embedding model, else SIMILARITY_THRESHOLD."""
+        if self._threshold is None:
+            model = getattr(self.embeddings, "model", None) or type(self.embeddings).__name__
+            self._threshold = float(load_thresholds().get(str(model), SIMILARITY_THRESHOLD))
+        return self._threshold
+
+    def _embed(self, prompt: str):
+        try:
+            return _unit(self.embeddings.embed_query(prompt))
+        except Exception as e:
+            # The cache is an optimisation: an embedding outage means a miss, not a failed answer
+            print(f"[Semantic cache embedding failed] {e}")
+            with self._lock:
+                self.stats["embedding_errors"] += 1
+            return None
+
+    def _drop(self, entry_id):
+        context = self._entries.pop(entry_id)[0]
+        ids = self._by_context.get(context, [])
+        if entry_id in ids:
+            ids.remove(entry_id)
+        if not ids:
+            self._by_context.pop(context, None)
+
+    def lookup(self, prompt: str, context: str):
+        """Best stored answer for this context with the same content tokens and similarity >= threshold, else None."""
+        tokens = content_tokens(prompt)
+        now = time.time()
+        with self._lock:
+            for entry_id in [i for i in self._by_context.get(context, []) if self._entries[i][3] < now]:
+                self._drop(entry_id)
+            candidates = any(self._entries[i][4] == tokens for i in self._by_context.get(context, []))
+        if not candidates:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        query = self._embed(prompt)
+        threshold = self.threshold
+        with self._lock:
+            ids = [i for i in self._by_context.get(context, []) if self._entries[i][4] == tokens]
+            if ids and query is not None:
+                sims = np.stack([self._entries[i][1] for i in ids]) @ query
+                best = int(np.argmax(sims))
+                if sims[best] >= threshold:
+                    self._entries.move_to_end(ids[best])
+                    self.stats["hits"] += 1
+                    return self._entries[ids[best]][2]
+            self.stats["misses"] += 1
+            return None
+
+    def store(self, prompt: str, context: str, answer: str, ttl=None):
+        vector = self._embed(prompt)
+        if vector is None:
+            return
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (context, vector, answer, time.time() + (ttl or self.ttl), content_tokens(prompt))
+            self._by_context.setdefault(context, []).append(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_context.clear()
+
+
+# Process-wide instance shared by all Streamlit sessions
+consultation_cache = SemanticCache()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate the semantic cache threshold for the embedding model.")
+    parser.add_argument("--pairs", default=PAIRS_PATH, help="Labeled pairs (JSON list of {a, b, paraphrase})")
+    parser.add_argument("--backend", choices=["openai", "local", "offline"], default=None,
+                        help="Embedding backend (default: as configured in secrets/env)")
+    parser.add_argument("--write", action="store_true", help=f"Save the threshold for this model to {THRESHOLDS_PATH}")
+    args = parser.parse_args(argv)
+
+    if args.backend == "offline":
+        os.environ["LLM_PROVIDER"] = "offline"
+    embeddings = default_embeddings(args.backend if args.backend != "offline" else None)
+    with open(args.pairs, "r", encoding="utf-8") as f:
+        result = calibrate(json.load(f), embeddings)
+
+    import pandas as pd
+    table = pd.DataFrame(result["pairs"])[["similarity", "same_tokens", "paraphrase", "a", "b"]]
+    print(table.sort_values("similarity", ascending=False).to_string(index=False))
+    print(f"\n{embeddings.model}: threshold {result['threshold']} "
+          f"(precision {result['precision']:.2f}, recall {result['recall']:.2f} on {len(table)} pairs)")
+    if args.write:
+        thresholds = {**load_thresholds(), str(embeddings.model): result["threshold"]}
+        os.makedirs(os.path.dirname(THRESHOLDS_PATH), exist_ok=True)
+        with open(THRESHOLDS_PATH + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(thresholds, f, indent=2)
+        os.replace(THRESHOLDS_PATH + ".tmp", THRESHOLDS_PATH)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# utils/single_flight.py
+"""
+Single-flight request coalescing.
+
+When several Streamlit sessions ask for the same expensive result at once
+(e.g. a recommendation for the same category), only the first caller runs the
+call. Every concurrent caller with the same key waits for that in-flight call
+and receives its result, or re-raises its exception. Nothing is cached once
+the call finishes; caching stays the job of utils/local_cache.py and Supabase.
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"calls": 0, "saved_calls": 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) unless a call with the same key is in flight; then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["calls"] += 1
+            else:
+                self.stats["saved_calls"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+# Process-wide group for Tavily/OpenAI recommendation calls
+recommendation_flight = SingleFlight()
@@ -0,0 +1,84 @@
+# utils/source_loader.py
+"""
+Streaming source discovery and reading for the vector indexer.
+
+iter_source_files() walks the tree with a pool of threads, one directory
+listing per task, and yields matching paths as they are found.
+iter_source_texts() reads files in parallel and yields (path, text) pairs in
+completion order. It keeps at most `max_pending` files in flight, so a slow
+consumer (chunking and embedding) throttles reading instead of letting file
+contents pile up in memory. Both are generators and never hold the whole
+corpus. Read errors are reported through `on_error` on the consumer's thread,
+where Streamlit calls are safe.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+SOURCE_EXTENSIONS = (".py", ".md", ".txt")
+EXCLUDED_DIRS = (".venv", "__pycache__", "vector_store", ".git", ".cache")
+DEFAULT_WORKERS = 8
+MAX_PENDING_FILES = 32
+
+
+def _scan(directory, extensions, excluded):
+    files, subdirs = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in excluded:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(extensions):
+                    files.append(entry.path)
+    except OSError:
+        pass  # unreadable directory: skip it like os.walk does
+    return files, subdirs
+
+
+def iter_source_files(root: str = ".", extensions=SOURCE_EXTENSIONS, excluded=EXCLUDED_DIRS,
+                      workers: int = DEFAULT_WORKERS) -> Iterator[str]:
+    """Yield normalised paths under `root` ending in `extensions`, skipping `excluded` directory names."""
+    excluded = set(excluded)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discover") as pool:
+        pending = {pool.submit(_scan, root, tuple(extensions), excluded)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                pending.update(pool.submit(_scan, d, tuple(extensions), excluded) for d in subdirs)
+                for path in files:
+                    yield os.path.normpath(path)
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def iter_source_texts(paths: Iterable[str], workers: int = DEFAULT_WORKERS, max_pending: int = MAX_PENDING_FILES,
+                      on_error: Optional[Callable[[str, Exception], None]] = None) -> Iterator[Tuple[str, str]]:
+    """Yield (path, text) for `paths`, read concurrently with at most `max_pending` files in flight."""
+    paths = iter(paths)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="read") as pool:
+        pending = {}
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                path = next(paths, None)
+                if path is None:
+                    exhausted = True
+                else:
+                    pending[pool.submit(_read, path)] = path
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:
+                    if on_error:
+                        on_error(path, e)
+                    continue
+                yield path, text
@@ -0,0 +1,71 @@
+# utils/streaming.py
+"""
+Incremental rendering of LLM output in Streamlit.
+
+Text is written into an st.empty() placeholder as chunks arrive, so time to
+first token is the model's first-chunk latency. When the user submits a new
+question mid-answer, Streamlit interrupts the running script by raising its
+rerun/stop control exception (a BaseException) from the next st call. The
+finally blocks in these generators close the HTTP stream, so the abandoned completion
+stops instead of running to the end in the background.
+"""
+from contextlib import closing, nullcontext
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from utils.llm_providers import stream_completion
+
+CURSOR = "▌"
+
+
+def stream_chat_completion(messages, model="gpt-3.5-turbo", **kwargs):
+    """Yield text deltas from a rate-limited OpenAI chat completion stream."""
+    yield from stream_completion(messages, model=model, **kwargs)
+
+
+def render_stream(placeholder, chunks, on_interrupt=None) -> str:
+    """
+    Write chunks into `placeholder` as they arrive and return the full text.
+    If rendering is cut short (a new submit, or an error), on_interrupt(partial_text)
+    is called before the exception propagates.
+    """
+    text = ""
+    with closing(chunks) if hasattr(chunks, "close") else nullcontext():
+        try:
+            for piece in chunks:
+                text += piece
+                placeholder.markdown(text + CURSOR)
+        except BaseException:
+            if on_interrupt:
+                on_interrupt(text)
+            raise
+    placeholder.markdown(text)
+    return text
+
+
+class FinalAnswerStreamHandler(BaseCallbackHandler):
+    """
+    Stream only the "Final Answer:" part of a ReAct agent's output into a
+    placeholder. The agent's LLM must be created with streaming=True.
+    """
+    raise_error = True  # let Streamlit's rerun exception interrupt the agent
+
+    def __init__(self, placeholder, marker="Final Answer:"):
+        self.placeholder = placeholder
+        self.marker = marker
+        self.buffer = ""
+        self.answer = None
+
+    def on_llm_start(self, *args, **kwargs):
+        self.buffer = ""
+        self.answer = None
+
+    def on_llm_new_token(self, token: str, **kwargs):
+        self.buffer += token
+        if self.answer is None:
+            if self.marker not in self.buffer:
+                return
+            self.answer = ""
+            token = self.buffer.split(self.marker, 1)[1]
+        self.answer += token
+        self.placeholder.markdown(self.answer.lstrip() + CURSOR)
@@ -1,25 +1,29 @@
+import hashlib
+import json
 import os
+import pickle
+import threading
 import streamlit as st
 import pandas as pd
-from typing import List
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain.vectorstores import FAISS
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 from langchain.chains import RetrievalQA
+from langchain_core.retrievers import BaseRetriever
 
-# --- Load API Key Safely ---
-openai_key = st.secrets.get("openai_api_key") or st.secrets.get("openai", {}).get("api_key")
-if not openai_key:
-    raise KeyError("OpenAI API key is missing. Please configure it in the Streamlit secrets.")
+from utils import ann_index
+from utils.bm25_index import BM25Index, hybrid_rank
+from utils.chunk_catalog import CATALOG_FILE, write_catalog
+from utils.code_chunker import CHUNKER_VERSION, split_python
+from utils.embedding_cache import CachedEmbeddings
+from utils.llm_providers import get_chat_model, get_embeddings
 
-USE_HUGGINGFACE = False  # Change to True for local dev
-
-if USE_HUGGINGFACE:
-    embedding_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-else:
-    embedding_model = OpenAIEmbeddings(openai_api_key=openai_key)
+# OpenAI by default; set embedding_backend = "local" in secrets for on-CPU sentence-transformers.
+# An OpenAI key is only required when the embeddings or the QA chat model resolve to OpenAI.
+# Vectors are reused across rebuilds and restarts for text this model has already embedded.
+embedding_model = CachedEmbeddings(get_embeddings())
 
 VECTOR_INDEX_PATH = "vector_store/faiss_index"
 
@@ -27,31 +31,354 @@ VECTOR_INDEX_PATH = "vector_store/faiss_index"
 # --- Initialize the text splitter ---
 text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=50)
 
-def build_vector_index(docs: List[str], save_path: str = VECTOR_INDEX_PATH):
-    chunks = text_splitter.create_documents(docs)
-    vectorstore = FAISS.from_documents(chunks, embedding_model)
-    vectorstore.save_local(save_path)
+MANIFEST_FILE = "manifest.json"
+INDEX_FILES = ("index.faiss", "index.pkl")
+ANN_INDEX_FILE = "index.ann.faiss"  # serving index when [vector_index] type is not "flat"
+ANN_META_FILE = "index.ann.json"    # build id of the vectors the ANN index was built from
+EMBED_BATCH_SIZE = 256  # chunks buffered before each embedding call
+CODE_CONTEXT_K = 3  # whole functions/classes per chunk, so fewer are needed per answer
+BM25_FILE = "bm25.pkl"  # lexical index over the same chunks, for hybrid retrieval
+HYBRID_CANDIDATES = 20  # per-retriever candidates fused by RRF
+UPLOAD_PREFIX = "upload/"  # source names of documents uploaded on the admin page
+
+def is_scanned_source(source: str) -> bool:
+    """Sources a project scan is authoritative for; uploads are only removed explicitly."""
+    return not source.startswith(UPLOAD_PREFIX)
+
+def configured_index() -> dict:
+    """Index type and parameters from the [vector_index] secrets table (see utils/ann_index.py)."""
+    try:
+        settings = dict(st.secrets.get("vector_index", {}))
+    except Exception:  # no secrets file: offline / local runs
+        settings = {}
+    try:
+        return ann_index.resolve_config(settings)
+    except ValueError as e:
+        st.warning(f"{e}. Falling back to an exact (flat) index.")
+        return ann_index.resolve_config()
+
+def _sha(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def _embedding_signature() -> str:
+    inner = embedding_model
+    while hasattr(inner, "inner"):  # cache and provider wrappers don't change the vectors
+        inner = inner.inner
+    model = getattr(inner, "model", None) or getattr(inner, "model_name", None)
+    return f"{type(inner).__name__}:{model}"
+
+def _build_id(index_to_docstore_id: dict) -> str:
+    """Hash of the chunk ids in index order; chunk ids are content hashes, so this identifies the vectors."""
+    return _sha("\n".join(index_to_docstore_id[i] for i in range(len(index_to_docstore_id))))
+
+def _load_manifest(path: str):
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _chunker_for(source: str) -> str:
+    return CHUNKER_VERSION if source.endswith(".py") else "chars"
+
+def _chunk_source(source: str, text: str):
+    """(ids, Documents) for one source; ids are content hashes, numbered if a chunk repeats."""
+    if source.endswith(".py"):
+        docs = split_python(text, {"source": source})
+    else:
+        docs = text_splitter.create_documents([text], metadatas=[{"source": source}])
+    ids, seen = [], {}
+    for doc in docs:
+        digest = _sha(f"{source}\x1f{doc.page_content}")
+        seen[digest] = seen.get(digest, -1) + 1
+        ids.append(f"{digest}:{seen[digest]}")
+        doc.metadata["chunk_id"] = ids[-1]
+    return ids, docs
+
+def _add_batch(vectorstore, docs, ids):
+    if vectorstore is None:
+        return FAISS.from_documents(docs, embedding_model, ids=ids)
+    vectorstore.add_documents(docs, ids=ids)
+    return vectorstore
+
+def update_vector_index(sources: Union[Dict[str, str], Iterable[Tuple[str, str]]], save_path: str = VECTOR_INDEX_PATH,
+                        prune: Union[bool, Callable[[str], bool]] = False, index_config: Optional[dict] = None,
+                        batch_size: int = EMBED_BATCH_SIZE, progress: Optional[Callable[[dict], None]] = None):
+    """
+    Incrementally sync the index with {source_name: text}, or with an
+    iterable of (source_name, text) pairs consumed as it is produced.
+
+    Texts are chunked as they arrive and dropped once chunked; new chunks are
+    embedded in batches of `batch_size`, so memory stays bounded by the
+    batch rather than the corpus. `progress(stats)` is called after each
+    source. Sources whose content hash matches the manifest are skipped without
+    re-chunking. For changed sources, only chunks with new hashes are
+    embedded, and chunks that disappeared are deleted from FAISS. With
+    `prune=True`, indexed sources not seen in `sources` are removed; pass a
+    predicate (e.g. is_scanned_source) to remove only unseen sources it
+    accepts. A full
+    rebuild happens only when there is no index yet or the embedding model
+    changed.
+
+    The exact index (index.faiss) stays the source of truth for updates. When
+    the configured index type is not "flat", a trained ANN serving index is
+    rebuilt from it whenever the vectors or the index config change. Either
+    way a recall/latency report is returned in stats["index_report"].
+    Returns (vectorstore, stats).
+    """
+    config = ann_index.resolve_config(index_config) if index_config is not None else configured_index()
+    manifest = _load_manifest(save_path)
+    vectorstore = None
+    if manifest and manifest.get("embedding") == _embedding_signature() and os.path.exists(os.path.join(save_path, "index.faiss")):
+        # A private copy: the shared handle may be serving queries while this one is modified
+        vectorstore = load_vector_index(save_path)
+    else:
+        manifest = None
+    manifest = manifest or {"embedding": _embedding_signature(), "sources": {}}
+    indexed = manifest["sources"]
+
+    stats = {"sources_unchanged": 0, "sources_changed": 0, "sources_removed": 0, "chunks_added": 0, "chunks_deleted": 0}
+    cache_before = dict(embedding_model.stats)
+    pending_ids, pending_docs, to_delete, seen = [], [], [], set()
+
+    for source, text in (sources.items() if isinstance(sources, dict) else sources):
+        seen.add(source)
+        content_hash = _sha(text)
+        entry = indexed.get(source)
+        if entry and entry["hash"] == content_hash and entry.get("chunker", "chars") == _chunker_for(source):
+            stats["sources_unchanged"] += 1
+            if progress:
+                progress(stats)
+            continue
+        stats["sources_changed"] += 1
+        ids, docs = _chunk_source(source, text)
+        old_ids = set(entry["chunks"]) if entry else set()
+        new_ids = set(ids)
+        to_delete.extend(old_ids - new_ids)
+        for chunk_id, doc in zip(ids, docs):
+            if chunk_id not in old_ids:
+                pending_ids.append(chunk_id)
+                pending_docs.append(doc)
+        indexed[source] = {"hash": content_hash, "chunks": ids, "chunker": _chunker_for(source)}
+        if len(pending_docs) >= batch_size:
+            vectorstore = _add_batch(vectorstore, pending_docs, pending_ids)
+            stats["chunks_added"] += len(pending_docs)
+            pending_ids, pending_docs = [], []
+        if progress:
+            progress(stats)
+
+    if pending_docs:
+        vectorstore = _add_batch(vectorstore, pending_docs, pending_ids)
+        stats["chunks_added"] += len(pending_docs)
+
+    if prune:
+        in_scope = prune if callable(prune) else (lambda source: True)
+        for source in [s for s in indexed if s not in seen and in_scope(s)]:
+            to_delete.extend(indexed.pop(source)["chunks"])
+            stats["sources_removed"] += 1
+
+    if vectorstore is not None and to_delete:
+        present = set(vectorstore.index_to_docstore_id.values())
+        to_delete = [chunk_id for chunk_id in to_delete if chunk_id in present]
+        if to_delete:
+            vectorstore.delete(to_delete)
+    stats["chunks_deleted"] = len(to_delete)
+    stats["embedding_cache_hits"] = embedding_model.stats["hits"] - cache_before["hits"]
+    stats["embedding_cache_misses"] = embedding_model.stats["misses"] - cache_before["misses"]
+
+    changed = bool(stats["chunks_added"] or to_delete or stats["sources_changed"])
+    needs_ann = changed or manifest.get("ann", {}).get("config") != config
+    needs_bm25 = changed or not os.path.exists(os.path.join(save_path, BM25_FILE))
+    needs_catalog = changed or not os.path.exists(os.path.join(save_path, CATALOG_FILE))
+    if vectorstore is not None and (needs_ann or needs_bm25 or needs_catalog):
+        if changed:
+            _save_atomically(vectorstore, save_path)
+        if needs_ann:
+            manifest["ann"] = _write_serving_index(save_path, vectorstore, config)
+            stats["index_report"] = manifest["ann"]["report"]
+        if needs_bm25:
+            BM25Index.build(
+                (chunk_id, doc.page_content, doc.metadata.get("symbols", []))
+                for chunk_id, doc in vectorstore.docstore._dict.items()
+            ).save(os.path.join(save_path, BM25_FILE))
+        if needs_catalog:
+            write_catalog(save_path, vectorstore.docstore._dict.items())
+        with open(os.path.join(save_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        _invalidate_index(save_path)
+    return vectorstore, stats
+
+def _save_atomically(vectorstore, save_path: str):
+    # Replace files instead of rewriting them in place: other processes may have them memory-mapped
+    staging = os.path.join(save_path, ".staging")
+    vectorstore.save_local(staging)
+    for name in INDEX_FILES:
+        os.replace(os.path.join(staging, name), os.path.join(save_path, name))
+    os.rmdir(staging)
+
+def _write_serving_index(save_path: str, vectorstore, config: dict) -> dict:
+    """Build (or drop) the ANN serving index and measure it against exact search."""
+    vectors = vectorstore.index.reconstruct_n(0, vectorstore.index.ntotal)
+    build_id = _build_id(vectorstore.index_to_docstore_id)
+    ann_path = os.path.join(save_path, ANN_INDEX_FILE)
+    meta_path = os.path.join(save_path, ANN_META_FILE)
+    if config["type"] == "flat" or not len(vectors):
+        index, effective = vectorstore.index, {**config, "type": "flat"}
+    else:
+        index, effective = ann_index.build_index(vectors, config)
+    if effective["type"] == "flat":
+        for stale in (meta_path, ann_path):
+            if os.path.exists(stale):
+                os.remove(stale)
+        serving_path = os.path.join(save_path, "index.faiss")
+    else:
+        ann_index.write_index(index, ann_path)
+        # Written after the index it describes, so a half-finished build never matches
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"build_id": build_id, "effective": effective}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+        serving_path = ann_path
+    report = {"type": effective["type"], "requested": config["type"]}
+    if len(vectors):
+        report.update(ann_index.evaluate(vectors, index))
+    report["size_mb"] = round(os.path.getsize(serving_path) / 2**20, 2)
+    return {"config": config, "effective": effective, "build_id": build_id, "report": report}
+
+def build_vector_index(docs: List[str], save_path: str = VECTOR_INDEX_PATH, sources: Optional[List[str]] = None, prune: bool = False):
+    """Index `docs` (optionally named by `sources`, default: content hash) incrementally; returns the vectorstore."""
+    names = sources or [f"inline:{_sha(text)[:12]}" for text in docs]
+    vectorstore, _ = update_vector_index(dict(zip(names, docs)), save_path, prune=prune)
     return vectorstore
 
 # --- Load vector index ---
 def load_vector_index(path: str = VECTOR_INDEX_PATH):
+    """Fresh deserialization from disk; query paths should use get_vector_index() instead."""
     return FAISS.load_local(path, embeddings=embedding_model, allow_dangerous_deserialization=True)
 
+def load_serving_index(path: str = VECTOR_INDEX_PATH):
+    """
+    Read-only FAISS store for queries: the ANN index if one was built for the
+    current vectors, otherwise the exact index, memory-mapped where FAISS allows.
+    The ANN index is used only when the build id in the manifest, the one in
+    its sidecar and the one computed from index.pkl all agree, so an index
+    left over from an interrupted or concurrent build is never served.
+    """
+    with open(os.path.join(path, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    ann = (_load_manifest(path) or {}).get("ann") or {}
+    ann_path = os.path.join(path, ANN_INDEX_FILE)
+    meta_path = os.path.join(path, ANN_META_FILE)
+    index = None
+    if ann.get("effective", {}).get("type", "flat") != "flat" and os.path.exists(ann_path) and os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("build_id") == ann.get("build_id") == _build_id(index_to_docstore_id):
+            index = ann_index.read_index(ann_path, meta["effective"])
+    if index is None:
+        index = ann_index.read_index(os.path.join(path, "index.faiss"))
+    return FAISS(embedding_model, index, docstore, index_to_docstore_id)
+
+# --- Process-wide index handle, reloaded only when the files on disk change ---
+_index_lock = threading.Lock()
+_index_cache = {}  # path -> {"mtime": ..., "store": FAISS, "qa": {k: RetrievalQA}}
+
+def _index_mtime(path: str):
+    try:
+        mtimes = [os.stat(os.path.join(path, name)).st_mtime_ns for name in INDEX_FILES]
+    except FileNotFoundError:
+        return None
+    for name in (ANN_INDEX_FILE, ANN_META_FILE, BM25_FILE, MANIFEST_FILE):
+        if os.path.exists(os.path.join(path, name)):
+            mtimes.append(os.stat(os.path.join(path, name)).st_mtime_ns)
+    return max(mtimes)
+
+def _invalidate_index(path: str):
+    with _index_lock:
+        _index_cache.pop(path, None)
+
+def _cached_entry(path: str):
+    mtime = _index_mtime(path)
+    if mtime is None:
+        return None
+    with _index_lock:
+        entry = _index_cache.get(path)
+        if entry is None or entry["mtime"] != mtime:
+            bm25_path = os.path.join(path, BM25_FILE)
+            entry = _index_cache[path] = {
+                "mtime": mtime,
+                "store": load_serving_index(path),
+                "bm25": BM25Index.load(bm25_path) if os.path.exists(bm25_path) else None,
+                "qa": {},
+            }
+        return entry
+
+def get_vector_index(path: str = VECTOR_INDEX_PATH):
+    """Shared FAISS handle for `path`, or None if no index has been built."""
+    entry = _cached_entry(path)
+    return entry["store"] if entry else None
+
+def get_bm25_index(path: str = VECTOR_INDEX_PATH):
+    """Shared BM25 index for `path`, or None if the index predates it or was never built."""
+    entry = _cached_entry(path)
+    return entry["bm25"] if entry else None
+
+# --- Hybrid retrieval: exact identifiers, then BM25 + vector fused by reciprocal rank ---
+def hybrid_search(query: str, k: int = CODE_CONTEXT_K, path: str = VECTOR_INDEX_PATH) -> List[Document]:
+    entry = _cached_entry(path)
+    if entry is None:
+        return []
+    vectorstore, bm25 = entry["store"], entry["bm25"]
+    if bm25 is None:
+        return vectorstore.similarity_search(query, k=k)
+
+    # hybrid_rank tries the identifier fast path first; vector_search (an embedding call) only runs otherwise
+    by_id = {}
+    def vector_search(n):
+        for doc in vectorstore.similarity_search(query, k=n):
+            by_id[doc.metadata.get("chunk_id") or f"vector:{len(by_id)}"] = doc
+        return list(by_id)
+
+    ranked = hybrid_rank(query, bm25, vector_search, k, HYBRID_CANDIDATES)
+    return _documents(vectorstore, ranked, by_id)
+
+def _documents(vectorstore, chunk_ids, known=None):
+    docs = [(known or {}).get(chunk_id) or vectorstore.docstore.search(chunk_id) for chunk_id in chunk_ids]
+    return [doc for doc in docs if isinstance(doc, Document)]  # docstore.search returns a message when missing
+
+class HybridRetriever(BaseRetriever):
+    """LangChain retriever over hybrid_search(), for RetrievalQA."""
+    path: str = VECTOR_INDEX_PATH
+    k: int = CODE_CONTEXT_K
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        return hybrid_search(query, k=self.k, path=self.path)
+
+def get_qa_chain(path: str = VECTOR_INDEX_PATH, k: int = CODE_CONTEXT_K):
+    """RetrievalQA over the shared index; rebuilt only when the index is reloaded."""
+    entry = _cached_entry(path)
+    if entry is None:
+        return None
+    with _index_lock:
+        if k not in entry["qa"]:
+            retriever = HybridRetriever(path=path, k=k)
+            entry["qa"][k] = RetrievalQA.from_chain_type(
+                llm=get_chat_model("gpt-3.5-turbo", temperature=0), chain_type="stuff", retriever=retriever
+            )
+        return entry["qa"][k]
+
 # --- Ask AI with context from indexed code/doc chunks ---
 def answer_with_code_context(query: str):
-    if not os.path.exists(VECTOR_INDEX_PATH):
+    qa = get_qa_chain()
+    if qa is None:
         return "Vector index not found. Please build it first from your code or documentation."
-    
-    vectorstore = load_vector_index()
-    retriever = vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": 5})
-    qa = RetrievalQA.from_chain_type(llm=ChatOpenAI(temperature=0, api_key=openai_key), chain_type="stuff", retriever=retriever)
     return qa.run(query)
 
 # --- Utility to preview what was indexed ---
+# Loads the whole docstore; the admin page reads utils/chunk_catalog.py instead.
 def preview_indexed_docs(path: str = VECTOR_INDEX_PATH):
-    if not os.path.exists(path):
+    vectorstore = get_vector_index(path)
+    if vectorstore is None:
         return []
-    vectorstore = load_vector_index()
     return vectorstore.docstore._dict.values()
 
 # --- New: Get system-level component groups ---